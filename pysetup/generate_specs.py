@@ -11,6 +11,7 @@ from ruamel.yaml import YAML
 
 from pysetup.constants import PHASE0
 from pysetup.helpers import (
+    check_mirrored_functions,
     combine_spec_objects,
     dependency_order_class_objects,
     finalized_spec_object,
@@ -85,6 +86,7 @@ def build_spec(
     preset = load_preset(tuple(preset_files))
     config = load_config(config_file)
     all_specs = [get_spec(spec, preset, config, preset_name) for spec in source_files]
+    check_mirrored_functions(fork, source_files, all_specs)
 
     spec_object = all_specs[0]
     for value in all_specs[1:]:
@@ -208,9 +210,18 @@ def generate_fork_specs(
         if verbose:
             print(f"    Wrote: {output_file} ({len(spec_str):,} bytes)")
 
-    # Create __init__.py that imports mainnet as default
+    # Create __init__.py that exposes mainnet as the default ``spec``, imported on first use
     init_file = out_dir / "__init__.py"
-    init_file.write_text("from . import mainnet as spec  # noqa:F401\n")
+    init_file.write_text(
+        "from importlib import import_module\n"
+        "from types import ModuleType\n"
+        "\n"
+        "\n"
+        "def __getattr__(name: str) -> ModuleType:\n"
+        '    if name == "spec":\n'
+        '        return import_module(".mainnet", __name__)\n'
+        '    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")\n'
+    )
 
     if verbose:
         print(f"  Wrote: {init_file}")
@@ -1,10 +1,11 @@
 import re
 import textwrap
 from functools import reduce
+from pathlib import Path
 from typing import TypeVar
 
 from .constants import CONSTANT_DEP_SUNDRY_CONSTANTS_FUNCTIONS
-from .md_doc_paths import PREVIOUS_FORK_OF
+from .md_doc_paths import EXTRA_SPEC_FILES, get_fork_directory, PREVIOUS_FORK_OF
 from .spec_builders import spec_builders
 from .typing import (
     ProtocolDefinition,
@@ -22,6 +23,38 @@ def collect_prev_forks(fork: str) -> list[str]:
         forks.append(fork)
 
 
+def check_mirrored_functions(fork: str, source_files: list[Path], specs: list[SpecObject]) -> None:
+    """
+    Raise if a fork after the fork of a builder redefines one of its ``mirrored_functions``:
+    the optimizations of the builder would no longer compute the same results. A fork whose
+    builder declares the function as mirrored too has checked them against its definition.
+    """
+    forks = collect_prev_forks(fork)[::-1]
+    fork_directories = {f: Path(get_fork_directory(f)).resolve() for f in forks}
+    extra_files = {Path(file).resolve(): f for f, file in EXTRA_SPEC_FILES.items()}
+    defining_forks: dict[str, list[str]] = {}
+    for source_file, spec in zip(source_files, specs, strict=True):
+        path = Path(source_file).resolve()
+        file_fork = extra_files.get(path) or next(
+            f for f in forks if path.is_relative_to(fork_directories[f])
+        )
+        for name in spec.functions:
+            defining_forks.setdefault(name, []).append(file_fork)
+    for builder_fork in forks:
+        later_forks = forks[forks.index(builder_fork) + 1 :]
+        for name in sorted(spec_builders[builder_fork].mirrored_functions()):
+            redefining_forks = [
+                f
+                for f in defining_forks.get(name, [])
+                if f in later_forks and name not in spec_builders[f].mirrored_functions()
+            ]
+            if len(redefining_forks) > 0:
+                raise ValueError(
+                    f"{name} is redefined in {', '.join(redefining_forks)}, the {builder_fork}"
+                    " optimizations computing the same results must be updated"
+                )
+
+
 def requires_mypy_type_ignore(value: str) -> bool:
     return (
         value.startswith(("BitList", "ByteVector"))
@@ -1,6 +1,55 @@
 from abc import ABC, abstractmethod
 
 
+def replace_in_function(functions: dict[str, str], name: str, old: str, new: str) -> None:
+    """
+    Replace ``old`` with ``new`` in the source of the spec function ``name``. Raise if ``old``
+    is not in it, so that an optimization cannot silently stop applying when the spec changes.
+    """
+    source = functions[name]
+    if old not in source:
+        raise ValueError(f"cannot optimize {name}, the source does not contain: {old!r}")
+    functions[name] = source.replace(old, new)
+
+
+def replace_in_functions(functions: dict[str, str], old: str, new: str) -> None:
+    """
+    Replace ``old`` with ``new`` in the source of every spec function that contains it. Raise
+    if none does.
+    """
+    names = [name for name, source in functions.items() if old in source]
+    if len(names) == 0:
+        raise ValueError(f"cannot optimize, no function source contains: {old!r}")
+    for name in names:
+        replace_in_function(functions, name, old, new)
+
+
+# The signature verifications whose asserted calls can join a ``bls.batch_verification``
+DEFERRABLE_VERIFICATIONS = [
+    "bls.Verify",
+    "eth_fast_aggregate_verify",
+    "is_valid_indexed_attestation",
+    "verify_block_signature",
+]
+
+
+def defer_asserted_verifications(functions: dict[str, str], names: list[str]) -> None:
+    """
+    Wrap the asserted signature verifications of the spec functions ``names`` in
+    ``bls.deferred``, so that their pairing checks join an open ``bls.batch_verification``.
+    Raise if one of them asserts none.
+    """
+    for name in names:
+        source = functions[name]
+        for verify_fn in DEFERRABLE_VERIFICATIONS:
+            source = source.replace(f"assert {verify_fn}(", f"assert bls.deferred({verify_fn})(")
+        if source == functions[name]:
+            raise ValueError(
+                f"cannot optimize {name}, the source asserts no signature verification"
+            )
+        functions[name] = source
+
+
 class BaseSpecBuilder(ABC):
     @property
     @abstractmethod
@@ -54,6 +103,15 @@ class BaseSpecBuilder(ABC):
     def implement_optimizations(cls, functions: dict[str, str]) -> dict[str, str]:
         return functions
 
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        """
+        The spec functions that the optimizations of this builder compute the same results as,
+        with their own code. Generation fails if a later fork redefines one of them, unless
+        the builder of that fork declares it as well.
+        """
+        return set()
+
     @classmethod
     def deprecate_constants(cls) -> set[str]:
         return set()
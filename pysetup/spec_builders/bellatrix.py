@@ -25,7 +25,15 @@ def get_pow_block(hash: Bytes32) -> Optional[PowBlock]:
 
 
 def validator_is_connected(validator_index: ValidatorIndex) -> bool:
-    return True"""
+    return True
+
+
+inactivity_penalty_quotient = INACTIVITY_PENALTY_QUOTIENT_BELLATRIX"""
+
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        # The columnar inactivity penalties of altair, with ``inactivity_penalty_quotient``
+        return {"get_inactivity_penalty_deltas"}
 
     @classmethod
     def execution_engine_cls(cls) -> str:
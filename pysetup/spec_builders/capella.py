@@ -1,6 +1,6 @@
 from pysetup.constants import CAPELLA
 
-from .base import BaseSpecBuilder
+from .base import BaseSpecBuilder, defer_asserted_verifications, replace_in_function
 
 
 class CapellaSpecBuilder(BaseSpecBuilder):
@@ -35,3 +35,94 @@ from eth_consensus_specs.bellatrix import {preset_name} as bellatrix
             "upgrade_to_bellatrix",
             "validate_merge_block",
         }
+
+    @classmethod
+    def sundry_functions(cls) -> str:
+        return """
+# Set to False to compute the withdrawals of a sweep with the reference list scans
+use_withdrawals_index = True
+
+
+class WithdrawalsSoFar(Sequence[Withdrawal]):
+    \"\"\"
+    ``list(prior_withdrawals) + withdrawals`` for a sweep that appends to ``withdrawals``,
+    with a running total of the amount withdrawn per validator index.
+    \"\"\"
+
+    def __init__(
+        self, prior_withdrawals: Sequence[Withdrawal], withdrawals: Sequence[Withdrawal]
+    ) -> None:
+        self.prior_withdrawals = prior_withdrawals
+        self.withdrawals = withdrawals
+        self.withdrawn: DefaultDict[ValidatorIndex, int] = defaultdict(int)
+        self.counted = 0
+
+    def __len__(self) -> int:
+        return len(self.prior_withdrawals) + len(self.withdrawals)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < len(self.prior_withdrawals):
+            return self.prior_withdrawals[index]
+        return self.withdrawals[index - len(self.prior_withdrawals)]
+
+    def all(self) -> Sequence[Withdrawal]:
+        if not use_withdrawals_index:
+            return list(self.prior_withdrawals) + list(self.withdrawals)
+        return self
+
+    def get_withdrawn(self, validator_index: ValidatorIndex) -> int:
+        for i in range(self.counted, len(self)):
+            self.withdrawn[self[i].validator_index] += self[i].amount
+        self.counted = len(self)
+        return self.withdrawn[validator_index]
+
+
+def _get_balance_after_withdrawals_indexed(
+    state: BeaconState,
+    validator_index: ValidatorIndex,
+    withdrawals: Sequence[Withdrawal],
+) -> Gwei:
+    if isinstance(withdrawals, WithdrawalsSoFar):
+        return state.balances[validator_index] - withdrawals.get_withdrawn(validator_index)
+    return _get_balance_after_withdrawals(state, validator_index, withdrawals)
+
+
+_get_balance_after_withdrawals = get_balance_after_withdrawals
+get_balance_after_withdrawals = _get_balance_after_withdrawals_indexed"""
+
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        # The running totals of ``WithdrawalsSoFar``
+        return {"get_balance_after_withdrawals"}
+
+    @classmethod
+    def implement_optimizations(cls, functions: dict[str, str]) -> dict[str, str]:
+        # Sweeps rebuild the list of all withdrawals on every iteration, and scan it for the
+        # balance of every validator. Build it once, with a running total per validator.
+        sweeps = [
+            name
+            for name, source in functions.items()
+            if "        all_withdrawals = list(prior_withdrawals) + withdrawals\n" in source
+        ]
+        if len(sweeps) == 0:
+            raise ValueError("cannot optimize, no function source contains a withdrawal sweep")
+        for name in sweeps:
+            replace_in_function(
+                functions,
+                name,
+                "    withdrawals: list[Withdrawal] = []\n",
+                "    withdrawals: list[Withdrawal] = []\n"
+                "    withdrawals_so_far = WithdrawalsSoFar(prior_withdrawals, withdrawals)\n",
+            )
+            replace_in_function(
+                functions,
+                name,
+                "        all_withdrawals = list(prior_withdrawals) + withdrawals\n",
+                "        all_withdrawals = withdrawals_so_far.all()\n",
+            )
+        defer_asserted_verifications(functions, ["process_bls_to_execution_change"])
+        return functions
@@ -11,3 +11,9 @@ class EIP8148SpecBuilder(BaseSpecBuilder):
         return f"""
 from eth_consensus_specs.heze import {preset_name} as heze
 """
+
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        # The validator still appended by ``add_validator_to_registry``, for the pubkey index
+        # of phase0
+        return {"add_validator_to_registry"}
@@ -21,6 +21,65 @@ from eth_consensus_specs.utils.ssz.ssz_impl import ssz_serialize, ssz_deserializ
             "NEXT_SYNC_COMMITTEE_GINDEX_ELECTRA": "GeneralizedIndex(87)",
         }
 
+    @classmethod
+    def sundry_functions(cls) -> str:
+        return """
+def _get_pending_balances_to_withdraw(state: BeaconState) -> Dict[ValidatorIndex, Gwei]:
+    balances: DefaultDict[ValidatorIndex, Gwei] = defaultdict(lambda: Gwei(0))
+    for withdrawal in state.pending_partial_withdrawals:
+        balances[withdrawal.validator_index] += withdrawal.amount
+    return balances
+
+
+get_pending_balances_to_withdraw = cache_this(
+    lambda state: fingerprint(state.pending_partial_withdrawals),
+    _get_pending_balances_to_withdraw, lru_size=SLOTS_PER_EPOCH * 3,
+    name="get_pending_balances_to_withdraw")
+
+
+def _get_pending_balance_to_withdraw_indexed(
+    state: BeaconState, validator_index: ValidatorIndex
+) -> Gwei:
+    if not use_withdrawals_index:
+        return _get_pending_balance_to_withdraw(state, validator_index)
+    return get_pending_balances_to_withdraw(state).get(validator_index, Gwei(0))
+
+
+_get_pending_balance_to_withdraw = get_pending_balance_to_withdraw
+get_pending_balance_to_withdraw = _get_pending_balance_to_withdraw_indexed
+
+
+def _get_attesting_indices_sliced_electra(
+    state: BeaconState, attestation: Attestation
+) -> Set[ValidatorIndex]:
+    \"\"\"
+    Same result as ``_get_attesting_indices``, with the bits read in one pass.
+    \"\"\"
+    bits = list(attestation.aggregation_bits)
+    output: Set[ValidatorIndex] = set()
+    committee_offset = 0
+    for committee_index in get_committee_indices(attestation.committee_bits):
+        committee = get_beacon_committee(state, attestation.data.slot, committee_index)
+        if committee_offset + len(committee) > len(bits):
+            return _get_attesting_indices(state, attestation)
+        output.update(compress(committee, bits[committee_offset : committee_offset + len(committee)]))
+        committee_offset += len(committee)
+    return output
+
+
+get_attesting_indices = _get_attesting_indices_sliced_electra"""
+
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        # The validator still appended by ``add_validator_to_registry``, for the pubkey index
+        # of phase0, the bits read by ``_get_attesting_indices_sliced_electra``, and the sums
+        # of ``get_pending_balances_to_withdraw``
+        return {
+            "add_validator_to_registry",
+            "get_attesting_indices",
+            "get_pending_balance_to_withdraw",
+        }
+
     @classmethod
     def deprecate_functions(cls) -> set[str]:
         return {
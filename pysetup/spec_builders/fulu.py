@@ -41,6 +41,68 @@ from eth_consensus_specs.electra import {preset_name} as electra
         return """
 def retrieve_column_sidecars(beacon_block_root: Root) -> Sequence[DataColumnSidecar]:
     return []
+
+
+def compute_packed_matrix(blobs: Sequence[Blob]) -> kzg.Matrix:
+    \"\"\"
+    Return the cells and proofs of the extended ``blobs`` as a ``kzg.Matrix``, two row-major
+    buffers instead of a ``MatrixEntry`` per cell. The blobs are extended on
+    ``kzg.matrix_threads`` threads.
+    \"\"\"
+    return kzg.compute_matrix(
+        blobs, CELLS_PER_EXT_BLOB, Cell.type_byte_length(), KZGProof.type_byte_length()
+    )
+
+
+def _compute_matrix_threaded(blobs: Sequence[Blob]) -> Sequence[MatrixEntry]:
+    matrix = compute_packed_matrix(blobs)
+    return [
+        MatrixEntry(
+            cell=matrix.cell(row_index, column_index),
+            kzg_proof=matrix.proof(row_index, column_index),
+            column_index=column_index,
+            row_index=row_index,
+        )
+        for row_index in range(matrix.row_count)
+        for column_index in range(CELLS_PER_EXT_BLOB)
+    ]
+
+
+_compute_matrix = compute_matrix
+compute_matrix = _compute_matrix_threaded
+
+
+def _recover_matrix_by_row(
+    partial_matrix: Sequence[MatrixEntry], blob_count: Uint64
+) -> Sequence[MatrixEntry]:
+    # The entries are grouped by row in one pass, and the rows are recovered on
+    # ``kzg.matrix_threads`` threads
+    partial_rows: list[tuple[list[CellIndex], list[Cell]]] = [([], []) for _ in range(blob_count)]
+    for entry in partial_matrix:
+        if entry.row_index < blob_count:
+            cell_indices, cells = partial_rows[entry.row_index]
+            cell_indices.append(entry.column_index)
+            cells.append(entry.cell)
+    matrix = []
+    for blob_index, (recovered_cells, recovered_proofs) in enumerate(
+        kzg.recover_matrix(partial_rows)
+    ):
+        for cell_index, (cell, proof) in enumerate(
+            zip(recovered_cells, recovered_proofs, strict=True)
+        ):
+            matrix.append(
+                MatrixEntry(
+                    cell=cell,
+                    kzg_proof=proof,
+                    column_index=cell_index,
+                    row_index=blob_index,
+                )
+            )
+    return matrix
+
+
+_recover_matrix = recover_matrix
+recover_matrix = _recover_matrix_by_row
 """
 
     @classmethod
@@ -71,5 +71,23 @@ def retrieve_column_sidecars_and_kzg_commitments(
 _get_parent_payload_status = get_parent_payload_status
 get_parent_payload_status = cache_this(
     lambda store, block: block.hash_tree_root(),
-    _get_parent_payload_status, lru_size=1024)
+    _get_parent_payload_status, lru_size=1024, name="get_parent_payload_status")
 """
+
+    @classmethod
+    def implement_optimizations(cls, functions: dict[str, str]) -> dict[str, str]:
+        functions["get_fork_choice_node_parent"] = """
+def get_fork_choice_node_parent(store: Store, node: ForkChoiceNode) -> Optional[ForkChoiceNode]:
+    \"\"\"
+    Return the parent of ``node`` in the fork choice tree, or ``None`` if it is not in ``store``.
+    \"\"\"
+    if node.payload_status != PAYLOAD_STATUS_PENDING:
+        return ForkChoiceNode(root=node.root, payload_status=PAYLOAD_STATUS_PENDING)
+    if node.root not in store.blocks or store.blocks[node.root].parent_root not in store.blocks:
+        return None
+    block = store.blocks[node.root]
+    return ForkChoiceNode(
+        root=block.parent_root,
+        payload_status=get_parent_payload_status(store, block),
+    )""".strip()
+        return functions
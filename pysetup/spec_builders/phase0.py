@@ -1,6 +1,11 @@
 from pysetup.constants import PHASE0
 
-from .base import BaseSpecBuilder
+from .base import (
+    BaseSpecBuilder,
+    defer_asserted_verifications,
+    replace_in_function,
+    replace_in_functions,
+)
 
 
 class Phase0SpecBuilder(BaseSpecBuilder):
@@ -21,20 +26,29 @@ class GossipReject(Exception):
     def imports(cls, preset_name: str) -> str:
         return """from lru import LRU
 from collections import defaultdict
+from itertools import compress
+import sys
+import time
+import weakref
 from dataclasses import (
     dataclass,
     field,
 )
 from typing import (
-    Any, Callable, Dict, DefaultDict, Set, Sequence, Tuple, Optional, TypeAlias, TypeVar, NamedTuple, Final
+    Any, Callable, Dict, DefaultDict, Iterator, Set, Sequence, Tuple, Optional, TypeAlias, TypeVar,
+    NamedTuple, Final
 )
 
-from eth_consensus_specs.utils.ssz.ssz_impl import hash_tree_root, copy, uint_to_bytes
+import numpy as np
+
+from eth_consensus_specs.utils.ssz.ssz_impl import (
+    hash_tree_root, copy, uint_to_bytes, fingerprint, new_node_bytes,
+    field_array, from_array, from_field_array, to_array)
 from eth_consensus_specs.utils.ssz.ssz_typing import (
     View, Boolean, Byte, Container, List, Vector, Uint8, Uint32, Uint64, Uint256,
     Bytes1, Bytes4, Bytes20, Bytes32, Bytes48, Bytes96, BitList)
 from eth_consensus_specs.utils.ssz.ssz_typing import BitVector  # noqa: F401
-from eth_consensus_specs.utils import bls
+from eth_consensus_specs.utils import bls, shuffling
 from eth_consensus_specs.utils.hash_function import hash
 """
 
@@ -57,51 +71,811 @@ def get_eth1_data(block: Eth1Block) -> Eth1Data:
         block_hash=hash_tree_root(block))
 
 
-def cache_this(key_fn, value_fn, lru_size):  # type: ignore
-    cache_dict = LRU(size=lru_size)
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    # Estimated from the mean time of a miss
+    time_saved: float
+    # Shallow size of the cached values (and of the items of list-like values)
+    entry_bytes: int
+
+
+def cache_entry_bytes(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+# The caches of this module, by the name they are reported under in ``cache_stats``
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    assert name not in _caches, f"cache {name!r} is already registered"
+    _caches[name] = cache
+
+
+def cache_this(key_fn, value_fn, lru_size, name):  # type: ignore
+    stats = {"hits": 0, "misses": 0, "evictions": 0, "miss_time": 0.0}
+
+    def on_evict(key, value):  # type: ignore
+        stats["evictions"] += 1
+
+    cache_dict = LRU(size=lru_size, callback=on_evict)
 
     def wrapper(*args, **kw):  # type: ignore
         key = key_fn(*args, **kw)
-        if key not in cache_dict:
-            cache_dict[key] = value_fn(*args, **kw)
-        return cache_dict[key]
+        if key in cache_dict:
+            stats["hits"] += 1
+            return cache_dict[key]
+        stats["misses"] += 1
+        start = time.perf_counter()
+        value = value_fn(*args, **kw)
+        stats["miss_time"] += time.perf_counter() - start
+        cache_dict[key] = value
+        return value
+
+    def cache_info():  # type: ignore
+        mean_miss_time = stats["miss_time"] / stats["misses"] if stats["misses"] else 0.0
+        return CacheInfo(
+            hits=stats["hits"],
+            misses=stats["misses"],
+            evictions=stats["evictions"],
+            maxsize=int(lru_size),
+            currsize=len(cache_dict),
+            time_saved=stats["hits"] * mean_miss_time,
+            entry_bytes=sum(cache_entry_bytes(value) for value in cache_dict.values()),
+        )
+
+    def cache_clear():  # type: ignore
+        cache_dict.clear()
+        stats.update(hits=0, misses=0, evictions=0, miss_time=0.0)
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    register_cache(name, wrapper)
     return wrapper
 
 
+def cache_stats() -> Dict[str, CacheInfo]:
+    return {name: cached.cache_info() for name, cached in _caches.items()}
+
+
+def clear_caches() -> None:
+    for cached in _caches.values():
+        cached.cache_clear()
+
+
 _compute_shuffled_permutation = compute_shuffled_permutation
+
+
+def _compute_shuffled_permutation_optimized(index_count: Uint64, seed: Bytes32) -> Sequence[Uint64]:
+    """
+    Same result as ``_compute_shuffled_permutation``, computed a whole round at a time.
+    """
+    return shuffling.ShuffledIndices(
+        shuffling.compute_shuffled_permutation(int(index_count), seed, SHUFFLE_ROUND_COUNT))
+
+
 compute_shuffled_permutation = cache_this(
     lambda index_count, seed: (index_count, seed),
-    _compute_shuffled_permutation, lru_size=256)
+    _compute_shuffled_permutation_optimized, lru_size=256, name="compute_shuffled_permutation")
 
 _get_total_active_balance = get_total_active_balance
 get_total_active_balance = cache_this(
-    lambda state: (state.validators.hash_tree_root(), compute_epoch_at_slot(state.slot)),
-    _get_total_active_balance, lru_size=10)
+    lambda state: (fingerprint(state.validators), compute_epoch_at_slot(state.slot)),
+    _get_total_active_balance, lru_size=10, name="get_total_active_balance")
 
 _get_base_reward = get_base_reward
 get_base_reward = cache_this(
-    lambda state, index: (state.validators.hash_tree_root(), state.slot, index),
-    _get_base_reward, lru_size=2048)
+    lambda state, index: (fingerprint(state.validators), state.slot, index),
+    _get_base_reward, lru_size=2048, name="get_base_reward")
 
 _get_committee_count_per_slot = get_committee_count_per_slot
 get_committee_count_per_slot = cache_this(
-    lambda state, epoch: (state.validators.hash_tree_root(), epoch),
-    _get_committee_count_per_slot, lru_size=SLOTS_PER_EPOCH * 3)
+    lambda state, epoch: (fingerprint(state.validators), epoch),
+    _get_committee_count_per_slot, lru_size=SLOTS_PER_EPOCH * 3,
+    name="get_committee_count_per_slot")
 
 _get_active_validator_indices = get_active_validator_indices
 get_active_validator_indices = cache_this(
-    lambda state, epoch: (state.validators.hash_tree_root(), epoch),
-    _get_active_validator_indices, lru_size=3)
+    lambda state, epoch: (fingerprint(state.validators), epoch),
+    _get_active_validator_indices, lru_size=3, name="get_active_validator_indices")
+
+
+class EpochCommittees:
+    """
+    The beacon committees of one epoch: the active validator indices in shuffled order, and
+    the offset of each committee in them. Committee ``i`` of the epoch, counting the
+    committees of the earlier slots first, is ``shuffled[offsets[i]:offsets[i + 1]]``, so the
+    committees of a slot are one contiguous slice too.
+    """
+
+    def __init__(
+        self, active_indices: Sequence[ValidatorIndex], seed: Bytes32, committees_per_slot: int
+    ) -> None:
+        indices = np.fromiter(active_indices, np.uint64, len(active_indices))
+        if len(indices) > 0:
+            indices = indices[
+                shuffling.compute_shuffled_permutation(len(indices), seed, SHUFFLE_ROUND_COUNT)
+            ]
+        self.shuffled = indices
+        self.committees_per_slot = committees_per_slot
+        count = committees_per_slot * SLOTS_PER_EPOCH
+        self.offsets = [len(indices) * i // count for i in range(count + 1)]
+        # Committees are boxed on first access
+        self.committees: Dict[int, Sequence[ValidatorIndex]] = {}
+
+    def _slice(self, start: int, end: int) -> Sequence[ValidatorIndex]:
+        return [ValidatorIndex(i) for i in self.shuffled[start:end].tolist()]
+
+    def get_committee(self, slot: Slot, index: CommitteeIndex) -> Sequence[ValidatorIndex]:
+        i = int(slot % SLOTS_PER_EPOCH) * self.committees_per_slot + int(index)
+        if i not in self.committees:
+            self.committees[i] = self._slice(self.offsets[i], self.offsets[i + 1])
+        return self.committees[i]
+
+    def get_slot_committees(self, slot: Slot) -> Sequence[ValidatorIndex]:
+        first = int(slot % SLOTS_PER_EPOCH) * self.committees_per_slot
+        return self._slice(self.offsets[first], self.offsets[first + self.committees_per_slot])
+
+
+class CommitteeCache:
+    """
+    The ``EpochCommittees`` of the most recently used ``size`` epochs, keyed by the attester
+    seed and the active validator set of the epoch. The active set is identified by the
+    registry it was read from and the epoch, see ``fingerprint``, so copies of a state share
+    their committees, and the committees of all the slots of an epoch are computed with a
+    single shuffle.
+
+    A key changes with any write to the registry or to the RANDAO mix of the seed, so entries
+    never go stale. ``prune`` drops the committees of the epochs that are no longer needed,
+    ``cache_clear`` all of them.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "miss_time": 0.0}
+        self.entries: LRU = LRU(size=size, callback=self._on_evict)
+
+    def _on_evict(self, key: Tuple[Bytes32, Any, Epoch], value: EpochCommittees) -> None:
+        self.stats["evictions"] += 1
+
+    def get(self, state: BeaconState, epoch: Epoch) -> EpochCommittees:
+        key = (get_seed(state, epoch, DOMAIN_BEACON_ATTESTER), fingerprint(state.validators), epoch)
+        if key in self.entries:
+            self.stats["hits"] += 1
+            return self.entries[key]
+        self.stats["misses"] += 1
+        start = time.perf_counter()
+        committees = EpochCommittees(
+            get_active_validator_indices(state, epoch),
+            key[0],
+            int(get_committee_count_per_slot(state, epoch)),
+        )
+        self.stats["miss_time"] += time.perf_counter() - start
+        self.entries[key] = committees
+        return committees
+
+    def prune(self, epoch: Epoch) -> None:
+        """
+        Drop the committees of the epochs before ``epoch``.
+        """
+        for key in [key for key in self.entries.keys() if key[2] < epoch]:
+            del self.entries[key]
+
+    def cache_info(self) -> CacheInfo:
+        misses = self.stats["misses"]
+        mean_miss_time = self.stats["miss_time"] / misses if misses else 0.0
+        return CacheInfo(
+            hits=int(self.stats["hits"]),
+            misses=int(misses),
+            evictions=int(self.stats["evictions"]),
+            maxsize=self.size,
+            currsize=len(self.entries),
+            time_saved=self.stats["hits"] * mean_miss_time,
+            entry_bytes=sum(
+                committees.shuffled.nbytes + cache_entry_bytes(list(committees.committees.values()))
+                for committees in self.entries.values()
+            ),
+        )
+
+    def cache_clear(self) -> None:
+        self.entries.clear()
+        self.stats.update(hits=0, misses=0, evictions=0, miss_time=0.0)
+
+
+# Recent epochs of the current chain, and of the states fork choice looks committees up in
+committee_cache = CommitteeCache(size=8)
+register_cache("get_epoch_committees", committee_cache)
+
+
+def get_epoch_committees(state: BeaconState, epoch: Epoch) -> EpochCommittees:
+    return committee_cache.get(state, epoch)
+
+
+def get_slot_committees(state: BeaconState, slot: Slot) -> Sequence[ValidatorIndex]:
+    """
+    Return the committees of ``slot`` concatenated in order.
+    """
+    return get_epoch_committees(state, compute_epoch_at_slot(slot)).get_slot_committees(slot)
+
+
+def _get_beacon_committee_cached(
+    state: BeaconState, slot: Slot, index: CommitteeIndex
+) -> Sequence[ValidatorIndex]:
+    committees = get_epoch_committees(state, compute_epoch_at_slot(slot))
+    if index >= committees.committees_per_slot:
+        return _get_beacon_committee(state, slot, index)
+    return committees.get_committee(slot, index)
+
 
 _get_beacon_committee = get_beacon_committee
-get_beacon_committee = cache_this(
-    lambda state, slot, index: (state.validators.hash_tree_root(), state.randao_mixes.hash_tree_root(), slot, index),
-    _get_beacon_committee, lru_size=SLOTS_PER_EPOCH * MAX_COMMITTEES_PER_SLOT * 3)
+get_beacon_committee = _get_beacon_committee_cached
+
+
+def _get_attesting_indices_sliced(state: BeaconState, attestation: Attestation) -> Set[ValidatorIndex]:
+    """
+    Same result as ``_get_attesting_indices``, with the bits read in one pass.
+    """
+    committee = get_beacon_committee(state, attestation.data.slot, attestation.data.index)
+    bits = list(attestation.aggregation_bits)
+    if len(bits) < len(committee):
+        return _get_attesting_indices(state, attestation)
+    return set(compress(committee, bits))
+
 
 _get_attesting_indices = get_attesting_indices
-get_attesting_indices = cache_this(
-    lambda state, attestation: (
-        state.randao_mixes.hash_tree_root(),
-        state.validators.hash_tree_root(), attestation.hash_tree_root()
+get_attesting_indices = _get_attesting_indices_sliced
+
+
+class PubkeyIndex:
+    """
+    The first index of each pubkey in a validator registry, shared by the registries
+    that extend it by appending validators. ``length`` is the length of the longest one.
+    """
+
+    def __init__(self, validators: Sequence[Validator]) -> None:
+        self.indices: Dict[BLSPubkey, ValidatorIndex] = {}
+        for i, validator in enumerate(validators):
+            self.indices.setdefault(validator.pubkey, ValidatorIndex(i))
+        self.length = len(validators)
+
+
+class ValidatorPubkeys:
+    """
+    The pubkeys of a validator registry, for the ``in`` and ``index()`` lookups the spec does
+    on ``[v.pubkey for v in state.validators]``.
+    """
+
+    def __init__(self, pubkey_index: PubkeyIndex, length: int) -> None:
+        self.pubkey_index = pubkey_index
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, pubkey: BLSPubkey) -> bool:
+        return self.pubkey_index.indices.get(pubkey, self.length) < self.length
+
+    def index(self, pubkey: BLSPubkey) -> int:
+        i = self.pubkey_index.indices.get(pubkey, self.length)
+        if i >= self.length:
+            raise ValueError(f"{pubkey!r} is not in the validator registry")
+        return i
+
+    def append(self, pubkey: BLSPubkey) -> Optional["ValidatorPubkeys"]:
+        """
+        Return the pubkeys of this registry with ``pubkey`` appended, or ``None`` if the
+        shared index was already extended by another registry.
+        """
+        if self.pubkey_index.length != self.length:
+            return None
+        self.pubkey_index.indices.setdefault(pubkey, ValidatorIndex(self.length))
+        self.pubkey_index.length += 1
+        return ValidatorPubkeys(self.pubkey_index, self.length + 1)
+
+
+# The pubkeys of the validator registries by their backing, see ``get_validator_pubkeys``
+_validator_pubkeys: LRU = LRU(size=64)
+
+
+def get_validator_pubkeys(state: BeaconState) -> ValidatorPubkeys:
+    """
+    Return the pubkeys of ``state.validators``. Registries with the same backing (e.g. of
+    copied states) share them, and ``add_validator_to_registry`` extends them in place.
+    """
+    key = fingerprint(state.validators)
+    pubkeys = _validator_pubkeys.get(key)
+    if pubkeys is None:
+        pubkey_index = PubkeyIndex(state.validators)
+        pubkeys = ValidatorPubkeys(pubkey_index, pubkey_index.length)
+        _validator_pubkeys[key] = pubkeys
+    return pubkeys
+
+
+def _add_validator_to_registry_indexed(
+    state: BeaconState, pubkey: BLSPubkey, withdrawal_credentials: Bytes32, amount: Uint64
+) -> None:
+    pubkeys = _validator_pubkeys.get(fingerprint(state.validators))
+    _add_validator_to_registry(state, pubkey, withdrawal_credentials, amount)
+    if pubkeys is not None and len(state.validators) == len(pubkeys) + 1:
+        extended = pubkeys.append(pubkey)
+        if extended is not None:
+            _validator_pubkeys[fingerprint(state.validators)] = extended
+
+
+_add_validator_to_registry = add_validator_to_registry
+add_validator_to_registry = _add_validator_to_registry_indexed
+
+
+# Set to False to compute attestation scores with the reference ``get_attestation_score``
+use_vote_weight_index = True
+
+# The number of balance sources (e.g. justified states) indexed per store
+VOTE_WEIGHT_INDEX_LIMIT = 4
+
+
+def fork_choice_node_key(node: ForkChoiceNode) -> Tuple[Any, ...]:
+    # The generated ``ForkChoiceNode.__hash__`` resolves ``hash`` to the spec hash function,
+    # so nodes are keyed by their field values instead
+    return tuple(vars(node).values())
+
+
+class VoteWeightIndex:
+    """
+    Proto-array style attestation scores of the fork choice nodes of one ``Store``,
+    weighted by the balances of one state.
+
+    Every applied vote adds its balance to the supported node and all of its ancestors.
+    Votes of validators in ``pending`` are re-applied as deltas on the next ``update``.
+    """
+
+    def __init__(self, store: Store, state: BeaconState) -> None:
+        self.validators_fingerprint = fingerprint(state.validators)
+        self.epoch = get_current_epoch(state)
+        self.balances: Dict[ValidatorIndex, int] = {
+            i: int(state.validators[i].effective_balance)
+            for i in get_active_validator_indices(state, self.epoch)
+            if not state.validators[i].slashed
+        }
+        self.votes: Dict[ValidatorIndex, Tuple[ForkChoiceNode, int]] = {}
+        self.weights: Dict[Tuple[Any, ...], int] = {}
+        self.pending: Set[ValidatorIndex] = set(store.latest_messages)
+
+    def matches(self, state: BeaconState) -> bool:
+        return (
+            fingerprint(state.validators) is self.validators_fingerprint
+            and get_current_epoch(state) == self.epoch
+        )
+
+    def update(self, store: Store) -> None:
+        deltas: DefaultDict[Tuple[Any, ...], int] = defaultdict(int)
+        nodes: Dict[Tuple[Any, ...], ForkChoiceNode] = {}
+        for i in self.pending:
+            if i in self.votes:
+                old_node, old_balance = self.votes.pop(i)
+                nodes[fork_choice_node_key(old_node)] = old_node
+                deltas[fork_choice_node_key(old_node)] -= old_balance
+            if (
+                i in self.balances
+                and i in store.latest_messages
+                and i not in store.equivocating_indices
+            ):
+                new_node = get_supported_node(store, store.latest_messages[i])
+                self.votes[i] = (new_node, self.balances[i])
+                nodes[fork_choice_node_key(new_node)] = new_node
+                deltas[fork_choice_node_key(new_node)] += self.balances[i]
+        self.pending.clear()
+
+        for key, delta in deltas.items():
+            ancestor: Optional[ForkChoiceNode] = nodes[key]
+            while delta != 0 and ancestor is not None:
+                key = fork_choice_node_key(ancestor)
+                self.weights[key] = self.weights.get(key, 0) + delta
+                ancestor = get_fork_choice_node_parent(store, ancestor)
+
+    def get_weight(self, node: ForkChoiceNode) -> Gwei:
+        return Gwei(self.weights.get(fork_choice_node_key(node), 0))
+
+
+_vote_weight_indices: Dict[int, list[VoteWeightIndex]] = {}
+
+
+def get_vote_weight_index(store: Store, state: BeaconState) -> VoteWeightIndex:
+    key = id(store)
+    if key not in _vote_weight_indices:
+        _vote_weight_indices[key] = []
+        # Drop the indices with the store, before its id can be reused
+        weakref.finalize(store, _vote_weight_indices.pop, key, None)
+    indices = _vote_weight_indices[key]
+    index = next((index for index in indices if index.matches(state)), None)
+    if index is None:
+        index = VoteWeightIndex(store, state)
+        indices.insert(0, index)
+        del indices[VOTE_WEIGHT_INDEX_LIMIT:]
+    index.update(store)
+    return index
+
+
+def mark_votes_changed(store: Store, validator_indices: Sequence[ValidatorIndex]) -> None:
+    for index in _vote_weight_indices.get(id(store), []):
+        index.pending.update(validator_indices)
+
+
+def track_votes(indices_fn, fn):  # type: ignore
+    def wrapper(store, *args, **kw):  # type: ignore
+        fn(store, *args, **kw)
+        mark_votes_changed(store, indices_fn(*args, **kw))
+    return wrapper
+
+
+def _get_attestation_score_indexed(store: Store, node: ForkChoiceNode, state: BeaconState) -> Gwei:
+    if not use_vote_weight_index:
+        return _get_attestation_score(store, node, state)
+    return get_vote_weight_index(store, state).get_weight(node)
+
+
+_get_attestation_score = get_attestation_score
+get_attestation_score = _get_attestation_score_indexed
+
+_update_latest_messages = update_latest_messages
+update_latest_messages = track_votes(
+    lambda attesting_indices, attestation: attesting_indices,
+    _update_latest_messages)
+
+_on_attester_slashing = on_attester_slashing
+on_attester_slashing = track_votes(
+    lambda attester_slashing: (
+        list(attester_slashing.attestation_1.attesting_indices)
+        + list(attester_slashing.attestation_2.attesting_indices)
     ),
-    _get_attesting_indices, lru_size=SLOTS_PER_EPOCH * MAX_COMMITTEES_PER_SLOT * 3)'''
+    _on_attester_slashing)
+
+
+# Set to True to drop blocks that do not descend from the finalized checkpoint
+prune_store_on_finalization = False
+
+# Store fields keyed by block root, in any fork
+PRUNED_STORE_FIELDS = (
+    "blocks",
+    "block_states",
+    "block_timeliness",
+    "unrealized_justifications",
+    "payloads",
+    "payload_timeliness_vote",
+    "payload_data_availability_vote",
+    "payload_inclusion_list_satisfaction",
+)
+
+
+# The latest messages moved out of each store by ``prune_store``, keyed by ``id(store)``
+_pruned_latest_messages: Dict[int, Dict[ValidatorIndex, LatestMessage]] = {}
+
+
+def get_pruned_latest_messages(store: Store) -> Dict[ValidatorIndex, LatestMessage]:
+    key = id(store)
+    if key not in _pruned_latest_messages:
+        _pruned_latest_messages[key] = {}
+        # Drop the messages with the store, before its id can be reused
+        weakref.finalize(store, _pruned_latest_messages.pop, key, None)
+    return _pruned_latest_messages[key]
+
+
+# Weak references to the fast confirmation stores of each store, keyed by ``id(store)``
+_fast_confirmation_stores: Dict[int, list[weakref.ref]] = {}
+
+
+def _get_fast_confirmation_store_tracked(store: Store) -> FastConfirmationStore:
+    fcr_store = _get_fast_confirmation_store(store)
+    key = id(store)
+    if key not in _fast_confirmation_stores:
+        _fast_confirmation_stores[key] = []
+        weakref.finalize(store, _fast_confirmation_stores.pop, key, None)
+    _fast_confirmation_stores[key].append(weakref.ref(fcr_store))
+    return fcr_store
+
+
+_get_fast_confirmation_store = get_fast_confirmation_store
+get_fast_confirmation_store = _get_fast_confirmation_store_tracked
+
+
+def get_fast_confirmation_ancestors(store: Store) -> Set[Root]:
+    """
+    Return the blocks that the fast confirmation stores of ``store`` can still read: the
+    blocks they refer to, and their ancestors down to the first block before the oldest slot
+    they look up, the start of the previous epoch or of the epoch of one of their checkpoints.
+    """
+    fcr_stores = [ref() for ref in _fast_confirmation_stores.get(id(store), [])]
+    fcr_stores = [fcr_store for fcr_store in fcr_stores if fcr_store is not None]
+    if len(fcr_stores) == 0:
+        return set()
+    current_epoch = get_current_store_epoch(store)
+    oldest_epoch = Epoch(max(current_epoch, 1) - 1)
+    roots = {store.finalized_checkpoint.root}
+    for fcr_store in fcr_stores:
+        checkpoints = [
+            fcr_store.previous_epoch_observed_justified_checkpoint,
+            fcr_store.current_epoch_observed_justified_checkpoint,
+            fcr_store.previous_epoch_greatest_unrealized_checkpoint,
+        ]
+        oldest_epoch = min([oldest_epoch] + [checkpoint.epoch for checkpoint in checkpoints])
+        roots.update(checkpoint.root for checkpoint in checkpoints)
+        roots.update(
+            [fcr_store.confirmed_root, fcr_store.previous_slot_head, fcr_store.current_slot_head]
+        )
+    oldest_slot = min(
+        [compute_start_slot_at_epoch(oldest_epoch)]
+        + [store.blocks[root].slot for root in roots if root in store.blocks]
+    )
+    ancestors: Set[Root] = set()
+    for root in roots:
+        while root in store.blocks and root not in ancestors:
+            ancestors.add(root)
+            if store.blocks[root].slot < oldest_slot:
+                break
+            root = store.blocks[root].parent_root
+    return ancestors
+
+
+def prune_store(store: Store) -> None:
+    """
+    Drop everything ``store`` holds for blocks that do not descend from its finalized
+    checkpoint. The latest messages that vote for them are moved out of
+    ``store.latest_messages``, see ``get_pruned_latest_messages``: they no longer count in
+    any weight, but their epoch (or slot) still decides which later attestations replace them.
+
+    The blocks that its fast confirmation stores still look up are kept, see
+    ``get_fast_confirmation_ancestors``. Without one, the ancestors of the finalized block
+    are dropped as well, so ``get_ancestor`` can no longer be called for slots before it.
+    """
+    finalized_root = store.finalized_checkpoint.root
+    finalized_slot = store.blocks[finalized_root].slot
+    retained = {finalized_root}
+    for root, block in sorted(store.blocks.items(), key=lambda item: item[1].slot):
+        if block.slot > finalized_slot and block.parent_root in retained:
+            retained.add(root)
+    retained.update(get_fast_confirmation_ancestors(store))
+
+    for name in PRUNED_STORE_FIELDS:
+        values = getattr(store, name, None)
+        if values is not None:
+            for root in [root for root in values if root not in retained]:
+                del values[root]
+    for checkpoint in [c for c in store.checkpoint_states if c.root not in retained]:
+        del store.checkpoint_states[checkpoint]
+    pruned_latest_messages = get_pruned_latest_messages(store)
+    for i in [i for i, message in store.latest_messages.items() if message.root not in retained]:
+        pruned_latest_messages[i] = store.latest_messages.pop(i)
+    if store.proposer_boost_root not in retained:
+        store.proposer_boost_root = Root()
+    # Rebuilt from the latest messages on the next attestation score
+    _vote_weight_indices.get(id(store), []).clear()
+
+
+def _update_checkpoints_pruning(
+    store: Store, justified_checkpoint: Checkpoint, finalized_checkpoint: Checkpoint
+) -> None:
+    previous_finalized_checkpoint = store.finalized_checkpoint
+    _update_checkpoints(store, justified_checkpoint, finalized_checkpoint)
+    if prune_store_on_finalization and store.finalized_checkpoint != previous_finalized_checkpoint:
+        prune_store(store)
+
+
+_update_checkpoints = update_checkpoints
+update_checkpoints = _update_checkpoints_pruning
+
+
+def _update_latest_messages_pruning(
+    store: Store, attesting_indices: Sequence[ValidatorIndex], attestation: Attestation
+) -> None:
+    pruned_latest_messages = _pruned_latest_messages.get(id(store), {})
+    pruned = {
+        i: pruned_latest_messages[i] for i in attesting_indices if i in pruned_latest_messages
+    }
+    if len(pruned) == 0:
+        _update_latest_messages_tracked(store, attesting_indices, attestation)
+        return
+    # Put the pruned messages back for the ordering of the update only
+    store.latest_messages.update(pruned)
+    try:
+        _update_latest_messages_tracked(store, attesting_indices, attestation)
+    finally:
+        for i, message in pruned.items():
+            if store.latest_messages[i] is message:
+                del store.latest_messages[i]
+            else:
+                del pruned_latest_messages[i]
+
+
+_update_latest_messages_tracked = update_latest_messages
+update_latest_messages = _update_latest_messages_pruning
+
+
+# Set to True to record the bytes of new state tree nodes allocated by each block
+track_block_allocations = False
+
+# The bytes of new tree nodes in the post-state of each tracked block, over its parent state
+block_allocations: Dict[Root, int] = {}
+
+
+def _on_block_tracking(store: Store, signed_block: SignedBeaconBlock) -> None:
+    _on_block(store, signed_block)
+    if not track_block_allocations:
+        return
+    block = signed_block.message
+    block_root = hash_tree_root(block)
+    if block_root not in block_allocations:
+        block_allocations[block_root] = new_node_bytes(
+            store.block_states[block.parent_root], store.block_states[block_root])
+
+
+_on_block = on_block
+on_block = _on_block_tracking
+
+
+# Set to False to walk the whole registry, and write one validator at a time, in the epoch
+# processing loops that iterate over the validators below
+use_bulk_registry_updates = True
+
+
+def enumerate_effective_balance_updates(state: BeaconState) -> Iterator[Tuple[int, Validator]]:
+    """
+    ``enumerate(state.validators)`` for ``process_effective_balance_updates``, restricted to
+    the validators past a hysteresis threshold. It yields copies: the effective balances set
+    on them are written to the registry at once when the loop is done.
+    """
+    if not use_bulk_registry_updates:
+        yield from enumerate(state.validators)
+        return
+    balances = to_array(state.balances)
+    effective_balances = field_array(state.validators, "effective_balance")
+    hysteresis_increment = int(EFFECTIVE_BALANCE_INCREMENT // HYSTERESIS_QUOTIENT)
+    downward_threshold = hysteresis_increment * int(HYSTERESIS_DOWNWARD_MULTIPLIER)
+    upward_threshold = hysteresis_increment * int(HYSTERESIS_UPWARD_MULTIPLIER)
+    # The reference raises on an overflow
+    if (
+        len(balances) != len(effective_balances)
+        or int(balances.max(initial=0)) + downward_threshold > UINT64_MAX
+        or int(effective_balances.max(initial=0)) + upward_threshold > UINT64_MAX
+    ):
+        yield from enumerate(state.validators)
+        return
+
+    updates = []
+    for index in np.flatnonzero(
+        (balances + downward_threshold < effective_balances)
+        | (effective_balances + upward_threshold < balances)
+    ):
+        validator = state.validators[int(index)].copy()
+        yield int(index), validator
+        updates.append((index, validator))
+    if len(updates) > 0:
+        effective_balances = effective_balances.copy()
+        for index, validator in updates:
+            effective_balances[index] = validator.effective_balance
+        state.validators = from_field_array(
+            state.validators, "effective_balance", effective_balances)
+
+
+def enumerate_slashings(state: BeaconState) -> Iterator[Tuple[int, Validator]]:
+    """
+    ``enumerate(state.validators)`` for ``process_slashings``, restricted to the slashed
+    validators that are halfway through the slashings vector in the current epoch.
+    """
+    if not use_bulk_registry_updates:
+        yield from enumerate(state.validators)
+        return
+    withdrawable_epoch = int(get_current_epoch(state)) + int(EPOCHS_PER_SLASHINGS_VECTOR) // 2
+    for index in np.flatnonzero(
+        field_array(state.validators, "slashed")
+        & (field_array(state.validators, "withdrawable_epoch") == withdrawable_epoch)
+    ):
+        yield int(index), state.validators[int(index)]
+'''
+
+    @classmethod
+    def mirrored_functions(cls) -> set[str]:
+        # ``_add_validator_to_registry_indexed`` extends the pubkey index with the validator
+        # appended by ``add_validator_to_registry``. ``EpochCommittees`` slices the committees
+        # of ``compute_committee`` and ``get_beacon_committee`` out of one shuffle, and
+        # ``_get_attesting_indices_sliced`` reads the bits of ``get_attesting_indices``.
+        return {
+            "add_validator_to_registry",
+            "compute_committee",
+            "get_attesting_indices",
+            "get_beacon_committee",
+        }
+
+    @classmethod
+    def implement_optimizations(cls, functions: dict[str, str]) -> dict[str, str]:
+        # Look pubkeys up in the registry through an index instead of a list of all pubkeys
+        replace_in_functions(
+            functions, "[v.pubkey for v in state.validators]", "get_validator_pubkeys(state)"
+        )
+        # Only visit the validators these epoch processing loops can change, and write the
+        # effective balances back in bulk. The enumerate functions select the validators with
+        # the conditions below: the loops must still check the same ones.
+        for name, enumerate_fn, condition in [
+            (
+                "process_effective_balance_updates",
+                "enumerate_effective_balance_updates",
+                (
+                    "        if (\n"
+                    "            balance + DOWNWARD_THRESHOLD < validator.effective_balance\n"
+                    "            or validator.effective_balance + UPWARD_THRESHOLD < balance\n"
+                    "        ):\n"
+                ),
+            ),
+            (
+                "process_slashings",
+                "enumerate_slashings",
+                (
+                    "        if (\n"
+                    "            validator.slashed\n"
+                    "            and epoch + EPOCHS_PER_SLASHINGS_VECTOR // 2"
+                    " == validator.withdrawable_epoch\n"
+                    "        ):\n"
+                ),
+            ),
+        ]:
+            if condition not in functions[name]:
+                raise ValueError(
+                    f"cannot optimize {name}, the source does not contain: {condition!r}"
+                )
+            replace_in_function(
+                functions,
+                name,
+                "for index, validator in enumerate(state.validators):",
+                f"for index, validator in {enumerate_fn}(state):",
+            )
+        # The committees of a slot are one slice of the epoch committees
+        replace_in_function(
+            functions,
+            "get_slot_committee",
+            "    committees_count = get_committee_count_per_slot(shuffling_source, compute_epoch_at_slot(slot))\n"
+            "    participants: Set[ValidatorIndex] = set()\n"
+            "    for i in range(committees_count):\n"
+            "        participants.update(get_beacon_committee(shuffling_source, slot, CommitteeIndex(i)))\n",
+            "    participants: Set[ValidatorIndex] = set(get_slot_committees(shuffling_source, slot))\n",
+        )
+        if "compute_ptc" in functions:
+            replace_in_function(
+                functions,
+                "compute_ptc",
+                "    indices: list[ValidatorIndex] = []\n"
+                "    # Concatenate all committees for this slot in order\n"
+                "    committees_per_slot = get_committee_count_per_slot(state, epoch)\n"
+                "    for i in range(committees_per_slot):\n"
+                "        committee = get_beacon_committee(state, slot, CommitteeIndex(i))\n"
+                "        indices.extend(committee)\n",
+                "    # Concatenate all committees for this slot in order\n"
+                "    indices = list(get_slot_committees(state, slot))\n",
+            )
+        functions["get_fork_choice_node_parent"] = """
+def get_fork_choice_node_parent(store: Store, node: ForkChoiceNode) -> Optional[ForkChoiceNode]:
+    \"\"\"
+    Return the parent of ``node`` in the fork choice tree, or ``None`` if it is not in ``store``.
+    \"\"\"
+    if node.root not in store.blocks or store.blocks[node.root].parent_root not in store.blocks:
+        return None
+    return ForkChoiceNode(root=store.blocks[node.root].parent_root)""".strip()
+        # The signatures asserted by the processing of a block can be checked together, see
+        # ``bls.batch_verification``. The others are checked right away, e.g. the deposit
+        # signatures the state transition branches on.
+        defer_asserted_verifications(
+            functions,
+            [
+                "state_transition",
+                "process_randao",
+                "process_proposer_slashing",
+                "process_attester_slashing",
+                "process_attestation",
+                "process_voluntary_exit",
+            ],
+        )
+        return functions
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark computing and recovering the extended matrix of a block's blobs.
+
+For 6, 21 and 72 random blobs (or ``--blobs``), times:
+
+- ``reference``: the ``compute_matrix`` of the specification, one blob after the other,
+  each cell and proof in its own ``MatrixEntry``
+- ``kzg``: ``compute_packed_matrix``, the cells and proofs in two row-major buffers, with
+  ``matrix_threads`` set to 1 and to ``--threads`` (the number of CPUs by default)
+
+and then the recovery of the matrix from every other column:
+
+- ``reference``: the ``_recover_matrix`` reference, which scans the partial matrix for
+  each row
+- ``by row``: ``recover_matrix``, the entries grouped by row in one pass, and the rows
+  recovered by ``kzg.recover_matrix``, with 1 and ``--threads`` threads
+
+ckzg releases the GIL while it extends or recovers a blob, so the threads only help with
+more than one CPU.
+
+Usage:
+    uv run python scripts/benchmarks/blob_matrix.py [--fork fulu] [--blobs 6 21 72] [--threads 4]
+"""
+
+import argparse
+import importlib
+import os
+import random
+import time
+
+from eth_consensus_specs.test.helpers.blob import get_sample_blob
+from eth_consensus_specs.utils import kzg
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="fulu", help="fork to load (default: fulu)")
+    parser.add_argument(
+        "--blobs",
+        type=int,
+        nargs="+",
+        default=[6, 21, 72],
+        help="blob counts to time (default: 6 21 72)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=os.cpu_count(),
+        help="threads of the parallel run (default: the number of CPUs)",
+    )
+    parser.add_argument(
+        "--precompute",
+        type=int,
+        default=0,
+        help="trusted setup precomputation, 0 to 15 (default: 0)",
+    )
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.mainnet")
+    kzg.load_trusted_setup(args.precompute)
+    rng = random.Random(5566)
+    blobs = [get_sample_blob(spec, rng=rng) for _ in range(max(args.blobs))]
+    print(f"fork={args.fork} threads={args.threads} (of {os.cpu_count()} CPUs)")
+
+    matrices = {}
+    print(f"{'blobs':>6} {'reference':>10} {'kzg':>10} {f'kzg x{args.threads}':>10}")
+    for count in args.blobs:
+        reference, entries = timed(lambda count=count: spec._compute_matrix(blobs[:count]))
+        matrices[count] = entries
+        line = f"{count:>6} {reference:>9.2f}s"
+        for threads in [1, args.threads]:
+            kzg.matrix_threads = threads
+            seconds, matrix = timed(lambda count=count: spec.compute_packed_matrix(blobs[:count]))
+            assert [bytes(entry.cell) for entry in entries] == [
+                matrix.cell(entry.row_index, entry.column_index) for entry in entries
+            ]
+            line += f" {seconds:>9.2f}s"
+        kzg.matrix_threads = 1
+        print(line)
+
+    print(f"{'blobs':>6} {'reference':>10} {'by row':>10} {f'by row x{args.threads}':>10}")
+    for count, entries in matrices.items():
+        partial_matrix = [entry for entry in entries if entry.column_index % 2 == 0]
+        reference, expected = timed(lambda p=partial_matrix, c=count: spec._recover_matrix(p, c))
+        assert expected == entries
+        line = f"{count:>6} {reference:>9.2f}s"
+        for threads in [1, args.threads]:
+            kzg.matrix_threads = threads
+            seconds, recovered = timed(lambda p=partial_matrix, c=count: spec.recover_matrix(p, c))
+            assert recovered == expected
+            line += f" {seconds:>9.2f}s"
+        kzg.matrix_threads = 1
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
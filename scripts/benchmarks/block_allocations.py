@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Report the state tree nodes allocated by each block applied to a fork choice Store.
+
+Builds a fully attested chain on the minimal preset (BLS disabled), feeds it to a
+Store with ``track_block_allocations`` enabled and prints, per epoch, the bytes of
+new tree nodes in the post-states over their parent states. States share every
+unchanged subtree with the state they were copied from, so these bytes are the
+actual memory cost of keeping one more state in ``store.block_states``.
+
+Usage:
+    uv run python scripts/benchmarks/block_allocations.py [--fork phase0] [--epochs 8]
+"""
+
+import argparse
+import importlib
+import statistics
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.attestations import next_epoch_with_attestations
+from eth_consensus_specs.test.helpers.fork_choice import get_genesis_forkchoice_store
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.utils import bls
+from eth_consensus_specs.utils.ssz.ssz_impl import copy, new_node_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="phase0", help="fork to load (default: phase0)")
+    parser.add_argument("--epochs", type=int, default=8, help="epochs to run (default: 8)")
+    args = parser.parse_args()
+
+    bls.bls_active = False
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.minimal")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    store = get_genesis_forkchoice_store(spec, state)
+    print(f"fork={args.fork} preset=minimal validators={len(state.validators)}")
+    print(f"copy of the anchor state: {new_node_bytes(state, copy(state))} bytes")
+    print(f"{'epoch':>5} {'blocks':>6} {'mean':>10} {'max':>10} {'epoch start':>12}")
+
+    spec.track_block_allocations = True
+    for _ in range(args.epochs):
+        _, signed_blocks, state = next_epoch_with_attestations(
+            spec, state, fill_cur_epoch=True, fill_prev_epoch=False
+        )
+        for signed_block in signed_blocks:
+            block = signed_block.message
+            spec.on_tick(
+                store, store.genesis_time + block.slot * spec.config.SLOT_DURATION_MS // 1000
+            )
+            spec.on_block(store, signed_block)
+            for attestation in block.body.attestations:
+                spec.on_attestation(store, attestation, is_from_block=True)
+
+        allocations = [
+            spec.block_allocations[signed_block.message.hash_tree_root()]
+            for signed_block in signed_blocks
+        ]
+        print(
+            f"{int(spec.get_current_epoch(state)) - 1:>5} {len(allocations):>6}"
+            f" {statistics.mean(allocations):>10.0f} {max(allocations):>10}"
+            f" {allocations[0]:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
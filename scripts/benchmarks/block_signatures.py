@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare the time to process signed blocks with and without batch verification.
+
+Builds ``--epochs`` epochs of fully attested, signed blocks on the minimal preset (BLS
+enabled), then replays them from the same pre-state with ``spec.state_transition``:
+
+- ``single``: each signature is checked with its own pairing, as by default
+- ``batch``: each block within a ``bls.batch_verification``, so that its asserted
+  signatures are checked with one multi-pairing
+
+Both replays must reach the same post-state.
+
+Usage:
+    uv run python scripts/benchmarks/block_signatures.py [--fork phase0] [--epochs 2]
+"""
+
+import argparse
+import importlib
+import time
+from contextlib import nullcontext
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.attestations import next_epoch_with_attestations
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.test.helpers.state import next_epoch
+from eth_consensus_specs.utils import bls
+
+
+def replay(spec, state, signed_blocks, batch):
+    state = state.copy()
+    start = time.perf_counter()
+    for signed_block in signed_blocks:
+        with bls.batch_verification() if batch else nullcontext():
+            spec.state_transition(state, signed_block)
+    return state, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="phase0", help="fork to load (default: phase0)")
+    parser.add_argument("--epochs", type=int, default=2, help="epochs of blocks (default: 2)")
+    args = parser.parse_args()
+
+    bls.bls_active = True
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.minimal")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    next_epoch(spec, state)
+    pre_state = state.copy()
+    signed_blocks = []
+    for _ in range(args.epochs):
+        _, blocks, state = next_epoch_with_attestations(
+            spec, state, fill_cur_epoch=True, fill_prev_epoch=False
+        )
+        signed_blocks.extend(blocks)
+    attestations = sum(len(block.message.body.attestations) for block in signed_blocks)
+    print(f"fork={args.fork} preset=minimal blocks={len(signed_blocks)} attestations={attestations}")
+
+    print(f"{'mode':>6} {'time':>9} {'per block':>10}")
+    post_roots = set()
+    for mode in ["single", "batch"]:
+        post_state, seconds = replay(spec, pre_state, signed_blocks, batch=mode == "batch")
+        post_roots.add(post_state.hash_tree_root())
+        print(f"{mode:>6} {seconds:>8.2f}s {seconds / len(signed_blocks) * 1000:>8.1f}ms")
+    assert len(post_roots) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark bulk writes of balances and effective balances on a large registry.
+
+Builds a minimal preset state with ``--validators`` validators (1M by default) and
+compares, for ``state.balances`` and the ``effective_balance`` field of
+``state.validators``:
+
+- ``element``: one write per validator, each rebuilding the path to the root,
+  timed on ``--sample`` validators and extrapolated to the whole registry
+- ``bulk``: ``from_array`` / ``from_field_array``, which rebuild only the changed paths, once
+
+It then times ``process_effective_balance_updates`` with ``--changed`` of the
+validators past a hysteresis threshold, with the bulk registry updates
+(``use_bulk_registry_updates``) and with the reference loop over every validator.
+
+Usage:
+    uv run python scripts/benchmarks/bulk_writes.py [--fork electra] [--validators 1000000]
+"""
+
+import argparse
+import importlib
+import time
+
+import numpy as np
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.utils.ssz.ssz_impl import (
+    field_array,
+    from_array,
+    from_field_array,
+    to_array,
+)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def write_elements(view, sample: int, write) -> float:
+    view = view.copy()
+    seconds, _ = timed(lambda: [write(view, index) for index in range(sample)])
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="electra", help="fork to load (default: electra)")
+    parser.add_argument(
+        "--validators",
+        type=int,
+        default=1_000_000,
+        help="validators in the state (default: 1000000)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=50_000,
+        help="element writes to time and extrapolate from (default: 50000)",
+    )
+    parser.add_argument(
+        "--changed",
+        type=float,
+        default=0.01,
+        help="fraction of effective balances to update (default: 0.01)",
+    )
+    parser.add_argument(
+        "--no-reference", action="store_true", help="skip the reference effective balance loop"
+    )
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.minimal")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    genesis_validators = list(state.validators)
+    seconds, validators = timed(
+        lambda: type(state.validators)(
+            *[genesis_validators[i % len(genesis_validators)] for i in range(args.validators)]
+        )
+    )
+    state.validators = validators
+    state.balances = from_array(
+        type(state.balances), np.full(args.validators, int(spec.MAX_EFFECTIVE_BALANCE), np.uint64)
+    )
+    state.hash_tree_root()
+    print(f"fork={args.fork} preset=minimal validators={args.validators} (built in {seconds:.1f}s)")
+    scale = args.validators / args.sample
+
+    print(f"{'write':>18} {'element':>10} {'bulk':>10} {'root after bulk':>16}")
+    balances = to_array(state.balances) - 1
+    element = write_elements(
+        state.balances, args.sample, lambda view, i: view.__setitem__(i, int(balances[i]))
+    )
+    bulk, view = timed(lambda: from_array(type(state.balances), balances, base=state.balances))
+    root, _ = timed(view.hash_tree_root)
+    print(f"{'balances':>18} {element * scale:>9.2f}s {bulk:>9.2f}s {root:>15.2f}s")
+
+    effective_balances = field_array(state.validators, "effective_balance") - 1
+    element = write_elements(
+        state.validators,
+        args.sample,
+        lambda view, i: setattr(view[i], "effective_balance", int(effective_balances[i])),
+    )
+    bulk, view = timed(
+        lambda: from_field_array(state.validators, "effective_balance", effective_balances)
+    )
+    root, _ = timed(view.hash_tree_root)
+    print(f"{'effective_balance':>18} {element * scale:>9.2f}s {bulk:>9.2f}s {root:>15.2f}s")
+
+    # Balances that cross the downward threshold for every ``1 / changed``-th validator
+    balances = np.full(args.validators, int(spec.MAX_EFFECTIVE_BALANCE), np.uint64)
+    balances[:: max(1, round(1 / args.changed))] -= int(spec.EFFECTIVE_BALANCE_INCREMENT)
+    state.balances = from_array(type(state.balances), balances)
+    print(f"process_effective_balance_updates, {args.changed:.1%} updated:")
+    variants = [("bulk", True)] + ([] if args.no_reference else [("reference", False)])
+    roots = set()
+    for name, bulk_updates in variants:
+        spec.use_bulk_registry_updates = bulk_updates
+        post = state.copy()
+        seconds, _ = timed(lambda post=post: spec.process_effective_balance_updates(post))
+        root_seconds, root = timed(post.hash_tree_root)
+        roots.add(root)
+        print(f"{name:>18} {seconds:>9.2f}s, root {root_seconds:.2f}s")
+    spec.use_bulk_registry_updates = True
+    assert len(roots) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark verifying the KZG proofs of the data column sidecars of a slot.
+
+Builds a block with ``--blobs`` blobs and its data column sidecars, as the fulu gossip
+``data_column_sidecar`` tests do, and for the first 8, 32 and 128 columns (or
+``--columns``) times:
+
+- ``reference``: ``verify_data_column_sidecar_kzg_proofs`` for each sidecar
+- ``batch``: a ``DataColumnSidecarBatch`` of all the sidecars, one batch verification
+- ``1 invalid``: the same batch with one invalid sidecar, found by bisection
+
+Usage:
+    uv run python scripts/benchmarks/column_verification.py [--fork fulu] [--blobs 6]
+"""
+
+import argparse
+import importlib
+import random
+import time
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.blob import get_block_with_blob_and_sidecars
+from eth_consensus_specs.test.helpers.das import DataColumnSidecarBatch, get_sidecar_slot
+from eth_consensus_specs.test.helpers.forks import is_post_gloas
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.utils import kzg
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def verify_batch(spec, sidecars, kzg_commitments):
+    batch = DataColumnSidecarBatch(spec, get_sidecar_slot(spec, sidecars[0]))
+    for sidecar in sidecars:
+        batch.add(sidecar, kzg_commitments if is_post_gloas(spec) else None)
+    return batch.verify(), batch.batch_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="fulu", help="fork to load (default: fulu)")
+    parser.add_argument("--blobs", type=int, default=6, help="blobs in the block (default: 6)")
+    parser.add_argument(
+        "--columns",
+        type=int,
+        nargs="+",
+        default=[8, 32, 128],
+        help="sidecar counts to verify (default: 8 32 128)",
+    )
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.minimal")
+    kzg.load_trusted_setup()
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    *_, sidecars, kzg_commitments = get_block_with_blob_and_sidecars(
+        spec, state, rng=random.Random(5566), blob_count=args.blobs
+    )
+    print(f"fork={args.fork} preset=minimal blobs={args.blobs}")
+
+    def reference(sidecar):
+        if is_post_gloas(spec):
+            return spec.verify_data_column_sidecar_kzg_proofs(sidecar, kzg_commitments)
+        return spec.verify_data_column_sidecar_kzg_proofs(sidecar)
+
+    print(f"{'columns':>8} {'reference':>10} {'batch':>10} {'1 invalid':>10} {'batches':>8}")
+    for count in args.columns:
+        columns = sidecars[:count]
+        seconds, expected = timed(lambda columns=columns: [reference(c) for c in columns])
+        line = f"{count:>8} {seconds:>9.2f}s"
+        seconds, (valid, _) = timed(
+            lambda columns=columns: verify_batch(spec, columns, kzg_commitments)
+        )
+        assert valid == expected == [True] * count
+        line += f" {seconds:>9.2f}s"
+
+        invalid = [sidecar.copy() for sidecar in columns]
+        invalid[count // 3].column[0] = invalid[count // 3].column[args.blobs - 1]
+        seconds, (valid, batch_count) = timed(
+            lambda invalid=invalid: verify_batch(spec, invalid, kzg_commitments)
+        )
+        assert valid.count(False) == (1 if args.blobs > 1 else 0)
+        print(f"{line} {seconds:>9.2f}s {batch_count:>8}")
+
+
+if __name__ == "__main__":
+    main()
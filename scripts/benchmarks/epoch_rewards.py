@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark the altair+ inactivity score updates and rewards of an epoch transition.
+
+Builds a mainnet preset state with ``--validators`` validators, random previous
+epoch participation and inactivity scores, and times ``process_inactivity_updates``
+and ``process_rewards_and_penalties`` with the columnar implementation
+(``use_columnar_epoch_processing``) and with the reference per-validator loops.
+Both must produce the same state. The reference inactivity updates are quadratic
+in the number of validators, ``--no-reference`` skips them for large registries.
+
+Usage:
+    uv run python scripts/benchmarks/epoch_rewards.py [--fork electra] [--validators 1024]
+"""
+
+import argparse
+import importlib
+import statistics
+import time
+from random import Random
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+
+
+def time_process(spec, state, name: str, *, columnar: bool, repeat: int):
+    spec.use_columnar_epoch_processing = columnar
+    runs = []
+    for _ in range(repeat):
+        post = state.copy()
+        spec.get_epoch_columns.cache_clear()
+        start = time.perf_counter()
+        getattr(spec, name)(post)
+        runs.append(time.perf_counter() - start)
+    spec.use_columnar_epoch_processing = True
+    return statistics.median(runs), post
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="electra", help="fork to load (default: electra)")
+    parser.add_argument(
+        "--validators", type=int, default=1024, help="validators in the state (default: 1024)"
+    )
+    parser.add_argument(
+        "--no-reference", action="store_true", help="only time the columnar implementation"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant (default: 3)")
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.mainnet")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    genesis_count = len(state.validators)
+    while len(state.validators) < args.validators:
+        index = len(state.validators) % genesis_count
+        state.validators.append(state.validators[index].copy())
+        state.balances.append(state.balances[index])
+        state.inactivity_scores.append(0)
+        state.previous_epoch_participation.append(0)
+        state.current_epoch_participation.append(0)
+
+    rng = Random(1013)
+    state.previous_epoch_participation = [
+        rng.choice([0b000, 0b011, 0b111, 0b111]) for _ in range(len(state.validators))
+    ]
+    state.inactivity_scores = [rng.randint(0, 100) for _ in range(len(state.validators))]
+    state.slot = spec.SLOTS_PER_EPOCH * 3 - 1
+    # Computed by ``process_justification_and_finalization`` earlier in the epoch transition
+    spec.get_total_active_balance(state)
+
+    print(f"fork={args.fork} preset=mainnet validators={len(state.validators)}")
+    for name in ["process_inactivity_updates", "process_rewards_and_penalties"]:
+        seconds, post = time_process(spec, state, name, columnar=True, repeat=args.repeat)
+        line = f"{name:>30} columnar {seconds * 1000:>9.1f}ms"
+        if not args.no_reference:
+            reference_seconds, expected = time_process(spec, state, name, columnar=False, repeat=1)
+            assert post.hash_tree_root() == expected.hash_tree_root()
+            line += f"  reference {reference_seconds * 1000:>9.1f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
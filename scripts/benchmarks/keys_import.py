@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark the startup cost of the test key table.
+
+``eth_consensus_specs.test.helpers.keys`` used to derive every validator and builder
+pubkey with ``bls.SkToPk`` at import time, in every pytest-xdist worker. The pubkeys
+now live in a checksummed, memory-mapped cache file that is opened on first access.
+This script times, in a fresh interpreter each:
+
+- ``import``: importing the keys module
+- ``cold``: import plus the first pubkey lookup, with an empty cache directory
+- ``warm``: import plus the first pubkey lookup, with the cache file present
+- ``eager``: computing every pubkey, the previous import-time behaviour
+
+Usage:
+    uv run python scripts/benchmarks/keys_import.py [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCENARIOS = {
+    "import": "from eth_consensus_specs.test.helpers import keys",
+    "first lookup": "from eth_consensus_specs.test.helpers import keys\n"
+    "keys.pubkeys[0]\nkeys.builder_pubkeys[0]",
+    "reverse lookup": "from eth_consensus_specs.test.helpers import keys\n"
+    "keys.pubkey_to_privkey[keys.pubkeys[-1]]",
+    "eager": "from eth_consensus_specs.test.helpers import keys\n"
+    "from eth_consensus_specs.utils import bls\n"
+    "[bls.SkToPk(k) for k in keys.privkeys + keys.builder_privkeys]",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+
+def time_scenario(body: str, cache_dir: str, *, cold: bool) -> float:
+    env = dict(os.environ, ETH_CONSENSUS_SPECS_CACHE_DIR=cache_dir)
+    if cold:
+        for path in Path(cache_dir).iterdir():
+            path.unlink()
+    return float(
+        subprocess.run(
+            [sys.executable, "-c", TIMER.format(body=body)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario (default: 3)")
+    args = parser.parse_args()
+
+    print(f"{'scenario':>15} {'cold':>8} {'warm':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, body in SCENARIOS.items():
+            cold = statistics.median(
+                time_scenario(body, cache_dir, cold=True) for _ in range(args.repeat)
+            )
+            warm = statistics.median(
+                time_scenario(body, cache_dir, cold=False) for _ in range(args.repeat)
+            )
+            print(f"{name:>15} {cold:>7.3f}s {warm:>7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
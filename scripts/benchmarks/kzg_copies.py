@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Measure the bytes allocated by the KZG wrappers around ckzg.
+
+Builds ``--blobs`` random ``Blob`` views (6 by default), with their commitments and proofs,
+and reports, for one ``verify_blob_kzg_proof_batch`` call, the bytes allocated
+(``tracemalloc`` peak above the inputs) and the time:
+
+- ``views``: the blobs, commitments and proofs as lists of SSZ views
+- ``packed``: each of them joined into one ``bytes`` buffer before the call
+
+Both are compared with one blob's size, the memory a single copy of a blob costs.
+
+Usage:
+    uv run python scripts/benchmarks/kzg_copies.py [--fork deneb] [--blobs 6]
+"""
+
+import argparse
+import importlib
+import random
+import time
+import tracemalloc
+
+from eth_consensus_specs.test.helpers.blob import get_sample_blob
+from eth_consensus_specs.utils import kzg
+
+
+def measure(fn, repeat):
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    assert fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return peak - base, (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="deneb", help="fork to load (default: deneb)")
+    parser.add_argument("--blobs", type=int, default=6, help="blobs per call (default: 6)")
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls (default: 10)")
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.mainnet")
+    kzg.load_trusted_setup()
+    rng = random.Random(5566)
+    blobs = [get_sample_blob(spec, rng=rng) for _ in range(args.blobs)]
+    commitments = [spec.KZGCommitment(kzg.blob_to_kzg_commitment(blob)) for blob in blobs]
+    proofs = [
+        spec.KZGProof(kzg.compute_blob_kzg_proof(blob, commitment))
+        for blob, commitment in zip(blobs, commitments, strict=True)
+    ]
+    packed = [b"".join(blobs), b"".join(commitments), b"".join(proofs)]
+    print(f"fork={args.fork} blobs={args.blobs} blob={len(blobs[0]) // 1024} KiB")
+
+    print(f"{'inputs':>8} {'allocated':>12} {'in blobs':>9} {'time':>9}")
+    for name, inputs in [("views", [blobs, commitments, proofs]), ("packed", packed)]:
+        allocated, seconds = measure(
+            lambda inputs=inputs: kzg.verify_blob_kzg_proof_batch(*inputs), args.repeat
+        )
+        print(
+            f"{name:>8} {allocated / 1024:>8.0f} KiB {allocated / len(blobs[0]):>9.2f}"
+            f" {seconds * 1000:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark building several Merkle branches of one object.
+
+Builds a minimal preset genesis state and times, for sets of generalized indices of
+the state:
+
+- ``single``: one ``build_proof`` walk from the root per index
+- ``branches``: ``build_proofs``, one walk for all the branches, each still complete
+- ``multiproof``: ``build_multiproof``, one walk and only the helper nodes of the set
+
+The sets are the three light client branches (sync committees and finalized root),
+the root of every field of the state, and ``--balances`` leaves of ``state.balances``.
+Each build is repeated ``--repeat`` times; the tree roots are cached after the first.
+
+Usage:
+    uv run python scripts/benchmarks/merkle_proofs.py [--fork electra] [--balances 256]
+"""
+
+import argparse
+import importlib
+import time
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.test.helpers.merkle import (
+    build_multiproof,
+    build_proof,
+    build_proofs,
+    verify_merkle_multiproof,
+)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="electra", help="fork to load (default: electra)")
+    parser.add_argument(
+        "--balances",
+        type=int,
+        default=256,
+        help="balance leaves to prove in the last set (default: 256)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=100, help="builds to time per set (default: 100)"
+    )
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.minimal")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    anchor = state.get_backing()
+    root = state.hash_tree_root()
+    print(f"fork={args.fork} preset=minimal validators={len(state.validators)}")
+
+    balances_gindex = spec.get_generalized_index(spec.BeaconState, "balances")
+    # Balances are packed 4 to a chunk, under the length mix-in of the list
+    balances_depth = (spec.VALIDATOR_REGISTRY_LIMIT * 8 // 32 - 1).bit_length()
+    sets = {
+        "light client": [
+            spec.get_generalized_index(spec.BeaconState, "current_sync_committee"),
+            spec.get_generalized_index(spec.BeaconState, "next_sync_committee"),
+            spec.get_generalized_index(spec.BeaconState, "finalized_checkpoint", "root"),
+        ],
+        "state fields": [
+            spec.get_generalized_index(spec.BeaconState, field)
+            for field in spec.BeaconState.fields()
+        ],
+        "balances": [
+            (balances_gindex * 2 << balances_depth) + chunk
+            for chunk in range(min(args.balances, len(state.balances)) // 4 or 1)
+        ],
+    }
+
+    print(
+        f"{'set':>14} {'indices':>8} {'single':>10} {'branches':>10} {'multiproof':>10} {'nodes':>12}"
+    )
+    for name, gindices in sets.items():
+        single, proofs = timed(
+            lambda gindices=gindices: [
+                [build_proof(anchor, gindex) for gindex in gindices] for _ in range(args.repeat)
+            ]
+        )
+        branches, multi_proofs = timed(
+            lambda gindices=gindices: [build_proofs(anchor, gindices) for _ in range(args.repeat)]
+        )
+        assert multi_proofs[0] == proofs[0]
+        multi, multiproofs = timed(
+            lambda gindices=gindices: [
+                build_multiproof(anchor, gindices) for _ in range(args.repeat)
+            ]
+        )
+        leaves = [anchor.getter(gindex).merkle_root() for gindex in gindices]
+        assert verify_merkle_multiproof(leaves, multiproofs[0], gindices, root)
+        nodes = f"{sum(map(len, proofs[0]))}/{len(multiproofs[0])}"
+        print(
+            f"{name:>14} {len(gindices):>8} {single / args.repeat * 1e3:>8.2f}ms"
+            f" {branches / args.repeat * 1e3:>8.2f}ms {multi / args.repeat * 1e3:>8.2f}ms"
+            f" {nodes:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
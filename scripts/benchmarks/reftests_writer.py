@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark the wall time of generating reference tests with background writers.
+
+Runs the pytest command of ``make test reftests=true`` for one fork and preset,
+once per ``--reftests-writers`` value, and prints the wall time of each run. With
+writers, the test cases are serialized (YAML and snappy) and written by a pool of
+processes while the tests carry on. The generated files are compared between the
+runs, which must produce identical output.
+
+Usage:
+    uv run python scripts/benchmarks/reftests_writer.py [--fork phase0] [--preset minimal]
+        [--writers 0 2 4] [--xdist logical] [-k ssz_static]
+"""
+
+import argparse
+import hashlib
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PYSPEC_DIR = Path(__file__).resolve().parents[2] / "tests" / "core" / "pyspec"
+
+
+def digest_tree(root: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            digest.update(str(path.relative_to(root)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="phase0", help="fork to generate (default: phase0)")
+    parser.add_argument("--preset", default="minimal", help="preset to generate (default: minimal)")
+    parser.add_argument(
+        "--writers",
+        type=int,
+        nargs="+",
+        default=[0, 2, 4],
+        help="--reftests-writers values to compare (default: 0 2 4)",
+    )
+    parser.add_argument(
+        "--xdist", default="logical", help="pytest-xdist workers, 0 to disable (default: logical)"
+    )
+    parser.add_argument("-k", help="only run tests matching this expression")
+    args = parser.parse_args()
+
+    print(f"fork={args.fork} preset={args.preset} xdist={args.xdist}")
+    print(f"{'writers':>7} {'wall':>9} {'files':>7}  output digest")
+    with tempfile.TemporaryDirectory() as tmp:
+        for writers in args.writers:
+            output = Path(tmp) / f"writers-{writers}"
+            command = [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-q",
+                "-p",
+                "no:cacheprovider",
+                f"--fork={args.fork}",
+                f"--preset={args.preset}",
+                "--reftests",
+                f"--reftests-output={output}",
+                f"--reftests-writers={writers}",
+            ]
+            if args.xdist != "0":
+                command += ["-n", args.xdist, "--dist=worksteal"]
+            if args.k:
+                command += ["-k", args.k]
+            command.append(str(PYSPEC_DIR / "eth_consensus_specs"))
+
+            start = time.perf_counter()
+            subprocess.run(command, check=True, cwd=PYSPEC_DIR, capture_output=True)
+            wall = time.perf_counter() - start
+            files = sum(1 for path in output.rglob("*") if path.is_file())
+            print(f"{writers:>7} {wall:>8.1f}s {files:>7}  {digest_tree(output)[:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Replay the ``Seen`` lookups and updates of the attestation gossip of a few epochs.
+
+For ``--epochs`` epochs (4 by default) of ``--validators`` validators (500000 by
+default), each validator attests once per epoch and each committee has ``--aggregators``
+aggregators (16 by default), whose aggregates have each bit set with a probability of
+0.9. The checks and updates of ``validate_beacon_attestation`` and
+``validate_beacon_aggregate_and_proof`` on ``seen`` are replayed, without the rest of the
+validation, for:
+
+- ``unbounded``: the ``Seen`` of ``get_seen(spec, bounded=False)``, sets and dicts that keep every entry, the
+  aggregation bits checked by the reference ``is_non_strict_superset``
+- ``bounded``: the ``Seen`` of ``get_bounded_seen``, the entries older than
+  ``--retained-epochs`` epochs (the propagation window by default) dropped, the aggregation
+  bits in an ``AggregationBitsIndex``, which ``is_non_strict_superset`` compares as
+  integers over the maximal bits
+
+and reports the time of each epoch, the entries retained after the last one and, with
+``--memory``, the bytes traced after each epoch (``tracemalloc``, in a second run). The
+bounded ``Seen`` stays on the same level once its window is full, the unbounded one grows
+with every epoch.
+
+Usage:
+    uv run python scripts/benchmarks/seen_replay.py [--fork phase0] [--validators 500000] [--epochs 4]
+"""
+
+import argparse
+import importlib
+import random
+import time
+import tracemalloc
+
+from eth_consensus_specs.test.helpers.forks import is_post_electra
+from eth_consensus_specs.test.helpers.gossip import get_bounded_seen, get_seen
+
+SEEN_FIELDS = ["attestation_validator_epochs", "aggregator_epochs", "aggregate_data_roots"]
+
+
+def replay_epoch(spec, seen, epoch, validators, aggregators, bits_pool):
+    slots = int(spec.SLOTS_PER_EPOCH)
+    committees = max(1, min(int(spec.MAX_COMMITTEES_PER_SLOT), validators // slots // 128))
+    for slot in range(epoch * slots, (epoch + 1) * slots):
+        for validator in range(slot % slots, validators, slots):
+            attestation_epoch_key = (epoch, validator)
+            if attestation_epoch_key not in seen.attestation_validator_epochs:
+                seen.attestation_validator_epochs.add(attestation_epoch_key)
+
+        for index in range(committees):
+            root = slot.to_bytes(8, "little") + index.to_bytes(8, "little") + bytes(16)
+            aggregate_cache_key = (root, index) if is_post_electra(spec) else root
+            for i in range(aggregators):
+                # A new tuple per aggregate, as decoded from its aggregation bits
+                pooled_bits = bits_pool[(slot * committees + index + i) % len(bits_pool)]
+                aggregate_bits = tuple(bool(bit) for bit in pooled_bits)
+                seen_bits = seen.aggregate_data_roots.get(aggregate_cache_key, set())
+                if spec.is_non_strict_superset(seen_bits, aggregate_bits):
+                    continue
+                aggregator = ((slot * committees + index) * aggregators + i) % validators
+                aggregator_epoch_key = (epoch, aggregator)
+                if aggregator_epoch_key in seen.aggregator_epochs:
+                    continue
+                seen.aggregator_epochs.add(aggregator_epoch_key)
+                if aggregate_cache_key not in seen.aggregate_data_roots:
+                    seen.aggregate_data_roots[aggregate_cache_key] = set()
+                seen.aggregate_data_roots[aggregate_cache_key].add(aggregate_bits)
+
+
+def replay(spec, seen, args, bits_pool):
+    seconds = []
+    for epoch in range(args.epochs):
+        start = time.perf_counter()
+        replay_epoch(spec, seen, epoch, args.validators, args.aggregators, bits_pool)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def replay_memory(spec, seen_fn, args, bits_pool):
+    """
+    Return the bytes traced after each epoch of a replay on a new ``seen_fn()``.
+    """
+    memory = []
+    tracemalloc.start()
+    try:
+        seen = seen_fn()
+        for epoch in range(args.epochs):
+            replay_epoch(spec, seen, epoch, args.validators, args.aggregators, bits_pool)
+            memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    return memory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="phase0", help="fork to load (default: phase0)")
+    parser.add_argument(
+        "--validators", type=int, default=500000, help="attesting validators (default: 500000)"
+    )
+    parser.add_argument("--epochs", type=int, default=4, help="epochs to replay (default: 4)")
+    parser.add_argument(
+        "--aggregators", type=int, default=16, help="aggregators per committee (default: 16)"
+    )
+    parser.add_argument(
+        "--retained-epochs",
+        type=int,
+        default=None,
+        help="epochs kept when bounded, at least the propagation window (default: the window)",
+    )
+    parser.add_argument("--memory", action="store_true", help="also measure the retained bytes")
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.mainnet")
+    slots = int(spec.SLOTS_PER_EPOCH)
+    committees = max(1, min(int(spec.MAX_COMMITTEES_PER_SLOT), args.validators // slots // 128))
+    committee_size = args.validators // slots // committees
+    rng = random.Random(5566)
+    bits_pool = [tuple(rng.random() < 0.9 for _ in range(committee_size)) for _ in range(256)]
+    print(
+        f"fork={args.fork} validators={args.validators} epochs={args.epochs}"
+        f" committees={committees * slots}/epoch committee_size={committee_size}"
+    )
+
+    seen_fns = [
+        ("unbounded", lambda: get_seen(spec, bounded=False)),
+        ("bounded", lambda: get_bounded_seen(spec, args.retained_epochs)),
+    ]
+    header = f"{'seen':>10} {'epochs':>{9 * args.epochs}} {'entries':>10} {'bits':>8}"
+    print(header + (f" {'memory':>{12 * args.epochs}}" if args.memory else ""))
+    for name, seen_fn in seen_fns:
+        seen = seen_fn()
+        seconds = replay(spec, seen, args, bits_pool)
+        entries = sum(len(getattr(seen, field)) for field in SEEN_FIELDS)
+        bits = sum(len(bits_set) for bits_set in seen.aggregate_data_roots.values())
+        line = f"{name:>10}" + "".join(f" {s:>7.2f}s" for s in seconds)
+        line += f" {entries:>10} {bits:>8}"
+        if args.memory:
+            del seen
+            memory = replay_memory(spec, seen_fn, args, bits_pool)
+            line += "".join(f" {m / 2**20:>7.0f} MiB" for m in memory)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark the swap-or-not shuffle used for committee computation.
+
+Compares the reference spec loop (``_compute_shuffled_permutation``) with the
+array-based implementation that the generated pyspec swaps in for
+``compute_shuffled_permutation``. The reference loop is slow on large
+registries, so it only runs up to ``--reference-limit`` indices.
+
+Usage:
+    uv run python scripts/benchmarks/shuffling.py [--preset mainnet] [--counts 16384 262144 1048576]
+"""
+
+import argparse
+import importlib
+import time
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--preset", default="mainnet", help="preset to load (default: mainnet)")
+    parser.add_argument(
+        "--counts",
+        nargs="+",
+        type=int,
+        default=[2**14, 2**18, 2**20],
+        help="index counts to shuffle (default: 16384 262144 1048576)",
+    )
+    parser.add_argument(
+        "--reference-limit",
+        type=int,
+        default=2**14,
+        help="largest index count to run the reference loop on (default: 16384)",
+    )
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.phase0.{args.preset}")
+    seed = spec.hash(b"benchmark")
+    print(f"preset={args.preset} SHUFFLE_ROUND_COUNT={spec.SHUFFLE_ROUND_COUNT}")
+    print(f"{'count':>10} {'reference':>12} {'optimized':>12} {'speedup':>9}")
+    for count in args.counts:
+        optimized = timed(spec._compute_shuffled_permutation_optimized, spec.Uint64(count), seed)
+        if count <= args.reference_limit:
+            reference = timed(spec._compute_shuffled_permutation, spec.Uint64(count), seed)
+            print(
+                f"{count:>10} {reference:>11.3f}s {optimized:>11.3f}s {reference / optimized:>8.1f}x"
+            )
+        else:
+            print(f"{count:>10} {'-':>12} {optimized:>11.3f}s {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the startup cost of loading the generated spec modules.
+
+``eth_consensus_specs.test.helpers.specs.spec_targets`` imports a spec module the
+first time a fork is looked up. Before, it imported every fork for both presets
+when the test helpers were imported. This script times each scenario in a fresh
+interpreter, which is also what every pytest-xdist worker pays at startup:
+
+- ``helpers``: importing the test context, without touching any spec
+- ``<fork>``: the test context plus one fork on one preset (a single-fork run)
+- ``all``: every fork on both presets, the previous eager behaviour
+
+Usage:
+    uv run python scripts/benchmarks/spec_import.py [--forks phase0 electra] [--workers 8]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from eth_consensus_specs.test.helpers.specs import ALL_EXECUTABLE_SPEC_NAMES
+
+SCENARIO = """
+import time
+start = time.perf_counter()
+import eth_consensus_specs.test.context
+from eth_consensus_specs.test.helpers.specs import spec_targets
+for preset, forks in {targets!r}.items():
+    for fork in forks:
+        spec_targets[preset][fork]
+print(time.perf_counter() - start)
+"""
+
+
+def time_scenario(targets: dict[str, list[str]], repeat: int) -> float:
+    runs = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", SCENARIO.format(targets=targets)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--preset", default="minimal", help="preset to load (default: minimal)")
+    parser.add_argument(
+        "--forks",
+        nargs="+",
+        default=["phase0", "electra", "gloas"],
+        help="forks to time on their own (default: phase0 electra gloas)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="xdist workers to extrapolate to (default: 8)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario (default: 3)")
+    args = parser.parse_args()
+
+    scenarios = {"helpers": {}}
+    for fork in args.forks:
+        scenarios[fork] = {args.preset: [fork]}
+    scenarios["all"] = {
+        preset: list(ALL_EXECUTABLE_SPEC_NAMES) for preset in ["minimal", "mainnet"]
+    }
+
+    print(f"{'scenario':>10} {'per worker':>11} {f'x{args.workers} workers':>13}")
+    for name, targets in scenarios.items():
+        seconds = time_scenario(targets, args.repeat)
+        print(f"{name:>10} {seconds:>10.2f}s {seconds * args.workers:>12.1f}s")
+
+
+if __name__ == "__main__":
+    main()
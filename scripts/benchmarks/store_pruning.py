@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark the memory held by a fork choice Store over a long canonical chain.
+
+Builds a fully attested chain on the minimal preset (BLS disabled) and feeds every
+block and its attestations to the Store, printing the resident set size as the
+chain grows. With ``prune_store_on_finalization`` enabled, the Store only keeps
+descendants of the finalized checkpoint, so RSS levels off instead of growing with
+every block. Each mode runs in its own process so the RSS figures are independent.
+
+Usage:
+    uv run python scripts/benchmarks/store_pruning.py [--fork phase0] [--slots 4096]
+"""
+
+import argparse
+import importlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.attestations import next_epoch_with_attestations
+from eth_consensus_specs.test.helpers.fork_choice import get_genesis_forkchoice_store
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.utils import bls
+
+
+def rss_mib() -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run(fork: str, slots: int, report_every: int, prune: bool) -> None:
+    bls.bls_active = False
+    spec = importlib.import_module(f"eth_consensus_specs.{fork}.minimal")
+    spec.prune_store_on_finalization = prune
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    store = get_genesis_forkchoice_store(spec, state)
+
+    mode = "prune" if prune else "keep"
+    start = time.perf_counter()
+    next_report = report_every
+    while state.slot < slots:
+        _, signed_blocks, state = next_epoch_with_attestations(
+            spec, state, fill_cur_epoch=True, fill_prev_epoch=False
+        )
+        for signed_block in signed_blocks:
+            block = signed_block.message
+            spec.on_tick(
+                store, store.genesis_time + block.slot * spec.config.SLOT_DURATION_MS // 1000
+            )
+            spec.on_block(store, signed_block)
+            for attestation in block.body.attestations:
+                spec.on_attestation(store, attestation, is_from_block=True)
+        if state.slot >= next_report:
+            next_report += report_every
+            print(
+                f"{mode:>5} {int(state.slot):>7} {len(store.blocks):>8}"
+                f" {int(store.finalized_checkpoint.epoch):>9} {rss_mib():>9.1f}"
+                f" {time.perf_counter() - start:>8.1f}s",
+                flush=True,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="phase0", help="fork to load (default: phase0)")
+    parser.add_argument("--slots", type=int, default=4096, help="chain length (default: 4096)")
+    parser.add_argument(
+        "--report-every", type=int, default=512, help="slots between reports (default: 512)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["both", "keep", "prune"],
+        default="both",
+        help="run without pruning, with pruning, or both (default: both)",
+    )
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        run(args.fork, args.slots, args.report_every, prune=args.mode == "prune")
+        return
+
+    print(f"fork={args.fork} preset=minimal")
+    print(f"{'mode':>5} {'slot':>7} {'blocks':>8} {'finalized':>9} {'rss (MiB)':>9} {'time':>9}")
+    for mode in ["keep", "prune"]:
+        subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], "--mode", mode],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
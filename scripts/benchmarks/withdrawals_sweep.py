@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark get_expected_withdrawals over a full validator sweep.
+
+Builds a mainnet preset state with MAX_VALIDATORS_PER_WITHDRAWALS_SWEEP + 1
+validators, so the sweep visits the maximum number of candidates, and times
+``get_expected_withdrawals`` with the indexed sweep (``use_withdrawals_index``)
+and with the reference list scans. Every ``--spacing``-th validator is
+partially withdrawable, so the withdrawals fill up over the whole sweep, and
+``MAX_PENDING_PARTIALS_PER_WITHDRAWALS_SWEEP`` pending partial withdrawals are
+queued (electra and later).
+
+Usage:
+    uv run python scripts/benchmarks/withdrawals_sweep.py [--fork electra] [--spacing 1024]
+"""
+
+import argparse
+import importlib
+import statistics
+import time
+
+from eth_consensus_specs.test.context import default_activation_threshold, default_balances
+from eth_consensus_specs.test.helpers.forks import is_post_electra
+from eth_consensus_specs.test.helpers.genesis import create_genesis_state
+from eth_consensus_specs.test.helpers.withdrawals import (
+    prepare_pending_withdrawal,
+    set_validator_partially_withdrawable,
+)
+
+
+def time_expected_withdrawals(spec, state, *, indexed: bool, repeat: int) -> float:
+    spec.use_withdrawals_index = indexed
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        spec.get_expected_withdrawals(state)
+        runs.append(time.perf_counter() - start)
+    spec.use_withdrawals_index = True
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--fork", default="electra", help="fork to load (default: electra)")
+    parser.add_argument(
+        "--spacing",
+        type=int,
+        default=1024,
+        help="validators between partially withdrawable ones (default: 1024)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant (default: 3)")
+    args = parser.parse_args()
+
+    spec = importlib.import_module(f"eth_consensus_specs.{args.fork}.mainnet")
+    state = create_genesis_state(spec, default_balances(spec), default_activation_threshold(spec))
+    genesis_count = len(state.validators)
+    while len(state.validators) <= spec.MAX_VALIDATORS_PER_WITHDRAWALS_SWEEP:
+        index = len(state.validators) % genesis_count
+        state.validators.append(state.validators[index].copy())
+        state.balances.append(state.balances[index])
+    for index in range(args.spacing - 1, len(state.validators), args.spacing):
+        set_validator_partially_withdrawable(spec, state, index)
+    if is_post_electra(spec):
+        for index in range(spec.MAX_PENDING_PARTIALS_PER_WITHDRAWALS_SWEEP):
+            prepare_pending_withdrawal(spec, state, index)
+
+    spec.use_withdrawals_index = False
+    reference = spec.get_expected_withdrawals(state)
+    spec.use_withdrawals_index = True
+    assert spec.get_expected_withdrawals(state) == reference
+
+    print(
+        f"fork={args.fork} preset=mainnet validators={len(state.validators)}"
+        f" withdrawals={len(reference.withdrawals)}"
+        f" swept={reference.processed_sweep_withdrawals_count}"
+    )
+    for name, indexed in [("reference", False), ("indexed", True)]:
+        seconds = time_expected_withdrawals(spec, state, indexed=indexed, repeat=args.repeat)
+        print(f"{name:>9} {seconds * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
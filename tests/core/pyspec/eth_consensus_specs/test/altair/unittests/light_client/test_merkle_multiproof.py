@@ -0,0 +1,72 @@
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_light_client,
+)
+from eth_consensus_specs.test.helpers.merkle import (
+    calculate_multi_merkle_root,
+    get_helper_indices,
+    verify_merkle_multiproof,
+)
+
+
+def reference_helper_indices(indices):
+    # ``get_helper_indices`` of ``ssz/merkle-proofs.md``
+    helper_indices = set()
+    path_indices = set()
+    for index in indices:
+        branch = [index ^ 1]
+        while branch[-1] > 1:
+            branch.append((branch[-1] // 2) ^ 1)
+        helper_indices |= set(branch[:-1])
+        path = [index]
+        while path[-1] > 1:
+            path.append(path[-1] // 2)
+        path_indices |= set(path[:-1])
+    return sorted(helper_indices - path_indices, reverse=True)
+
+
+def state_gindices(spec, state):
+    return [
+        spec.get_generalized_index(spec.BeaconState, "current_sync_committee"),
+        spec.get_generalized_index(spec.BeaconState, "next_sync_committee"),
+        spec.get_generalized_index(spec.BeaconState, "finalized_checkpoint", "root"),
+        spec.get_generalized_index(spec.BeaconState, "latest_block_header", "state_root"),
+        spec.get_generalized_index(spec.BeaconState, "fork", "epoch"),
+        spec.get_generalized_index(spec.BeaconState, "balances"),
+    ]
+
+
+@with_light_client
+@spec_state_test
+def test_merkle_proofs_match_single_proofs(spec, state):
+    gindices = state_gindices(spec, state)
+    # Repeated and trivial indices are allowed, as for ``compute_merkle_proof``
+    gindices += [gindices[0], 1]
+    assert spec.compute_merkle_proofs(state, gindices) == [
+        spec.compute_merkle_proof(state, gindex) for gindex in gindices
+    ]
+    assert spec.compute_merkle_proofs(state, []) == []
+
+
+@with_light_client
+@spec_state_test
+def test_merkle_multiproof(spec, state):
+    gindices = state_gindices(spec, state)
+    assert get_helper_indices(gindices) == reference_helper_indices(gindices)
+    proof = spec.compute_merkle_multiproof(state, gindices)
+    leaves = [state.get_backing().getter(gindex).merkle_root() for gindex in gindices]
+    root = state.hash_tree_root()
+    assert verify_merkle_multiproof(leaves, proof, gindices, root)
+    assert not verify_merkle_multiproof(leaves[::-1], proof, gindices, root)
+
+    # A single-item multiproof is the single-item proof
+    gindex = gindices[0]
+    assert spec.compute_merkle_multiproof(state, [gindex]) == spec.compute_merkle_proof(
+        state, gindex
+    )
+    # Leaves can be updated to compute the new root
+    state.current_sync_committee = state.next_sync_committee
+    state.next_sync_committee.aggregate_pubkey = b"\x01" * 48
+    leaves[0] = state.current_sync_committee.hash_tree_root()
+    leaves[1] = state.next_sync_committee.hash_tree_root()
+    assert calculate_multi_merkle_root(leaves, proof, gindices) == state.hash_tree_root()
@@ -0,0 +1,74 @@
+from random import Random
+
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_altair_and_later,
+)
+from eth_consensus_specs.test.helpers.epoch_processing import (
+    run_epoch_process,
+    run_epoch_processing_to,
+)
+from eth_consensus_specs.test.helpers.inactivity_scores import randomize_inactivity_scores
+from eth_consensus_specs.test.helpers.random import randomize_state
+from eth_consensus_specs.test.helpers.rewards import leaking
+from eth_consensus_specs.test.helpers.state import next_epoch
+
+
+def run_columnar_processes(spec, state):
+    run_epoch_processing_to(spec, state, "process_inactivity_updates")
+    run_epoch_process(spec, state, "process_inactivity_updates")
+    run_epoch_process(spec, state, "process_rewards_and_penalties")
+
+
+@with_altair_and_later
+@spec_state_test
+def test_columnar_matches_reference_random(spec, state):
+    next_epoch(spec, state)
+    randomize_state(spec, state, rng=Random(1013))
+    randomize_inactivity_scores(spec, state, rng=Random(1013))
+    # Penalties larger than the balance are floored at zero
+    for index in range(0, len(state.validators), 5):
+        state.balances[index] = index
+    run_columnar_processes(spec, state)
+
+
+@with_altair_and_later
+@spec_state_test
+@leaking()
+def test_columnar_matches_reference_leaking(spec, state):
+    randomize_state(spec, state, rng=Random(1113))
+    randomize_inactivity_scores(spec, state, rng=Random(1113))
+    assert spec.is_in_inactivity_leak(state)
+    run_columnar_processes(spec, state)
+
+
+@with_altair_and_later
+@spec_state_test
+def test_columnar_falls_back_on_overflow(spec, state):
+    next_epoch(spec, state)
+    state.inactivity_scores[0] = spec.UINT64_MAX
+    state.previous_epoch_participation[0] = spec.ParticipationFlags(0)
+    run_epoch_processing_to(spec, state, "process_inactivity_updates")
+    # The reference raises on the overflow of the inactivity score, and so does the columnar path
+    previous = spec.use_columnar_epoch_processing
+    for use_columnar in [True, False]:
+        spec.use_columnar_epoch_processing = use_columnar
+        try:
+            spec.process_inactivity_updates(state.copy())
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected an overflow")
+        finally:
+            spec.use_columnar_epoch_processing = previous
+
+
+@with_altair_and_later
+@spec_state_test
+def test_epoch_columns_are_shared(spec, state):
+    next_epoch(spec, state)
+    before = spec.get_epoch_columns.cache_info()
+    run_epoch_processing_to(spec, state, "process_registry_updates")
+    info = spec.get_epoch_columns.cache_info()
+    assert info.misses == before.misses + 1
+    assert info.hits == before.hits + 1
@@ -0,0 +1,80 @@
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_capella_and_later,
+    with_electra_and_later,
+)
+from eth_consensus_specs.test.helpers.withdrawals import (
+    prepare_pending_withdrawal,
+    set_validator_fully_withdrawable,
+    set_validator_partially_withdrawable,
+)
+
+
+def check_expected_withdrawals(spec, state):
+    """
+    Return ``spec.get_expected_withdrawals(state)``, after checking that the indexed
+    sweep matches the reference list scans (see ``use_withdrawals_index``).
+    """
+    expected = spec.get_expected_withdrawals(state)
+    previous = spec.use_withdrawals_index
+    spec.use_withdrawals_index = False
+    try:
+        reference = spec.get_expected_withdrawals(state)
+    finally:
+        spec.use_withdrawals_index = previous
+    assert expected == reference
+    return expected
+
+
+@with_capella_and_later
+@spec_state_test
+def test_sweep_withdrawals_match_reference(spec, state):
+    for index in range(0, len(state.validators), 3):
+        set_validator_fully_withdrawable(spec, state, index)
+    for index in range(1, len(state.validators), 3):
+        set_validator_partially_withdrawable(spec, state, index)
+
+    expected = check_expected_withdrawals(spec, state)
+    assert len(expected.withdrawals) == spec.MAX_WITHDRAWALS_PER_PAYLOAD
+
+    # The sweep continues from the next validator index
+    state.next_withdrawal_validator_index = len(state.validators) - 2
+    check_expected_withdrawals(spec, state)
+
+
+@with_capella_and_later
+@spec_state_test
+def test_withdrawals_so_far(spec, state):
+    prior = [spec.Withdrawal(index=0, validator_index=1, amount=5)]
+    withdrawals = []
+    withdrawals_so_far = spec.WithdrawalsSoFar(prior, withdrawals)
+    assert withdrawals_so_far.get_withdrawn(1) == 5
+
+    withdrawals.append(spec.Withdrawal(index=1, validator_index=2, amount=7))
+    withdrawals.append(spec.Withdrawal(index=2, validator_index=1, amount=3))
+    assert len(withdrawals_so_far) == 3
+    assert list(withdrawals_so_far) == prior + withdrawals
+    assert withdrawals_so_far[-1] == withdrawals[-1]
+    assert withdrawals_so_far.get_withdrawn(1) == 8
+    assert withdrawals_so_far.get_withdrawn(2) == 7
+    assert spec.get_balance_after_withdrawals(
+        state, 1, withdrawals_so_far
+    ) == spec.get_balance_after_withdrawals(state, 1, prior + withdrawals)
+
+
+@with_electra_and_later
+@spec_state_test
+def test_pending_balance_to_withdraw_matches_reference(spec, state):
+    for index in [0, 1, 1, 4, 4, 4]:
+        prepare_pending_withdrawal(spec, state, index, amount=1_000_000_000 + index)
+    check_expected_withdrawals(spec, state)
+
+    for index in range(6):
+        assert spec.get_pending_balance_to_withdraw(
+            state, index
+        ) == spec._get_pending_balance_to_withdraw(state, index)
+    assert spec.get_pending_balance_to_withdraw(state, 4) == 3 * 1_000_000_004
+
+    # Appending a pending withdrawal changes the key of the index
+    prepare_pending_withdrawal(spec, state, 2)
+    assert spec.get_pending_balance_to_withdraw(state, 2) == 1_000_000_000
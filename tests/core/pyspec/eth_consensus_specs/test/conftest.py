@@ -3,8 +3,13 @@ import sys
 import pytest
 
 from eth_consensus_specs.test import context
+from eth_consensus_specs.test.helpers import block
 from eth_consensus_specs.test.helpers.constants import ALL_PHASES, ALLOWED_TEST_RUNNER_FORKS
 from eth_consensus_specs.utils.kzg import load_trusted_setup
+from eth_consensus_specs.utils.ssz.ssz_impl import (
+    MERKLEIZATION_BACKENDS,
+    set_merkleization_backend,
+)
 
 
 def pytest_addoption(parser):
@@ -30,6 +35,41 @@ def pytest_addoption(parser):
         default=False,
         help="coverage: enable code coverage tracking",
     )
+    parser.addoption(
+        "--cache-stats",
+        action="store_true",
+        default=False,
+        help="cache-stats: report the hits, misses and sizes of the pyspec caches at the end",
+    )
+    parser.addoption(
+        "--kzg-precompute",
+        action="store",
+        type=int,
+        default=0,
+        help=(
+            "kzg-precompute: precompute level (0 to 15) of the KZG trusted setup."
+            " Higher values use more memory for faster cell proofs, e.g. --kzg-precompute=8"
+        ),
+    )
+    parser.addoption(
+        "--merkleization",
+        action="store",
+        choices=sorted(MERKLEIZATION_BACKENDS),
+        default="recursive",
+        help=(
+            "merkleization: the backend of hash_tree_root, recursive (one pair at a time)"
+            " or levels (one tree level at a time), e.g. --merkleization=levels"
+        ),
+    )
+    parser.addoption(
+        "--bls-batch",
+        action="store_true",
+        default=False,
+        help=(
+            "bls-batch: process the blocks of the block and fork choice helpers within a"
+            " batch verification, checking their signatures with one multi-pairing"
+        ),
+    )
 
 
 def _validate_fork_name(forks):
@@ -88,8 +128,74 @@ def run_phases(request):
 
 
 @pytest.fixture(scope="session", autouse=True)
-def trusted_setup():
-    load_trusted_setup()
+def trusted_setup(request):
+    load_trusted_setup(request.config.getoption("--kzg-precompute"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def merkleization(request):
+    set_merkleization_backend(request.config.getoption("--merkleization"))
+
+
+@pytest.fixture(autouse=True)
+def bls_batch(request):
+    if not request.config.getoption("--bls-batch"):
+        yield
+        return
+    with block.batched_block_verification():
+        yield
+
+
+# Cache statistics by "<fork>.<preset>.<function>", merged over the xdist workers
+_cache_stats: dict[str, dict[str, float]] = {}
+
+
+def _merge_cache_stats(stats):
+    for name, info in stats.items():
+        merged = _cache_stats.setdefault(name, dict.fromkeys(info, 0))
+        for field, value in info.items():
+            if field in ("maxsize", "currsize", "entry_bytes"):
+                merged[field] = max(merged[field], value)
+            else:
+                merged[field] += value
+
+
+def pytest_sessionfinish(session):
+    if not session.config.getoption("--cache-stats"):
+        return
+    stats = {}
+    for module_name, module in list(sys.modules.items()):
+        # The specs can be imported under two paths, see the ``preset`` fixture
+        if module_name.startswith("eth_consensus_specs.") and hasattr(module, "cache_stats"):
+            prefix = module_name.removeprefix("eth_consensus_specs.")
+            for name, info in module.cache_stats().items():
+                stats[f"{prefix}.{name}"] = info._asdict()
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["cache_stats"] = stats
+    else:
+        _merge_cache_stats(stats)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    _merge_cache_stats(getattr(node, "workeroutput", {}).get("cache_stats", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("--cache-stats") or not _cache_stats:
+        return
+    terminalreporter.write_sep("=", "pyspec cache stats")
+    terminalreporter.write_line(
+        f"{'cache':<56} {'hits':>9} {'misses':>8} {'evicted':>8} {'size':>11}"
+        f" {'saved':>9} {'bytes':>11}"
+    )
+    for name, info in sorted(_cache_stats.items()):
+        if info["hits"] or info["misses"]:
+            terminalreporter.write_line(
+                f"{name:<56} {info['hits']:>9} {info['misses']:>8} {info['evictions']:>8}"
+                f" {info['currsize']:>5}/{info['maxsize']:<5} {info['time_saved']:>8.2f}s"
+                f" {info['entry_bytes']:>11}"
+            )
 
 
 pytest_plugins = ["eth_consensus_specs.test.pytest_plugins.yield_generator"]
@@ -34,6 +34,7 @@ def test_compute_matrix(spec):
     input_blobs = [get_sample_blob(spec, rng=rng) for _ in range(blob_count)]
     matrix = spec.compute_matrix(input_blobs)
     assert len(matrix) == spec.CELLS_PER_EXT_BLOB * blob_count
+    assert matrix == spec._compute_matrix(input_blobs)
 
     rows = chunks(matrix, spec.CELLS_PER_EXT_BLOB)
     assert len(rows) == blob_count
@@ -47,6 +48,23 @@ def test_compute_matrix(spec):
         assert blob == input_blobs[blob_index]
 
 
+@with_fulu_and_later
+@spec_test
+@single_phase
+def test_compute_packed_matrix(spec):
+    rng = random.Random(5566)
+
+    blobs = [get_sample_blob(spec, rng=rng) for _ in range(2)]
+    packed_matrix = spec.compute_packed_matrix(blobs)
+    assert packed_matrix.row_count == len(blobs)
+    assert packed_matrix.rows() == [
+        tuple(map(list, kzg.compute_cells_and_kzg_proofs(blob))) for blob in blobs
+    ]
+    for entry in spec.compute_matrix(blobs):
+        assert packed_matrix.cell(entry.row_index, entry.column_index) == entry.cell
+        assert packed_matrix.proof(entry.row_index, entry.column_index) == entry.kzg_proof
+
+
 @with_fulu_and_later
 @spec_test
 @single_phase
@@ -74,6 +92,35 @@ def test_recover_matrix(spec):
     assert recovered_matrix == matrix
 
 
+@with_fulu_and_later
+@spec_test
+@single_phase
+def test_recover_matrix_matches_reference(spec):
+    rng = random.Random(1234)
+
+    blob_count = 3
+    blobs = [get_sample_blob(spec, rng=rng) for _ in range(blob_count)]
+    matrix = spec.compute_matrix(blobs)
+
+    # Rows with different columns, and a row past ``blob_count`` that is ignored. The rows
+    # are interleaved, the columns of each row stay in increasing order.
+    partial_matrix = []
+    for blob_entries in chunks(matrix, spec.CELLS_PER_EXT_BLOB):
+        indices = rng.sample(range(len(blob_entries)), spec.CELLS_PER_EXT_BLOB // 2)
+        partial_matrix.extend([blob_entries[i] for i in indices])
+    partial_matrix.sort(key=lambda entry: entry.column_index)
+
+    expected = spec._recover_matrix(partial_matrix, blob_count - 1)
+    assert expected == matrix[: spec.CELLS_PER_EXT_BLOB * (blob_count - 1)]
+    try:
+        for threads in [1, 2, 4]:
+            kzg.matrix_threads = threads
+            assert spec.recover_matrix(partial_matrix, blob_count - 1) == expected
+    finally:
+        kzg.matrix_threads = 1
+    assert spec.recover_matrix([], 0) == []
+
+
 def run_is_data_available_peerdas_test(spec, blob_data):
     def callback():
         yield spec.is_data_available(spec.Root(b"\x00" * 32))
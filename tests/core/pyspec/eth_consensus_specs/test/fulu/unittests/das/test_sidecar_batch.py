@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_fulu_and_later,
+)
+from eth_consensus_specs.test.helpers.blob import get_block_with_blob_and_sidecars
+from eth_consensus_specs.test.helpers.das import DataColumnSidecarBatch, get_sidecar_slot
+from eth_consensus_specs.test.helpers.forks import is_post_gloas
+
+
+def verify_sidecar_kzg_proofs(spec, sidecar, kzg_commitments):
+    try:
+        if is_post_gloas(spec):
+            return spec.verify_data_column_sidecar_kzg_proofs(sidecar, kzg_commitments)
+        return spec.verify_data_column_sidecar_kzg_proofs(sidecar)
+    except AssertionError:
+        return False
+
+
+def build_batch(spec, sidecars, kzg_commitments):
+    batch = DataColumnSidecarBatch(spec, get_sidecar_slot(spec, sidecars[0]))
+    for sidecar in sidecars:
+        batch.add(sidecar, kzg_commitments if is_post_gloas(spec) else None)
+    return batch
+
+
+@with_fulu_and_later
+@spec_state_test
+def test_sidecar_batch_valid(spec, state):
+    rng = random.Random(1234)
+    *_, sidecars, kzg_commitments = get_block_with_blob_and_sidecars(
+        spec, state, rng=rng, blob_count=2
+    )
+    batch = build_batch(spec, sidecars, kzg_commitments)
+    assert batch.verify() == [True] * len(sidecars)
+    assert batch.batch_count == 1
+    assert DataColumnSidecarBatch(spec, state.slot).verify() == []
+
+    sidecar = sidecars[0].copy()
+    if is_post_gloas(spec):
+        sidecar.slot += 1
+    else:
+        sidecar.signed_block_header.message.slot += 1
+    with pytest.raises(AssertionError):
+        batch.add(sidecar, kzg_commitments)
+
+
+@with_fulu_and_later
+@spec_state_test
+def test_sidecar_batch_finds_invalid_sidecars(spec, state):
+    rng = random.Random(1234)
+    *_, sidecars, kzg_commitments = get_block_with_blob_and_sidecars(
+        spec, state, rng=rng, blob_count=2
+    )
+    sidecars = [sidecar.copy() for sidecar in sidecars]
+    # Swapped proofs, a cell of the other blob and a missing proof
+    sidecars[3].kzg_proofs = list(reversed(sidecars[3].kzg_proofs))
+    sidecars[10].column[0] = sidecars[10].column[1]
+    sidecars[11].kzg_proofs = sidecars[11].kzg_proofs[:1]
+
+    batch = build_batch(spec, sidecars, kzg_commitments)
+    valid = batch.verify()
+    assert valid == [
+        verify_sidecar_kzg_proofs(spec, sidecar, kzg_commitments) for sidecar in sidecars
+    ]
+    assert [i for i, sidecar_valid in enumerate(valid) if not sidecar_valid] == [3, 10, 11]
+    assert batch.batch_count < len(sidecars)
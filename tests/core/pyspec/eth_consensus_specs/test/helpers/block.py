@@ -1,3 +1,6 @@
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
 from eth_consensus_specs.test.helpers.execution_payload import (
     build_empty_execution_payload,
     build_empty_signed_execution_payload_bid,
@@ -14,6 +17,31 @@ from eth_consensus_specs.utils import bls
 from eth_consensus_specs.utils.bls import only_with_bls
 from eth_consensus_specs.utils.ssz.ssz_impl import hash_tree_root
 
+# Whether the block helpers process blocks within a ``bls.batch_verification``, as clients
+# do, see ``batched_block_verification``
+_batched = ContextVar("_batched", default=False)
+
+
+@contextmanager
+def batched_block_verification():
+    """
+    Let the block helpers process the blocks of the context within a ``bls.batch_verification``,
+    as the ``--bls-batch`` option of the test runner does for each test.
+    """
+    token = _batched.set(True)
+    try:
+        yield
+    finally:
+        _batched.reset(token)
+
+
+def block_verification():
+    """
+    Return the context to process a block in: a ``bls.batch_verification`` within a
+    ``batched_block_verification``, otherwise one that checks each signature right away.
+    """
+    return bls.batch_verification() if _batched.get() else nullcontext()
+
 
 def get_proposer_index_maybe(spec, state, slot, proposer_index=None):
     if proposer_index is None:
@@ -71,7 +99,8 @@ def transition_unsigned_block(spec, state, block):
         state.latest_block_header.slot < block.slot
     )  # There may not already be a block in this slot or past it.
     assert state.slot == block.slot  # The block must be for this slot
-    spec.process_block(state, block)
+    with block_verification():
+        spec.process_block(state, block)
     return block
 
 
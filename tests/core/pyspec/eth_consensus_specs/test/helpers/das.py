@@ -0,0 +1,65 @@
+from eth_consensus_specs.test.helpers.forks import is_post_gloas
+from eth_consensus_specs.utils import kzg
+
+
+def get_sidecar_slot(spec, sidecar):
+    if is_post_gloas(spec):
+        return sidecar.slot
+    return sidecar.signed_block_header.message.slot
+
+
+class DataColumnSidecarBatch:
+    """
+    Accumulate the data column sidecars of a slot, and verify the KZG proofs of all of them
+    in one ``kzg.verify_cell_kzg_proof_columns`` batch. If the batch fails, it is bisected
+    to find the sidecars that ``verify_data_column_sidecar_kzg_proofs`` would reject.
+    """
+
+    def __init__(self, spec, slot):
+        self.spec = spec
+        self.slot = slot
+        self.sidecars = []
+        self.columns = []
+        # The number of batches verified, including those of the bisection
+        self.batch_count = 0
+
+    def add(self, sidecar, kzg_commitments=None):
+        """
+        Add ``sidecar`` to the batch. Since gloas, the commitments are not in the sidecar,
+        ``kzg_commitments`` are those of the block, as in ``verify_data_column_sidecar``.
+        """
+        assert get_sidecar_slot(self.spec, sidecar) == self.slot
+        if kzg_commitments is None:
+            kzg_commitments = sidecar.kzg_commitments
+        self.sidecars.append(sidecar)
+        self.columns.append((kzg_commitments, sidecar.index, sidecar.column, sidecar.kzg_proofs))
+
+    def verify(self):
+        """
+        Return whether the KZG proofs of each sidecar are valid, in the order they were added.
+        Malformed sidecars, e.g. with fewer proofs than cells, are invalid.
+        """
+        valid = [True] * len(self.columns)
+        if len(self.columns) > 0 and not self._verify_batch(0, len(self.columns)):
+            self._find_invalid(0, len(self.columns), valid)
+        return valid
+
+    def _verify_batch(self, start, end):
+        self.batch_count += 1
+        try:
+            return kzg.verify_cell_kzg_proof_columns(self.columns[start:end])
+        except AssertionError:
+            return False
+
+    def _find_invalid(self, start, end, valid):
+        # The batch of the sidecars from ``start`` to ``end`` is known to be invalid
+        if end - start == 1:
+            valid[start] = False
+            return
+        middle = (start + end) // 2
+        left_valid = self._verify_batch(start, middle)
+        if not left_valid:
+            self._find_invalid(start, middle, valid)
+        # With a valid left half, the right half is known to be invalid
+        if left_valid or not self._verify_batch(middle, end):
+            self._find_invalid(middle, end, valid)
@@ -86,6 +86,37 @@ def run_epoch_processing_from(spec, state, process_name: str):
             getattr(spec, name)(state)
 
 
+# The sub-transitions with an optimized implementation, and the spec flag that switches them
+# back to the reference implementation
+OPTIMIZED_PROCESS_FLAGS = {
+    "process_inactivity_updates": "use_columnar_epoch_processing",
+    "process_rewards_and_penalties": "use_columnar_epoch_processing",
+    "process_slashings": "use_bulk_registry_updates",
+    "process_effective_balance_updates": "use_bulk_registry_updates",
+}
+
+
+def run_epoch_process(spec, state, process_name: str):
+    """
+    Runs the sub-transition named ``process_name``. The optimized implementations are checked
+    against the reference implementations, which can be much slower, so the vector tests do
+    not call this.
+    """
+    flag = OPTIMIZED_PROCESS_FLAGS.get(process_name)
+    if flag is not None and getattr(spec, flag, False):
+        expected = state.copy()
+        previous = getattr(spec, flag)
+        setattr(spec, flag, False)
+        try:
+            getattr(spec, process_name)(expected)
+        finally:
+            setattr(spec, flag, previous)
+        getattr(spec, process_name)(state)
+        assert state.hash_tree_root() == expected.hash_tree_root()
+    else:
+        getattr(spec, process_name)(state)
+
+
 def run_epoch_processing_with(spec, state, process_name: str):
     """
     Processes to the next epoch transition, up to and including the sub-transition named ``process_name``
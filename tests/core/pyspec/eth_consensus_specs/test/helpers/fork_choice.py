@@ -1,9 +1,9 @@
-from collections.abc import Sequence
-from typing import Any, NamedTuple
+from __future__ import annotations
+
+from typing import Any, NamedTuple, TYPE_CHECKING
 
 from eth_utils import encode_hex
 
-from eth_consensus_specs.fulu.mainnet import DataColumnSidecar
 from eth_consensus_specs.test.context import expect_assertion_error
 from eth_consensus_specs.test.exceptions import BlockNotFoundException
 from eth_consensus_specs.test.helpers.attestations import (
@@ -11,10 +11,18 @@ from eth_consensus_specs.test.helpers.attestations import (
     next_slots_with_attestations,
     state_transition_with_full_block,
 )
-from eth_consensus_specs.test.helpers.block import build_empty_block_for_next_slot
+from eth_consensus_specs.test.helpers.block import (
+    block_verification,
+    build_empty_block_for_next_slot,
+)
 from eth_consensus_specs.test.helpers.forks import is_post_fulu, is_post_gloas
 from eth_consensus_specs.test.helpers.state import next_epoch, state_transition_and_sign_block
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from eth_consensus_specs.fulu.mainnet import DataColumnSidecar
+
 
 def check_head_against_root(spec, store, root):
     assert spec.get_head(store).root == root
@@ -314,11 +322,15 @@ def on_tick_and_append_step(spec, store, time, test_steps):
 
 
 def run_on_block(spec, store, signed_block, valid=True):
+    def on_block():
+        with block_verification():
+            spec.on_block(store, signed_block)
+
     if not valid:
-        expect_assertion_error(lambda: spec.on_block(store, signed_block))
+        expect_assertion_error(on_block)
         return
 
-    spec.on_block(store, signed_block)
+    on_block()
     root = signed_block.message.hash_tree_root()
     assert store.blocks[root] == signed_block.message
 
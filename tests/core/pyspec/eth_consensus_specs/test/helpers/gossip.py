@@ -1,4 +1,5 @@
 import inspect
+from collections.abc import MutableMapping, MutableSet
 from typing import get_origin, get_type_hints
 
 from eth_utils import encode_hex
@@ -11,6 +12,7 @@ from eth_consensus_specs.test.helpers.block import (
 from eth_consensus_specs.test.helpers.fork_choice import (
     get_genesis_forkchoice_store_and_block,
 )
+from eth_consensus_specs.test.helpers.forks import is_post_deneb
 from eth_consensus_specs.test.helpers.state import state_transition_and_sign_block
 
 PAYLOAD_STATUS_VALID = "VALID"
@@ -204,11 +206,292 @@ def run_validate_gossip(spec, **kwargs):
         return "reject", str(e)
 
 
-def get_seen(spec):
-    """Create an empty Seen object by instantiating each annotated field's container type."""
+def get_seen(spec, bounded=True):
+    """
+    Create an empty Seen object by instantiating each annotated field's container type. If
+    ``bounded``, the fields of the propagation window keep its epochs only, see
+    ``get_bounded_seen``.
+    """
+    if bounded:
+        return get_bounded_seen(spec)
     return spec.Seen(**{name: get_origin(t)() for name, t in get_type_hints(spec.Seen).items()})
 
 
+class SeenWindow:
+    """
+    The epochs kept by the containers of a bounded ``Seen``: the latest epoch of their
+    entries, and the ``retained_epochs - 1`` epochs before it. The entries of older epochs
+    are dropped once a newer epoch is added.
+    """
+
+    def __init__(self, retained_epochs):
+        assert retained_epochs >= 1
+        self.retained_epochs = retained_epochs
+        self.epoch = 0
+        self.oldest_epoch = 0
+
+    def advance(self, epoch):
+        if epoch > self.epoch:
+            self.epoch = int(epoch)
+            self.oldest_epoch = max(self.epoch - self.retained_epochs + 1, 0)
+
+
+class EpochBuckets:
+    """
+    The entries of a bounded ``Seen`` container, in one bucket per epoch of the message that
+    added them. ``epoch_of`` returns the epoch of a key, or is ``None`` for keys without one.
+    Those are pending until the next key is added, or the window drops an epoch: they then
+    take the latest epoch of the window, which the other keys of their message have reached
+    by then, whatever the order in which the message adds them.
+    """
+
+    def __init__(self, window, epoch_of=None):
+        self.window = window
+        self.epoch_of = epoch_of
+        self.buckets = {}
+        self.oldest_epoch = 0
+        # The keys without an epoch added since the last ones were given one
+        self.pending = None
+        # The epochs of the keys without one, by key
+        self.key_epochs = {}
+
+    def _resolve_pending(self):
+        if not self.pending:
+            self.pending = None
+            return
+        epoch = self.window.epoch
+        if epoch not in self.buckets:
+            self.buckets[epoch] = type(self.pending)()
+        self.buckets[epoch].update(self.pending)
+        for key in self.pending:
+            self.key_epochs[key] = epoch
+        self.pending = None
+
+    def _expire(self):
+        self._resolve_pending()
+        self.oldest_epoch = self.window.oldest_epoch
+        for epoch in [epoch for epoch in self.buckets if epoch < self.oldest_epoch]:
+            for key in self.buckets.pop(epoch):
+                self.key_epochs.pop(key, None)
+
+    def _key_epoch(self, key):
+        if self.epoch_of is not None:
+            return self.epoch_of(key)
+        return self.key_epochs.get(key)
+
+    def _find_bucket(self, key):
+        """
+        Return the bucket that holds ``key``, or ``None``.
+        """
+        if self.window.oldest_epoch != self.oldest_epoch:
+            self._expire()
+        if self.pending is not None and key in self.pending:
+            return self.pending
+        bucket = self.buckets.get(self._key_epoch(key))
+        return bucket if bucket is not None and key in bucket else None
+
+    def _add_bucket(self, key, new_bucket):
+        """
+        Return the bucket to add ``key`` to. Raise if its epoch is already dropped: a bounded
+        ``Seen`` that keeps the epochs of the propagation window never drops a valid message.
+        """
+        if self.epoch_of is None:
+            self._resolve_pending()
+            self.pending = new_bucket()
+            return self.pending
+        epoch = int(self.epoch_of(key))
+        self.window.advance(epoch)
+        if self.window.oldest_epoch != self.oldest_epoch:
+            self._expire()
+        if epoch < self.oldest_epoch:
+            raise ValueError(
+                f"cannot add {key!r}: epoch {epoch} is older than the"
+                f" {self.window.retained_epochs} epochs kept"
+            )
+        if epoch not in self.buckets:
+            self.buckets[epoch] = new_bucket()
+        return self.buckets[epoch]
+
+    def _remove(self, bucket, key):
+        if isinstance(bucket, set):
+            bucket.remove(key)
+        else:
+            del bucket[key]
+        self.key_epochs.pop(key, None)
+
+    def __len__(self):
+        self._expire()
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def __iter__(self):
+        self._expire()
+        for bucket in list(self.buckets.values()):
+            yield from bucket
+
+
+class BoundedSeenSet(EpochBuckets, MutableSet):
+    def __contains__(self, item):
+        return self._find_bucket(item) is not None
+
+    def add(self, item):
+        self._add_bucket(item, set).add(item)
+
+    def discard(self, item):
+        bucket = self._find_bucket(item)
+        if bucket is not None:
+            self._remove(bucket, item)
+
+
+BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class AggregationBitsIndex:
+    """
+    The aggregation bits seen for one key, as integers. Only the maximal bits are kept: any
+    bits added are a subset of one of them, so ``is_non_strict_superset`` has the same result
+    over fewer bits. Iterating builds their tuples.
+    """
+
+    def __init__(self, bits_set=()):
+        self.length = None
+        self.maximal = set()
+        for bits in bits_set:
+            self.add(bits)
+
+    def _to_int(self, bits):
+        if self.length is None:
+            self.length = len(bits)
+        elif len(bits) != self.length:
+            raise ValueError("aggregation bits lengths do not match")
+        # One digit byte per bit, most significant first
+        return int(bytes(reversed(bits)).translate(BIT_DIGITS) or b"0", 2)
+
+    def has_superset(self, bits):
+        if len(self.maximal) == 0:
+            return False
+        value = self._to_int(bits)
+        return any(prior & value == value for prior in self.maximal)
+
+    def add(self, bits):
+        value = self._to_int(bits)
+        if any(prior & value == value for prior in self.maximal):
+            return
+        self.maximal = {prior for prior in self.maximal if prior & value != prior}
+        self.maximal.add(value)
+
+    def __len__(self):
+        return len(self.maximal)
+
+    def __iter__(self):
+        for value in self.maximal:
+            yield tuple(bool(value >> i & 1) for i in range(self.length))
+
+
+def use_aggregation_bits_index(spec):
+    """
+    Make ``spec.is_non_strict_superset`` compare the bits of an ``AggregationBitsIndex`` as
+    integers, and other sets with the reference.
+    """
+    if hasattr(spec.is_non_strict_superset, "reference"):
+        return
+    reference = spec.is_non_strict_superset
+
+    def is_non_strict_superset(seen_bits_set, new_bits):
+        if isinstance(seen_bits_set, AggregationBitsIndex):
+            return seen_bits_set.has_superset(new_bits)
+        return reference(seen_bits_set, new_bits)
+
+    is_non_strict_superset.reference = reference
+    spec.is_non_strict_superset = is_non_strict_superset
+
+
+class BoundedSeenBits(EpochBuckets, MutableMapping):
+    """
+    The aggregation bits seen by key. The sets of bits assigned to a key are kept as an
+    ``AggregationBitsIndex``.
+    """
+
+    def __contains__(self, key):
+        return self._find_bucket(key) is not None
+
+    def __getitem__(self, key):
+        bucket = self._find_bucket(key)
+        if bucket is None:
+            raise KeyError(key)
+        return bucket[key]
+
+    def __setitem__(self, key, bits_set):
+        if not isinstance(bits_set, AggregationBitsIndex):
+            bits_set = AggregationBitsIndex(list(bits_set))
+        bucket = self._find_bucket(key)
+        if bucket is None:
+            bucket = self._add_bucket(key, dict)
+        bucket[key] = bits_set
+
+    def __delitem__(self, key):
+        bucket = self._find_bucket(key)
+        if bucket is None:
+            raise KeyError(key)
+        self._remove(bucket, key)
+
+
+def get_bounded_seen_key_epochs(spec):
+    """
+    The ``Seen`` fields only checked for entries within a propagation window, in any fork,
+    with the epoch of their keys. Aggregate data roots have none.
+    """
+    return {
+        "aggregator_epochs": lambda key: key[0],
+        "aggregate_data_roots": None,
+        "attestation_validator_epochs": lambda key: key[0],
+        "sync_contribution_aggregator_slots": lambda key: spec.compute_epoch_at_slot(key[0]),
+        "sync_contribution_data": lambda key: spec.compute_epoch_at_slot(key[0]),
+        "sync_message_validator_slots": lambda key: spec.compute_epoch_at_slot(key[0]),
+        "payload_attestation_validators": lambda key: spec.compute_epoch_at_slot(key[0]),
+    }
+
+
+def get_propagation_window_epochs(spec):
+    """
+    Return the number of epochs a message can be validated in: from the oldest epoch of the
+    propagation range of attestations, to the next epoch within the clock disparity.
+    """
+    if is_post_deneb(spec):
+        # The current and previous epochs
+        return 3
+    range_slots = int(spec.config.ATTESTATION_PROPAGATION_SLOT_RANGE)
+    return -(-range_slots // int(spec.SLOTS_PER_EPOCH)) + 2
+
+
+def get_bounded_seen(spec, retained_epochs=None):
+    """
+    Create an empty Seen object whose propagation-window fields keep the entries of the
+    latest ``retained_epochs`` epochs only, by default those of the propagation window. The
+    superset checks of the spec compare the aggregation bits of its fields as integers.
+
+    Blocks and sidecars are validated back to the finalized slot, so their fields are not
+    bounded.
+    """
+    window_epochs = get_propagation_window_epochs(spec)
+    if retained_epochs is None:
+        retained_epochs = window_epochs
+    if retained_epochs < window_epochs:
+        raise ValueError(
+            f"retained_epochs {retained_epochs} is below the {window_epochs} epochs"
+            " of the propagation window"
+        )
+    use_aggregation_bits_index(spec)
+    seen = get_seen(spec, bounded=False)
+    window = SeenWindow(retained_epochs)
+    for name, epoch_of in get_bounded_seen_key_epochs(spec).items():
+        values = getattr(seen, name, None)
+        if values is None:
+            continue
+        container = BoundedSeenBits if isinstance(values, dict) else BoundedSeenSet
+        setattr(seen, name, container(window, epoch_of=epoch_of))
+    return seen
+
+
 def make_progressive_list(spec, element_type, count):
     """A progressive list of ``count`` default ``element_type`` values."""
     return spec.ProgressiveList[element_type](*([element_type()] * count))
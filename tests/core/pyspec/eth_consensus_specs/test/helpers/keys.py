@@ -1,13 +1,94 @@
+from collections.abc import Iterator, Mapping, Sequence
+from hashlib import sha256
+
 from eth_consensus_specs.utils import bls
+from eth_consensus_specs.utils.file_cache import load_cached
+
+PUBKEY_SIZE = 48
+
+
+class PubkeyTable(Sequence[bytes]):
+    """
+    The pubkeys of ``privkeys``, in the same order. They are computed once and kept in a
+    memory-mapped cache file with fixed 48-byte records, which is only opened on first access.
+    """
+
+    def __init__(self, privkeys: Sequence[int]) -> None:
+        self.privkeys = privkeys
+        self._records: memoryview | None = None
+        self._index: dict[bytes, int] | None = None
+
+    @property
+    def records(self) -> memoryview:
+        if self._records is None:
+            encoded = b"".join(privkey.to_bytes(32, "little") for privkey in self.privkeys)
+            name = f"pubkeys-{sha256(encoded).hexdigest()[:16]}.bin"
+            records = load_cached(name, self._build)
+            # Guards against a table that was written by another BLS backend
+            if len(records) != PUBKEY_SIZE * len(self.privkeys) or bytes(
+                records[:PUBKEY_SIZE]
+            ) != bls.SkToPk(self.privkeys[0]):
+                records = memoryview(self._build())
+            self._records = records
+        return self._records
+
+    def _build(self) -> bytes:
+        return b"".join(bls.SkToPk(privkey) for privkey in self.privkeys)
+
+    def __len__(self) -> int:
+        return len(self.privkeys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pubkey index out of range")
+        return bytes(self.records[PUBKEY_SIZE * index : PUBKEY_SIZE * (index + 1)])
+
+    def _pubkey_index(self) -> dict[bytes, int]:
+        if self._index is None:
+            self._index = {pubkey: i for i, pubkey in enumerate(self)}
+        return self._index
+
+    def index(self, pubkey, start=0, stop=None) -> int:
+        i = self._pubkey_index().get(bytes(pubkey))
+        if i is None or i < start or (stop is not None and i >= stop):
+            raise ValueError(f"{pubkey!r} is not in the pubkey table")
+        return i
+
+    def __contains__(self, pubkey) -> bool:
+        return bytes(pubkey) in self._pubkey_index()
+
+
+class PubkeyToPrivkey(Mapping[bytes, int]):
+    """
+    The inverse of a ``PubkeyTable``, built on first lookup.
+    """
+
+    def __init__(self, pubkeys: PubkeyTable) -> None:
+        self.pubkeys = pubkeys
+
+    def __getitem__(self, pubkey) -> int:
+        try:
+            return self.pubkeys.privkeys[self.pubkeys.index(pubkey)]
+        except ValueError:
+            raise KeyError(pubkey) from None
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.pubkeys)
+
+    def __len__(self) -> int:
+        return len(self.pubkeys)
+
 
 # Enough keys for 256 builders
 builder_privkeys = [2**15 + i + 1 for i in range(256)]
-builder_pubkeys = [bls.SkToPk(privkey) for privkey in builder_privkeys]
-builder_pubkey_to_privkey = {
-    pubkey: privkey for privkey, pubkey in zip(builder_privkeys, builder_pubkeys, strict=False)
-}
+builder_pubkeys = PubkeyTable(builder_privkeys)
+builder_pubkey_to_privkey = PubkeyToPrivkey(builder_pubkeys)
 
 # Enough keys for 256 validators per slot in worst-case epoch length
 privkeys = [i + 1 for i in range(32 * 256 + 1)]
-pubkeys = [bls.SkToPk(privkey) for privkey in privkeys]
-pubkey_to_privkey = {pubkey: privkey for privkey, pubkey in zip(privkeys, pubkeys, strict=False)}
+pubkeys = PubkeyTable(privkeys)
+pubkey_to_privkey = PubkeyToPrivkey(pubkeys)
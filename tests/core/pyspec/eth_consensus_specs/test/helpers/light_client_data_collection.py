@@ -263,23 +263,31 @@ def _cache_lc_data(
     # Cache data for a given block and its post-state to speed up creating future
     # `LightClientUpdate` and `LightClientBootstrap` instances that refer to this
     # block and state.
+    current_sync_committee_branch, next_sync_committee_branch, finality_branch = (
+        spec.compute_merkle_proofs(
+            state,
+            [
+                spec.current_sync_committee_gindex_at_slot(state.slot),
+                spec.next_sync_committee_gindex_at_slot(state.slot),
+                spec.finalized_root_gindex_at_slot(state.slot),
+            ],
+        )
+    )
     cached_data = CachedLightClientData(
         current_sync_committee_branch=latest_normalize_merkle_branch(
             lc_data_store.spec,
-            spec.compute_merkle_proof(
-                state, spec.current_sync_committee_gindex_at_slot(state.slot)
-            ),
+            current_sync_committee_branch,
             latest_current_sync_committee_gindex(lc_data_store.spec),
         ),
         next_sync_committee_branch=latest_normalize_merkle_branch(
             lc_data_store.spec,
-            spec.compute_merkle_proof(state, spec.next_sync_committee_gindex_at_slot(state.slot)),
+            next_sync_committee_branch,
             latest_next_sync_committee_gindex(lc_data_store.spec),
         ),
         finalized_slot=spec.compute_start_slot_at_epoch(state.finalized_checkpoint.epoch),
         finality_branch=latest_normalize_merkle_branch(
             lc_data_store.spec,
-            spec.compute_merkle_proof(state, spec.finalized_root_gindex_at_slot(state.slot)),
+            finality_branch,
             latest_finalized_root_gindex(lc_data_store.spec),
         ),
         current_period_best_update=current_period_best_update,
@@ -1,5 +1,9 @@
+import heapq
+
 from remerkleable.tree import gindex_bit_iter
 
+from eth_consensus_specs.utils.hash_function import hash
+
 
 def build_proof(anchor, leaf_index):
     if leaf_index <= 1:
@@ -19,3 +23,88 @@ def build_proof(anchor, leaf_index):
             node = node.get_left()
 
     return list(reversed(proof))
+
+
+def get_path_nodes(anchor, indices):
+    """
+    Return the nodes on the paths from ``anchor`` to ``indices``, and their siblings, by
+    generalized index. The part of a path shared with an earlier index is not walked again.
+    """
+    nodes = {1: anchor}
+    for index in indices:
+        # Walk down, top to bottom to the leaf, keeping both children of each node
+        for shift in reversed(range(index.bit_length() - 1)):
+            gindex = index >> shift
+            if gindex not in nodes:
+                node = nodes[gindex >> 1]
+                nodes[gindex & ~1] = node.get_left()
+                nodes[gindex | 1] = node.get_right()
+    return nodes
+
+
+def build_proofs(anchor, leaf_indices):
+    """
+    Return the ``build_proof`` branch of each of ``leaf_indices``, from one walk down the
+    tree.
+    """
+    nodes = get_path_nodes(anchor, leaf_indices)
+    # Bottom to top, as ``build_proof``; nothing to prove for indices <= 1
+    return [
+        [
+            nodes[(leaf_index >> shift) ^ 1].merkle_root()
+            for shift in range(leaf_index.bit_length() - 1)
+        ]
+        for leaf_index in leaf_indices
+    ]
+
+
+def get_helper_indices(indices):
+    """
+    Return the generalized indices of the nodes a multiproof of ``indices`` needs, in
+    decreasing order, as ``get_helper_indices`` of ``ssz/merkle-proofs.md``.
+    """
+    helper_indices = set()
+    path_indices = set()
+    for index in indices:
+        while index > 1:
+            path_indices.add(index)
+            helper_indices.add(index ^ 1)
+            index //= 2
+    return sorted(helper_indices - path_indices, reverse=True)
+
+
+def build_multiproof(anchor, indices):
+    """
+    Return the roots of the ``get_helper_indices(indices)`` nodes of the tree, in that order,
+    from one walk down the tree.
+    """
+    nodes = get_path_nodes(anchor, indices)
+    return [nodes[index].merkle_root() for index in get_helper_indices(indices)]
+
+
+def calculate_multi_merkle_root(leaves, proof, indices):
+    """
+    Return the root of a multiproof, as ``calculate_multi_merkle_root`` of
+    ``ssz/merkle-proofs.md``. Nodes are combined from the highest generalized index down,
+    so both children of a node are known before it is reached.
+    """
+    assert len(leaves) == len(indices)
+    helper_indices = get_helper_indices(indices)
+    assert len(proof) == len(helper_indices)
+    nodes = {
+        **dict(zip(indices, leaves, strict=True)),
+        **dict(zip(helper_indices, proof, strict=True)),
+    }
+    heap = [-index for index in nodes]
+    heapq.heapify(heap)
+    while heap:
+        index = -heapq.heappop(heap)
+        if index <= 1 or index // 2 in nodes:
+            continue
+        nodes[index // 2] = hash(nodes[index & ~1] + nodes[index | 1])
+        heapq.heappush(heap, -(index // 2))
+    return nodes[1]
+
+
+def verify_merkle_multiproof(leaves, proof, indices, root):
+    return calculate_multi_merkle_root(leaves, proof, indices) == root
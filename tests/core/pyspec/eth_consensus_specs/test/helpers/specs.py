@@ -1,3 +1,6 @@
+from collections.abc import Iterator, Mapping
+from importlib import import_module
+
 from .constants import (
     ALL_PHASES,
     MAINNET,
@@ -11,14 +14,33 @@ from .typing import (
 
 ALL_EXECUTABLE_SPEC_NAMES = ALL_PHASES
 
-# import the spec for each fork and preset
-for fork in ALL_EXECUTABLE_SPEC_NAMES:
-    exec(
-        f"from eth_consensus_specs.{fork} import mainnet as spec_{fork}_mainnet, minimal as spec_{fork}_minimal"
-    )
+
+class LazySpecTargets(Mapping[SpecForkName, Spec]):
+    """
+    The spec of each fork for one preset. A spec module is only imported
+    (and its SSZ types built) the first time it is looked up.
+    """
+
+    def __init__(self, preset_name: PresetBaseName) -> None:
+        self.preset_name = preset_name
+
+    def __getitem__(self, fork: SpecForkName) -> Spec:
+        if fork not in ALL_EXECUTABLE_SPEC_NAMES:
+            raise KeyError(fork)
+        return import_module(f"eth_consensus_specs.{fork}.{self.preset_name}")
+
+    def __contains__(self, fork: object) -> bool:
+        return fork in ALL_EXECUTABLE_SPEC_NAMES
+
+    def __iter__(self) -> Iterator[SpecForkName]:
+        return iter(ALL_EXECUTABLE_SPEC_NAMES)
+
+    def __len__(self) -> int:
+        return len(ALL_EXECUTABLE_SPEC_NAMES)
+
 
 # this is the only output of this file
-spec_targets: dict[PresetBaseName, dict[SpecForkName, Spec]] = {
-    MINIMAL: {fork: eval(f"spec_{fork}_minimal") for fork in ALL_EXECUTABLE_SPEC_NAMES},
-    MAINNET: {fork: eval(f"spec_{fork}_mainnet") for fork in ALL_EXECUTABLE_SPEC_NAMES},
+spec_targets: dict[PresetBaseName, Mapping[SpecForkName, Spec]] = {
+    MINIMAL: LazySpecTargets(MINIMAL),
+    MAINNET: LazySpecTargets(MAINNET),
 }
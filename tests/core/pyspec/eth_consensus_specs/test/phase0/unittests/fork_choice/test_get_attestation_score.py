@@ -0,0 +1,68 @@
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_all_phases,
+)
+from eth_consensus_specs.test.helpers.attestations import get_valid_attestation
+from eth_consensus_specs.test.helpers.attester_slashings import get_valid_attester_slashing
+from eth_consensus_specs.test.helpers.block import build_empty_block_for_next_slot
+from eth_consensus_specs.test.helpers.fork_choice import (
+    get_fork_choice_node,
+    get_genesis_forkchoice_store,
+)
+from eth_consensus_specs.test.helpers.state import state_transition_and_sign_block
+
+
+def check_attestation_scores(spec, store):
+    state = store.checkpoint_states[store.justified_checkpoint]
+    for root in store.blocks:
+        node = get_fork_choice_node(spec, root)
+        expected = spec._get_attestation_score(store, node, state)
+        assert spec.get_attestation_score(store, node, state) == expected
+
+
+@with_all_phases
+@spec_state_test
+def test_get_attestation_score_matches_reference(spec, state):
+    store = get_genesis_forkchoice_store(spec, state)
+    spec.on_tick(store, store.time + spec.config.SLOT_DURATION_MS * 2 // 1000)
+    check_attestation_scores(spec, store)
+
+    state_a = state.copy()
+    block_a = build_empty_block_for_next_slot(spec, state_a)
+    spec.on_block(store, state_transition_and_sign_block(spec, state_a, block_a))
+
+    state_b = state.copy()
+    block_b = build_empty_block_for_next_slot(spec, state_b)
+    block_b.body.graffiti = b"\x42" * 32
+    spec.on_block(store, state_transition_and_sign_block(spec, state_b, block_b))
+    check_attestation_scores(spec, store)
+
+    # Votes for both branches
+    committee = spec.get_beacon_committee(state_a, block_a.slot, 0)
+    half = set(committee[: len(committee) // 2])
+    spec.on_attestation(
+        store,
+        get_valid_attestation(
+            spec, state_a, slot=block_a.slot, signed=True, filter_participant_set=lambda _: half
+        ),
+    )
+    check_attestation_scores(spec, store)
+    spec.on_attestation(
+        store,
+        get_valid_attestation(
+            spec,
+            state_b,
+            slot=block_b.slot,
+            signed=True,
+            filter_participant_set=lambda participants: participants - half,
+        ),
+    )
+    check_attestation_scores(spec, store)
+
+    # Equivocating validators no longer count
+    attester_slashing = get_valid_attester_slashing(
+        spec, state_a, slot=block_a.slot, signed_1=True, signed_2=True
+    )
+    spec.on_attester_slashing(store, attester_slashing)
+    assert len(store.equivocating_indices) > 0
+    check_attestation_scores(spec, store)
@@ -0,0 +1,218 @@
+from eth_consensus_specs.test.context import (
+    MINIMAL,
+    never_bls,
+    spec_state_test,
+    with_all_phases,
+    with_altair_and_later,
+    with_gloas_and_later,
+    with_presets,
+)
+from eth_consensus_specs.test.helpers.attestations import next_epoch_with_attestations
+from eth_consensus_specs.test.helpers.block import build_empty_block_for_next_slot
+from eth_consensus_specs.test.helpers.fast_confirmation import FCRTest
+from eth_consensus_specs.test.helpers.fork_choice import (
+    get_fork_choice_node,
+    get_genesis_forkchoice_store,
+    tick_and_add_block,
+)
+from eth_consensus_specs.test.helpers.state import state_transition_and_sign_block
+
+
+@with_all_phases
+@spec_state_test
+def test_prune_store_on_finalization(spec, state):
+    test_steps = []
+    store = get_genesis_forkchoice_store(spec, state)
+    genesis_root = store.finalized_checkpoint.root
+
+    # A side branch that is abandoned once the canonical chain finalizes
+    side_state = state.copy()
+    side_block = build_empty_block_for_next_slot(spec, side_state)
+    side_block.body.graffiti = b"\x42" * 32
+    signed_side_block = state_transition_and_sign_block(spec, side_state, side_block)
+    yield from tick_and_add_block(spec, store, signed_side_block, test_steps)
+    side_root = side_block.hash_tree_root()
+
+    spec.prune_store_on_finalization = True
+    try:
+        for _ in range(4):
+            _, signed_blocks, state = next_epoch_with_attestations(
+                spec, state, fill_cur_epoch=True, fill_prev_epoch=False
+            )
+            for signed_block in signed_blocks:
+                yield from tick_and_add_block(spec, store, signed_block, test_steps)
+    finally:
+        spec.prune_store_on_finalization = False
+
+    finalized_root = store.finalized_checkpoint.root
+    assert store.finalized_checkpoint.epoch > spec.GENESIS_EPOCH
+    assert side_root not in store.blocks
+    assert genesis_root not in store.blocks
+    assert side_root not in store.block_states
+    for root, block in store.blocks.items():
+        assert root == finalized_root or block.parent_root in store.blocks
+    assert all(checkpoint.root in store.blocks for checkpoint in store.checkpoint_states)
+    assert spec.get_head(store).root == signed_blocks[-1].message.hash_tree_root()
+
+
+def add_blocks_and_attestations(spec, store, signed_blocks):
+    for signed_block in signed_blocks:
+        block = signed_block.message
+        spec.on_tick(store, store.genesis_time + block.slot * spec.config.SLOT_DURATION_MS // 1000)
+        spec.on_block(store, signed_block)
+        for attestation in block.body.attestations:
+            spec.on_attestation(store, attestation, is_from_block=True)
+
+
+def get_latest_message_attestation(spec, slot, root, index=0):
+    epoch = spec.compute_epoch_at_slot(slot)
+    return spec.Attestation(
+        data=spec.AttestationData(
+            slot=slot,
+            index=index,
+            beacon_block_root=root,
+            target=spec.Checkpoint(epoch=epoch, root=root),
+        )
+    )
+
+
+def build_side_block_and_chain(spec, state):
+    side_state = state.copy()
+    side_block = build_empty_block_for_next_slot(spec, side_state)
+    side_block.body.graffiti = b"\x42" * 32
+    signed_side_block = state_transition_and_sign_block(spec, side_state, side_block)
+    signed_blocks = []
+    for _ in range(4):
+        _, epoch_blocks, state = next_epoch_with_attestations(
+            spec, state, fill_cur_epoch=True, fill_prev_epoch=False
+        )
+        signed_blocks.extend(epoch_blocks)
+    return signed_side_block, signed_blocks
+
+
+def build_stores_with_side_votes(spec, genesis_state, signed_side_block, signed_blocks, votes):
+    """
+    Return an unpruned and a pruned store of the same chain, where each validator index of
+    ``votes`` voted for the side block, with the attestation index it maps to, in the epoch
+    after the chain. Pruning drops the side block.
+    """
+    side_root = signed_side_block.message.hash_tree_root()
+    stores = []
+    for prune in [False, True]:
+        store = get_genesis_forkchoice_store(spec, genesis_state)
+        add_blocks_and_attestations(spec, store, [signed_side_block, *signed_blocks])
+        epoch_start_slot = spec.compute_start_slot_at_epoch(spec.get_current_store_epoch(store) + 1)
+        spec.on_tick(
+            store, store.genesis_time + epoch_start_slot * spec.config.SLOT_DURATION_MS // 1000
+        )
+        for validator_index, index in votes.items():
+            spec.update_latest_messages(
+                store,
+                [validator_index],
+                get_latest_message_attestation(spec, epoch_start_slot, side_root, index),
+            )
+        if prune:
+            spec.prune_store(store)
+            assert side_root not in store.blocks
+        stores.append(store)
+    return stores
+
+
+@with_all_phases
+@spec_state_test
+def test_prune_store_keeps_latest_message_epochs(spec, state):
+    genesis_state = state.copy()
+    signed_side_block, signed_blocks = build_side_block_and_chain(spec, state)
+    side_root = signed_side_block.message.hash_tree_root()
+    head_root = signed_blocks[-1].message.hash_tree_root()
+    validator_index = spec.ValidatorIndex(0)
+
+    stores = build_stores_with_side_votes(
+        spec, genesis_state, signed_side_block, signed_blocks, {validator_index: 0}
+    )
+    for store in stores:
+        # An attestation of an older epoch does not replace the vote, with or without pruning
+        message = store.latest_messages.get(validator_index)
+        older_slot = spec.compute_start_slot_at_epoch(spec.get_current_store_epoch(store)) - 1
+        spec.update_latest_messages(
+            store,
+            [validator_index],
+            get_latest_message_attestation(spec, older_slot, head_root),
+        )
+        assert store.latest_messages.get(validator_index) == message
+
+    store, pruned_store = stores
+    assert store.latest_messages[validator_index].root == side_root
+    assert validator_index not in pruned_store.latest_messages
+    assert validator_index in spec.get_pruned_latest_messages(pruned_store)
+    assert spec.get_head(pruned_store) == spec.get_head(store)
+    for root in pruned_store.blocks:
+        node = get_fork_choice_node(spec, root)
+        assert spec.get_weight(pruned_store, node) == spec.get_weight(store, node)
+
+    # A newer attestation replaces the pruned vote, which then counts again
+    newer_slot = spec.compute_start_slot_at_epoch(spec.get_current_store_epoch(store) + 1)
+    for store in stores:
+        spec.on_tick(store, store.genesis_time + newer_slot * spec.config.SLOT_DURATION_MS // 1000)
+        spec.update_latest_messages(
+            store,
+            [validator_index],
+            get_latest_message_attestation(spec, newer_slot, head_root),
+        )
+    assert pruned_store.latest_messages[validator_index] == store.latest_messages[validator_index]
+    assert validator_index not in spec.get_pruned_latest_messages(pruned_store)
+    head_node = get_fork_choice_node(spec, head_root)
+    assert spec.get_weight(pruned_store, head_node) == spec.get_weight(store, head_node)
+
+
+@with_gloas_and_later
+@spec_state_test
+def test_prune_store_keeps_finalized_payload_weights(spec, state):
+    genesis_state = state.copy()
+    signed_side_block, signed_blocks = build_side_block_and_chain(spec, state)
+
+    # Votes for the side block with and without its payload, at a slot past the finalized block
+    store, pruned_store = build_stores_with_side_votes(
+        spec,
+        genesis_state,
+        signed_side_block,
+        signed_blocks,
+        {spec.ValidatorIndex(0): 0, spec.ValidatorIndex(1): 1},
+    )
+    finalized_root = pruned_store.finalized_checkpoint.root
+    for payload_status in [spec.PAYLOAD_STATUS_FULL, spec.PAYLOAD_STATUS_EMPTY]:
+        node = get_fork_choice_node(spec, finalized_root, payload_status)
+        assert spec.get_weight(pruned_store, node) == spec.get_weight(store, node)
+    assert spec.get_head(pruned_store) == spec.get_head(store)
+
+
+@with_altair_and_later
+@spec_state_test
+@with_presets([MINIMAL], reason="too slow")
+@never_bls
+def test_prune_store_with_fast_confirmation(spec, state):
+    # Finalize, then confirm through a period of asynchrony and back
+    participation_rates = (
+        [100] * 4 * spec.SLOTS_PER_EPOCH + [75] * 4 + [100] * 2 * spec.SLOTS_PER_EPOCH
+    )
+    confirmed_roots = []
+    for prune in [False, True]:
+        fcr_test = FCRTest(spec, seed=1)
+        store, fcr_store = fcr_test.initialize(state.copy())
+        genesis_root = store.finalized_checkpoint.root
+        spec.prune_store_on_finalization = prune
+        try:
+            roots = []
+            for participation_rate in participation_rates:
+                fcr_test.next_slot_with_block_and_fast_confirmation(
+                    participation_rate=participation_rate
+                )
+                roots.append(fcr_store.confirmed_root)
+        finally:
+            spec.prune_store_on_finalization = False
+        confirmed_roots.append(roots)
+
+    assert store.finalized_checkpoint.epoch > spec.GENESIS_EPOCH
+    assert genesis_root not in store.blocks
+    assert confirmed_roots[1] == confirmed_roots[0]
+    assert fcr_store.confirmed_root == fcr_test.head_root()
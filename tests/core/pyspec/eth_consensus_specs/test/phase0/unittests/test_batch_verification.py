@@ -0,0 +1,95 @@
+import pytest
+
+from eth_consensus_specs.test.context import (
+    always_bls,
+    single_phase,
+    spec_state_test,
+    with_all_phases,
+    with_phases,
+)
+from eth_consensus_specs.test.helpers.attestations import get_valid_attestation
+from eth_consensus_specs.test.helpers.block import (
+    batched_block_verification,
+    build_empty_block_for_next_slot,
+)
+from eth_consensus_specs.test.helpers.constants import PHASE0
+from eth_consensus_specs.test.helpers.deposits import prepare_state_and_deposit
+from eth_consensus_specs.test.helpers.keys import privkeys
+from eth_consensus_specs.test.helpers.state import next_slots, state_transition_and_sign_block
+from eth_consensus_specs.utils import bls
+
+
+@with_phases([PHASE0])
+@spec_state_test
+@always_bls
+@single_phase
+def test_batched_block_skips_invalid_deposit_signature(spec, state):
+    validator_index = len(state.validators)
+    amount = spec.MAX_EFFECTIVE_BALANCE
+    deposit = prepare_state_and_deposit(spec, state, validator_index, amount, signed=False)
+    pre_state = state.copy()
+
+    block = build_empty_block_for_next_slot(spec, state)
+    block.body.deposits.append(deposit)
+    signed_block = state_transition_and_sign_block(spec, state, block)
+    assert len(state.validators) == validator_index
+
+    # The deposit signature is checked right away, the others with the batch
+    with bls.batch_verification():
+        spec.state_transition(pre_state, signed_block)
+    assert pre_state.hash_tree_root() == state.hash_tree_root()
+
+
+@with_phases([PHASE0])
+@spec_state_test
+@always_bls
+@single_phase
+def test_batched_block_rejects_invalid_block_signature(spec, state):
+    pre_state = state.copy()
+    block = build_empty_block_for_next_slot(spec, state)
+    signed_block = state_transition_and_sign_block(spec, state, block)
+    signed_block.signature = bls.Sign(privkeys[0], b"\x00" * 32)
+
+    batch = bls.batch_verification()
+    with pytest.raises(AssertionError, match="invalid signature 0 of"), batch:
+        spec.state_transition(pre_state, signed_block)
+
+
+def build_block_with_attestation(spec, state, valid):
+    attestation = get_valid_attestation(spec, state, signed=True)
+    if not valid:
+        attestation.signature = bls.Sign(privkeys[0], b"\x00" * 32)
+    next_slots(spec, state, spec.MIN_ATTESTATION_INCLUSION_DELAY)
+    block = build_empty_block_for_next_slot(spec, state)
+    block.body.attestations.append(attestation)
+    return block
+
+
+def transition_with_batch_verification(spec, state, block):
+    with batched_block_verification():
+        return state_transition_and_sign_block(spec, state, block)
+
+
+@with_all_phases
+@spec_state_test
+@always_bls
+@single_phase
+def test_batched_block_helpers_match_unbatched(spec, state):
+    block = build_block_with_attestation(spec, state, valid=True)
+    pre_state = state.copy()
+    state_transition_and_sign_block(spec, state, block.copy())
+    transition_with_batch_verification(spec, pre_state, block)
+    assert pre_state.hash_tree_root() == state.hash_tree_root()
+
+
+@with_all_phases
+@spec_state_test
+@always_bls
+@single_phase
+def test_batched_block_helpers_reject_invalid_attestation_signature(spec, state):
+    block = build_block_with_attestation(spec, state, valid=False)
+
+    # The invalid attestation signature is reported by the check of the batch, after the
+    # valid randao reveal
+    with pytest.raises(AssertionError, match="invalid signature 1 of"):
+        transition_with_batch_verification(spec, state, block)
@@ -0,0 +1,179 @@
+import random
+
+import pytest
+
+from eth_consensus_specs.test.context import (
+    single_phase,
+    spec_test,
+    with_all_phases,
+)
+from eth_consensus_specs.test.helpers.forks import is_post_deneb
+from eth_consensus_specs.test.helpers.gossip import (
+    AggregationBitsIndex,
+    get_bounded_seen,
+    get_propagation_window_epochs,
+    get_seen,
+)
+
+
+def get_window_fields(seen):
+    return [seen.attestation_validator_epochs, seen.aggregator_epochs, seen.aggregate_data_roots]
+
+
+@with_all_phases
+@spec_test
+@single_phase
+def test_bounded_seen_expiry(spec):
+    retained_epochs = get_propagation_window_epochs(spec)
+    seen = get_bounded_seen(spec, retained_epochs)
+    seen.proposer_slots.add((spec.Slot(0), spec.ValidatorIndex(0)))
+    for epoch in range(retained_epochs + 1):
+        seen.aggregator_epochs.add((spec.Epoch(epoch), spec.ValidatorIndex(1)))
+        seen.aggregate_data_roots[spec.Root(b"\x01" * 31 + epoch.to_bytes(1))] = {(True,)}
+        assert (spec.Epoch(epoch), spec.ValidatorIndex(1)) in seen.aggregator_epochs
+
+    # Epoch 0 is dropped once ``retained_epochs`` newer epochs are seen
+    assert sorted(key[0] for key in seen.aggregator_epochs) == list(range(1, retained_epochs + 1))
+    assert list(seen.aggregate_data_roots[spec.Root(b"\x01" * 31 + b"\x02")]) == [(True,)]
+    # Other epoch-bucketed fields share the window, and do not take dropped epochs
+    with pytest.raises(ValueError, match="epoch 0 is older than"):
+        seen.attestation_validator_epochs.add((spec.Epoch(0), spec.ValidatorIndex(1)))
+    assert len(seen.attestation_validator_epochs) == 0
+    seen.attestation_validator_epochs.add(
+        (spec.Epoch(2 * retained_epochs + 1), spec.ValidatorIndex(1))
+    )
+    assert len(seen.aggregator_epochs) == 0
+    # The root of the latest aggregate had no epoch yet: it takes the latest one
+    assert list(seen.aggregate_data_roots) == [
+        spec.Root(b"\x01" * 31 + retained_epochs.to_bytes(1))
+    ]
+    # Fields outside of a propagation window are kept
+    assert len(seen.proposer_slots) == 1
+
+
+@with_all_phases
+@spec_test
+@single_phase
+def test_bounded_seen_keeps_aggregates_with_their_aggregator(spec):
+    retained_epochs = get_propagation_window_epochs(spec)
+    seen = get_bounded_seen(spec, retained_epochs)
+    roots = [spec.Root(i.to_bytes(1) * 32) for i in range(4)]
+
+    # A root added before the aggregator key of its message, of an epoch that drops all the
+    # others, takes that epoch
+    seen.aggregator_epochs.add((spec.Epoch(0), spec.ValidatorIndex(0)))
+    seen.aggregate_data_roots[roots[0]] = {(True,)}
+    seen.aggregate_data_roots[roots[1]] = {(True,)}
+    seen.aggregator_epochs.add((spec.Epoch(retained_epochs), spec.ValidatorIndex(1)))
+    assert sorted(seen.aggregate_data_roots) == [roots[1]]
+
+    # The aggregate of an older epoch, validated after a newer one, is kept with the newer one
+    seen.aggregator_epochs.add((spec.Epoch(1), spec.ValidatorIndex(2)))
+    seen.aggregate_data_roots[roots[2]] = {(True,)}
+    seen.aggregator_epochs.add((spec.Epoch(retained_epochs + 1), spec.ValidatorIndex(3)))
+    assert (spec.Epoch(1), spec.ValidatorIndex(2)) not in seen.aggregator_epochs
+    assert sorted(seen.aggregate_data_roots) == roots[1:3]
+
+    seen.aggregate_data_roots[roots[3]] = {(True,)}
+    del seen.aggregate_data_roots[roots[3]]
+    del seen.aggregate_data_roots[roots[1]]
+    assert list(seen.aggregate_data_roots) == [roots[2]]
+    seen.aggregator_epochs.add((spec.Epoch(2 * retained_epochs + 1), spec.ValidatorIndex(4)))
+    assert len(seen.aggregate_data_roots) == 0
+
+
+@with_all_phases
+@spec_test
+@single_phase
+def test_bounded_seen_covers_propagation_window(spec):
+    retained_epochs = get_propagation_window_epochs(spec)
+    with pytest.raises(ValueError, match="below the"):
+        get_bounded_seen(spec, retained_epochs - 1)
+
+    # The oldest epoch of the propagation range is still kept once the next epoch is seen
+    seen = get_bounded_seen(spec)
+    range_slots = int(spec.config.ATTESTATION_PROPAGATION_SLOT_RANGE)
+    current_slot = 10 * int(spec.SLOTS_PER_EPOCH)
+    if is_post_deneb(spec):
+        oldest_epoch = spec.compute_epoch_at_slot(current_slot) - 1
+    else:
+        oldest_epoch = spec.compute_epoch_at_slot(current_slot - range_slots)
+    seen.attestation_validator_epochs.add((spec.compute_epoch_at_slot(current_slot) + 1, 0))
+    seen.attestation_validator_epochs.add((oldest_epoch, 0))
+    assert (oldest_epoch, 0) in seen.attestation_validator_epochs
+
+
+def replay_attestation_seen(spec, seen, epochs, validators, aggregates):
+    """
+    Mark the attestations of ``validators`` validators, and ``aggregates`` aggregates, as
+    seen in each of ``epochs``, as their gossip validation does. Yield after each epoch.
+    """
+    for epoch in epochs:
+        for validator in range(validators):
+            seen.attestation_validator_epochs.add(
+                (spec.Epoch(epoch), spec.ValidatorIndex(validator))
+            )
+        for aggregator in range(aggregates):
+            seen.aggregator_epochs.add((spec.Epoch(epoch), spec.ValidatorIndex(aggregator)))
+            root = spec.Root(epoch.to_bytes(8, "little") + aggregator.to_bytes(24, "little"))
+            if root not in seen.aggregate_data_roots:
+                seen.aggregate_data_roots[root] = set()
+            seen.aggregate_data_roots[root].add((True,) * 8)
+        yield
+
+
+@with_all_phases
+@spec_test
+@single_phase
+def test_bounded_seen_entries_over_many_epochs(spec):
+    retained_epochs = get_propagation_window_epochs(spec)
+    validators, aggregates = 2048, 64
+    epochs = range(8 * retained_epochs)
+    epoch_entries = validators + 2 * aggregates
+
+    def replay(seen):
+        entries = []
+        for _ in replay_attestation_seen(spec, seen, epochs, validators, aggregates):
+            entries.append(sum(len(values) for values in get_window_fields(seen)))
+        return entries
+
+    # Once the window is full, the entries of one window are kept
+    entries = replay(get_bounded_seen(spec))
+    assert entries[:retained_epochs] == [
+        (epoch + 1) * epoch_entries for epoch in range(retained_epochs)
+    ]
+    assert entries[retained_epochs:] == [retained_epochs * epoch_entries] * (
+        len(epochs) - retained_epochs
+    )
+
+    entries = replay(get_seen(spec, bounded=False))
+    assert entries == [(epoch + 1) * epoch_entries for epoch in range(len(epochs))]
+
+
+@with_all_phases
+@spec_test
+@single_phase
+def test_aggregation_bits_index_matches_reference(spec):
+    rng = random.Random(5566)
+    for length in [1, 8, 64]:
+        bits_set = set()
+        index = AggregationBitsIndex()
+        for _ in range(50):
+            bits = tuple(rng.random() < 0.7 for _ in range(length))
+            expected = spec.is_non_strict_superset(bits_set, bits)
+            assert index.has_superset(bits) == expected
+            assert spec.is_non_strict_superset(index, bits) == expected
+            bits_set.add(bits)
+            index.add(bits)
+        # Only the maximal bits are kept
+        assert all(
+            not any(spec.is_non_strict_superset({other}, bits) for other in index if other != bits)
+            for bits in index
+        )
+        assert len(index) <= len(bits_set)
+        assert all(len(bits) == length for bits in index)
+        assert all(spec.is_non_strict_superset(bits_set, bits) for bits in index)
+
+    with pytest.raises(ValueError, match="lengths do not match"):
+        index.has_superset((True,))
+    assert not spec.is_non_strict_superset(AggregationBitsIndex(), (True,))
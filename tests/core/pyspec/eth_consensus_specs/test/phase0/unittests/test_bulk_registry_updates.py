@@ -0,0 +1,66 @@
+from random import Random
+
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_all_phases,
+)
+from eth_consensus_specs.test.helpers.epoch_processing import (
+    run_epoch_process,
+    run_epoch_processing_to,
+)
+from eth_consensus_specs.test.helpers.state import next_epoch
+
+
+@with_all_phases
+@spec_state_test
+def test_effective_balance_updates_match_reference(spec, state):
+    rng = Random(1014)
+    increment = spec.EFFECTIVE_BALANCE_INCREMENT
+    for index in range(len(state.validators)):
+        state.balances[index] = rng.randrange(0, 2 * spec.MAX_EFFECTIVE_BALANCE)
+    # Within the hysteresis thresholds: not updated
+    state.balances[0] = state.validators[0].effective_balance + increment // 4
+    state.balances[1] = state.validators[1].effective_balance - increment // 4
+
+    run_epoch_processing_to(spec, state, "process_effective_balance_updates")
+    pre_effective_balances = [v.effective_balance for v in state.validators]
+    run_epoch_process(spec, state, "process_effective_balance_updates")
+    assert [v.effective_balance for v in state.validators][:2] == pre_effective_balances[:2]
+    assert [v.effective_balance for v in state.validators] != pre_effective_balances
+
+
+@with_all_phases
+@spec_state_test
+def test_enumerate_effective_balance_updates(spec, state):
+    state.balances[3] = 0
+    effective_balance = state.validators[3].effective_balance
+    updates = spec.enumerate_effective_balance_updates(state)
+    index, validator = next(updates)
+    assert index == 3
+    validator.effective_balance = 0
+    # The registry is only written once the loop is done
+    assert state.validators[3].effective_balance == effective_balance
+    assert next(updates, None) is None
+    assert state.validators[3].effective_balance == 0
+
+    assert list(spec.enumerate_effective_balance_updates(state)) == []
+
+
+@with_all_phases
+@spec_state_test
+def test_slashings_match_reference(spec, state):
+    next_epoch(spec, state)
+    epoch = spec.get_current_epoch(state)
+    withdrawable_epoch = epoch + spec.EPOCHS_PER_SLASHINGS_VECTOR // 2
+    slashed_indices = [1, 4, 5]
+    for index in slashed_indices + [7]:
+        spec.slash_validator(state, index)
+    for index in slashed_indices:
+        state.validators[index].withdrawable_epoch = withdrawable_epoch
+    # Not slashed, or not halfway through the slashings vector: no penalty
+    state.validators[2].withdrawable_epoch = withdrawable_epoch
+    state.validators[7].withdrawable_epoch = withdrawable_epoch + 1
+
+    assert [index for index, _ in spec.enumerate_slashings(state)] == slashed_indices
+    run_epoch_processing_to(spec, state, "process_slashings")
+    run_epoch_process(spec, state, "process_slashings")
@@ -0,0 +1,66 @@
+import pytest
+
+from eth_consensus_specs.test.context import (
+    single_phase,
+    spec_state_test,
+    with_phases,
+)
+from eth_consensus_specs.test.helpers.constants import PHASE0
+
+
+@with_phases([PHASE0])
+@spec_state_test
+@single_phase
+def test_cache_info_counts_hits_and_misses(spec, state):
+    epoch = spec.get_current_epoch(state)
+    spec.get_active_validator_indices(state, epoch)
+    before = spec.get_active_validator_indices.cache_info()
+
+    # A copy shares the validators tree, so it shares the cache entry
+    expected = spec.get_active_validator_indices(state.copy(), epoch)
+    info = spec.get_active_validator_indices.cache_info()
+    assert info.hits == before.hits + 1
+    assert info.misses == before.misses
+
+    # Any write to the registry gives it a new key
+    state.validators[0].exit_epoch = epoch
+    indices = spec.get_active_validator_indices(state, epoch)
+    info = spec.get_active_validator_indices.cache_info()
+    assert info.misses == before.misses + 1
+    assert indices == expected[1:]
+    assert indices == spec._get_active_validator_indices(state, epoch)
+    assert info.currsize <= info.maxsize
+
+
+@with_phases([PHASE0])
+@spec_state_test
+@single_phase
+def test_cache_stats_and_clear_caches(spec, state):
+    epoch = spec.get_current_epoch(state)
+    spec.get_active_validator_indices(state, epoch)
+    spec.get_active_validator_indices(state, epoch)
+    stats = spec.cache_stats()
+    assert "get_epoch_committees" in stats
+    assert "get_active_validator_indices" in stats
+    info = stats["get_active_validator_indices"]
+    assert info.hits >= 1
+    assert info.misses >= 1
+    assert info.entry_bytes > 0
+
+    spec.clear_caches()
+    info = spec.cache_stats()["get_active_validator_indices"]
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 0, 0, 0)
+
+
+@with_phases([PHASE0])
+@spec_state_test
+@single_phase
+def test_cache_names_are_unique(spec, state):
+    stats = spec.cache_stats()
+    assert "compute_shuffled_permutation" in stats
+    assert "compute_shuffled_permutation_optimized" not in stats
+
+    with pytest.raises(AssertionError, match="already registered"):
+        spec.cache_this(
+            lambda epoch: epoch, lambda epoch: epoch, lru_size=1, name="get_epoch_committees"
+        )
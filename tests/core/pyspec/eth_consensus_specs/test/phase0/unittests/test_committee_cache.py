@@ -0,0 +1,63 @@
+from eth_consensus_specs.test.context import (
+    spec_state_test,
+    with_all_phases,
+)
+from eth_consensus_specs.test.helpers.attestations import get_valid_attestation
+from eth_consensus_specs.test.helpers.state import next_epoch, next_slots
+
+
+@with_all_phases
+@spec_state_test
+def test_committees_match_reference(spec, state):
+    next_epoch(spec, state)
+    for epoch in [spec.get_previous_epoch(state), spec.get_current_epoch(state)]:
+        committees_per_slot = spec.get_committee_count_per_slot(state, epoch)
+        for slot in range(
+            spec.compute_start_slot_at_epoch(epoch), spec.compute_start_slot_at_epoch(epoch + 1)
+        ):
+            slot_committees = []
+            for index in range(committees_per_slot):
+                committee = spec.get_beacon_committee(state, slot, index)
+                assert committee == spec._get_beacon_committee(state, slot, index)
+                slot_committees += committee
+            assert spec.get_slot_committees(state, slot) == slot_committees
+
+
+@with_all_phases
+@spec_state_test
+def test_committee_cache_keys(spec, state):
+    epoch = spec.get_current_epoch(state)
+    spec.committee_cache.cache_clear()
+    committees = spec.get_epoch_committees(state, epoch)
+    # A copy shares the registry and the RANDAO mixes, so it shares the committees
+    assert spec.get_epoch_committees(state.copy(), epoch) is committees
+    info = spec.committee_cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    # Any write to the registry or to the RANDAO mix of the seed gives a new key
+    state.validators[0].exit_epoch = epoch
+    assert spec.get_epoch_committees(state, epoch) is not committees
+    committees = spec.get_epoch_committees(state, epoch)
+    mix_epoch = epoch + spec.EPOCHS_PER_HISTORICAL_VECTOR - spec.MIN_SEED_LOOKAHEAD - 1
+    state.randao_mixes[mix_epoch % spec.EPOCHS_PER_HISTORICAL_VECTOR] = b"\x01" * 32
+    assert spec.get_epoch_committees(state, epoch) is not committees
+    assert spec.committee_cache.cache_info().misses == 3
+
+    spec.get_epoch_committees(state, epoch + 1)
+    spec.committee_cache.prune(epoch + 1)
+    assert [key[2] for key, _ in spec.committee_cache.entries.items()] == [epoch + 1]
+    assert "get_epoch_committees" in spec.cache_stats()
+    spec.clear_caches()
+    assert spec.committee_cache.cache_info().currsize == 0
+
+
+@with_all_phases
+@spec_state_test
+def test_attesting_indices_match_reference(spec, state):
+    next_slots(spec, state, 1)
+    attestation = get_valid_attestation(spec, state, slot=state.slot - 1, signed=False)
+    for i in range(0, len(attestation.aggregation_bits), 2):
+        attestation.aggregation_bits[i] = False
+    expected = spec._get_attesting_indices(state, attestation)
+    assert len(expected) > 0
+    assert spec.get_attesting_indices(state, attestation) == expected
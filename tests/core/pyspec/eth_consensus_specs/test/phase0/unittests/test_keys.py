@@ -0,0 +1,36 @@
+from eth_consensus_specs.test.context import (
+    single_phase,
+    spec_test,
+    with_phases,
+)
+from eth_consensus_specs.test.helpers.constants import PHASE0
+from eth_consensus_specs.test.helpers.keys import (
+    builder_privkeys,
+    builder_pubkey_to_privkey,
+    builder_pubkeys,
+    privkeys,
+    pubkey_to_privkey,
+    pubkeys,
+)
+from eth_consensus_specs.utils import bls
+
+
+@with_phases([PHASE0])
+@spec_test
+@single_phase
+def test_pubkey_table_matches_sk_to_pk(spec):
+    assert len(pubkeys) == len(privkeys)
+    assert len(builder_pubkeys) == len(builder_privkeys)
+    for index in [0, 1, 255, len(privkeys) - 1]:
+        pubkey = bls.SkToPk(privkeys[index])
+        assert pubkeys[index] == pubkey
+        assert pubkeys.index(pubkey) == index
+        assert pubkey_to_privkey[pubkey] == privkeys[index]
+    assert pubkeys[-1] == pubkeys[len(pubkeys) - 1]
+    assert pubkeys[2:4] == [bls.SkToPk(privkeys[2]), bls.SkToPk(privkeys[3])]
+
+    pubkey = bls.SkToPk(builder_privkeys[7])
+    assert builder_pubkeys[7] == pubkey
+    assert builder_pubkey_to_privkey[pubkey] == builder_privkeys[7]
+    assert pubkey not in pubkeys
+    assert pubkey not in pubkey_to_privkey
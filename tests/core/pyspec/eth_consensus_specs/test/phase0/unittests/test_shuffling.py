@@ -0,0 +1,31 @@
+import random
+
+from eth_consensus_specs.test.context import (
+    single_phase,
+    spec_test,
+    with_phases,
+)
+from eth_consensus_specs.test.helpers.constants import PHASE0
+
+
+@with_phases([PHASE0])
+@spec_test
+@single_phase
+def test_compute_shuffled_permutation_matches_reference(spec):
+    rng = random.Random(1234)
+    for count in [1, 2, 3, 5, 10, 33, 100, 255, 256, 257, 1000]:
+        seed = spec.Bytes32(rng.randbytes(32))
+        expected = spec._compute_shuffled_permutation(spec.Uint64(count), seed)
+        assert list(spec.compute_shuffled_permutation(spec.Uint64(count), seed)) == expected
+
+
+@with_phases([PHASE0])
+@spec_test
+@single_phase
+def test_compute_shuffled_index_matches_reference(spec):
+    rng = random.Random(5566)
+    count = spec.Uint64(777)
+    seed = spec.Bytes32(rng.randbytes(32))
+    expected = spec._compute_shuffled_permutation(count, seed)
+    for index in range(count):
+        assert spec.compute_shuffled_index(spec.Uint64(index), count, seed) == expected[index]
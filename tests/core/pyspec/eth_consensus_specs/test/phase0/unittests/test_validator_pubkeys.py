@@ -0,0 +1,60 @@
+from eth_consensus_specs.test.context import (
+    single_phase,
+    spec_state_test,
+    with_all_phases,
+)
+from eth_consensus_specs.test.helpers.keys import pubkeys
+
+
+@with_all_phases
+@spec_state_test
+@single_phase
+def test_validator_pubkeys_match_registry(spec, state):
+    validator_pubkeys = spec.get_validator_pubkeys(state)
+    registry_pubkeys = [v.pubkey for v in state.validators]
+    assert len(validator_pubkeys) == len(registry_pubkeys)
+    for i in [0, 1, len(registry_pubkeys) - 1]:
+        assert registry_pubkeys[i] in validator_pubkeys
+        assert validator_pubkeys.index(registry_pubkeys[i]) == i
+    new_pubkey = pubkeys[len(state.validators)]
+    assert new_pubkey not in validator_pubkeys
+
+    # Copies share the backing of the registry, and so its pubkeys
+    assert spec.get_validator_pubkeys(state.copy()) is validator_pubkeys
+
+
+@with_all_phases
+@spec_state_test
+@single_phase
+def test_validator_pubkeys_after_add_validator(spec, state):
+    pre_state = state.copy()
+    pre_pubkeys = spec.get_validator_pubkeys(pre_state)
+    index = len(state.validators)
+    new_pubkey = pubkeys[index]
+    spec.add_validator_to_registry(state, new_pubkey, b"\x00" * 32, spec.MIN_DEPOSIT_AMOUNT)
+
+    validator_pubkeys = spec.get_validator_pubkeys(state)
+    assert validator_pubkeys.index(new_pubkey) == index
+    # The index is extended in place, without changing the pubkeys of the previous registry
+    assert validator_pubkeys.pubkey_index is pre_pubkeys.pubkey_index
+    assert new_pubkey not in pre_pubkeys
+    assert new_pubkey not in spec.get_validator_pubkeys(pre_state)
+
+    # The previous registry can no longer be extended in place, it gets a new index
+    spec.add_validator_to_registry(pre_state, new_pubkey, b"\x01" * 32, spec.MIN_DEPOSIT_AMOUNT)
+    assert spec.get_validator_pubkeys(pre_state).index(new_pubkey) == index
+    assert spec.get_validator_pubkeys(pre_state).pubkey_index is not pre_pubkeys.pubkey_index
+
+
+@with_all_phases
+@spec_state_test
+@single_phase
+def test_validator_pubkeys_after_pubkey_change(spec, state):
+    old_pubkey = state.validators[3].pubkey
+    assert spec.get_validator_pubkeys(state).index(old_pubkey) == 3
+
+    new_pubkey = pubkeys[len(state.validators)]
+    state.validators[3].pubkey = new_pubkey
+    validator_pubkeys = spec.get_validator_pubkeys(state)
+    assert old_pubkey not in validator_pubkeys
+    assert validator_pubkeys.index(new_pubkey) == 3
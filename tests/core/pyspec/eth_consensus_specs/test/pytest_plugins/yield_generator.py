@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import shutil
 from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, TYPE_CHECKING, TypedDict
@@ -10,7 +9,7 @@ import pytest
 
 from eth_consensus_specs.test import context
 from eth_consensus_specs.test.helpers.constants import TESTGEN_FORKS
-from eth_consensus_specs.test.utils.dumper import Dumper
+from eth_consensus_specs.test.utils.dumper import Dumper, DumpWriter, write_test_case
 from eth_consensus_specs.test.utils.manifest import Manifest
 
 if TYPE_CHECKING:
@@ -193,6 +192,7 @@ class YieldGeneratorPlugin:
         self.config = config
         self.output_dir: str = config.getoption("--reftests-output")
         self._dumper: Dumper | None = None
+        self._writer: DumpWriter | None = None
 
     @property
     def reftests_enabled(self) -> bool:
@@ -204,6 +204,14 @@ class YieldGeneratorPlugin:
             self._dumper = Dumper()
         return self._dumper
 
+    @property
+    def writer(self) -> DumpWriter | None:
+        """The background writers, only when ``--reftests-writers`` asks for some."""
+        workers = self.config.getoption("--reftests-writers")
+        if self._writer is None and workers > 0:
+            self._writer = DumpWriter(workers)
+        return self._writer
+
     def register(self):
         self.config.pluginmanager.register(self, "yield_generator")
 
@@ -359,38 +367,33 @@ class YieldGeneratorPlugin:
             / manifest.case_name
         )
 
-        outputs: list[tuple[str, Any, Any]] = []
+        outputs: list[tuple[str, str, Any]] = []
         meta: dict[str, Any] = {}
 
         for name, kind, data in phase_result:
             if kind == "meta":
                 meta[name] = data
             else:
-                method = getattr(self.dumper, f"dump_{kind}", None)
-                if method is None:
+                if not hasattr(Dumper, f"dump_{kind}"):
                     raise ValueError(f"Unknown kind {kind!r}")
-                outputs.append((name, method, data))
-
-        if output_dir.exists():
-            shutil.rmtree(output_dir)
-
-        for name, method, data in outputs:
-            method(output_dir, name, data)
-
-        if meta:
-            self.dumper.dump_meta(output_dir, meta)
-
-        self.dumper.dump_manifest(
-            output_dir,
-            {
-                "preset": manifest.preset_name,
-                "fork": manifest.fork_name,
-                "runner": manifest.runner_name,
-                "handler": manifest.handler_name,
-                "suite": manifest.suite_name,
-                "case": manifest.case_name,
-            },
-        )
+                outputs.append((name, kind, data))
+
+        manifest_data = {
+            "preset": manifest.preset_name,
+            "fork": manifest.fork_name,
+            "runner": manifest.runner_name,
+            "handler": manifest.handler_name,
+            "suite": manifest.suite_name,
+            "case": manifest.case_name,
+        }
+        if self.writer is None:
+            write_test_case(output_dir, outputs, meta, manifest_data, dumper=self.dumper)
+        else:
+            self.writer.submit(output_dir, outputs, meta, manifest_data)
+
+    def pytest_sessionfinish(self, session):
+        if self._writer is not None:
+            self._writer.close()
 
 
 def pytest_addoption(parser):
@@ -403,6 +406,16 @@ def pytest_addoption(parser):
         default="reftests",
         help="Output directory for reference tests",
     )
+    parser.addoption(
+        "--reftests-writers",
+        type=int,
+        default=0,
+        help=(
+            "Number of processes that write reference tests in the background (default: 0,"
+            " write them synchronously). Off by default: next to the xdist workers of"
+            " `make test` the writers slow the run down, they only help with cores to spare"
+        ),
+    )
 
 
 def pytest_configure(config):
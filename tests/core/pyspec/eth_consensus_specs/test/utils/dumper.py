@@ -1,4 +1,8 @@
+import shutil
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from eth_utils import encode_hex
 from ruamel.yaml import YAML
@@ -104,3 +108,82 @@ class Dumper:
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w") as f:
             yaml_encoder.dump(data, f)
+
+
+def write_test_case(
+    dir: Path,
+    outputs: list[tuple[str, str, Any]],
+    meta: dict,
+    manifest_data: dict,
+    dumper: Dumper | None = None,
+) -> None:
+    """Replace the test case at ``dir`` with its outputs, meta and manifest.
+
+    ``outputs`` holds ``(name, kind, data)`` entries, where ``kind`` selects the
+    ``Dumper.dump_<kind>`` method.
+    """
+    dumper = dumper or _get_process_dumper()
+    if dir.exists():
+        shutil.rmtree(dir)
+    for name, kind, data in outputs:
+        getattr(dumper, f"dump_{kind}")(dir, name, data)
+    dumper.dump_meta(dir, meta)
+    dumper.dump_manifest(dir, manifest_data)
+
+
+_process_dumper: Dumper | None = None
+
+
+def _get_process_dumper() -> Dumper:
+    global _process_dumper
+    if _process_dumper is None:
+        _process_dumper = Dumper()
+    return _process_dumper
+
+
+class DumpWriter:
+    """Writes test cases with ``write_test_case``, in a pool of worker processes.
+
+    YAML emission is pure Python, so the test cases are handed to processes rather
+    than threads. At most ``max_pending`` test cases are queued: submitting another
+    one waits for the oldest, and raises a ``RuntimeError`` naming its directory if it
+    failed. With no workers, test cases are written synchronously.
+    """
+
+    def __init__(self, workers: int, max_pending: int | None = None):
+        self.executor: Executor | None = ProcessPoolExecutor(workers) if workers > 0 else None
+        self.max_pending = max_pending or 4 * workers
+        self.pending: deque[tuple[Path, Future]] = deque()
+
+    def submit(self, dir: Path, outputs: list, meta: dict, manifest_data: dict) -> None:
+        if self.executor is None:
+            write_test_case(dir, outputs, meta, manifest_data)
+            return
+        while len(self.pending) >= self.max_pending:
+            self._wait(*self.pending.popleft())
+        # A later write to the same test case must replace the earlier one
+        for pending_dir, future in self.pending:
+            if pending_dir == dir:
+                self._wait(pending_dir, future)
+        future = self.executor.submit(write_test_case, dir, outputs, meta, manifest_data)
+        self.pending.append((dir, future))
+
+    @staticmethod
+    def _wait(dir: Path, future: Future) -> None:
+        # The error surfaces while another test case is submitted, so name the failed one
+        try:
+            future.result()
+        except Exception as e:
+            raise RuntimeError(f"writing {dir} failed") from e
+
+    def flush(self) -> None:
+        """Wait for every queued test case, raising on the first error."""
+        while self.pending:
+            self._wait(*self.pending.popleft())
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
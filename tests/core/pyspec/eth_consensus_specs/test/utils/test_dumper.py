@@ -0,0 +1,44 @@
+import pytest
+
+from eth_consensus_specs.test.utils.dumper import DumpWriter
+
+
+def _read_tree(root):
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _write_cases(writer, root):
+    for i in range(8):
+        writer.submit(
+            root / f"case_{i}",
+            [("pre", "ssz", bytes([i]) * 64), ("steps", "data", [{"tick": i}, {"valid": True}])],
+            {"bls_setting": 1},
+            {"case": f"case_{i}"},
+        )
+    # Rewrites case_0, which must replace the earlier output
+    writer.submit(root / "case_0", [("post", "ssz", b"\x01" * 32)], {}, {"case": "case_0"})
+    writer.close()
+
+
+def test_dump_writer_matches_synchronous_output(tmp_path):
+    _write_cases(DumpWriter(0), tmp_path / "sync")
+    _write_cases(DumpWriter(2, max_pending=3), tmp_path / "pool")
+
+    expected = _read_tree(tmp_path / "sync")
+    assert "case_0/pre.ssz_snappy" not in expected
+    assert "case_0/post.ssz_snappy" in expected
+    assert "case_1/meta.yaml" in expected
+    assert _read_tree(tmp_path / "pool") == expected
+
+
+def test_dump_writer_names_failed_case(tmp_path):
+    writer = DumpWriter(2, max_pending=1)
+    writer.submit(tmp_path / "case_0", [("pre", "unknown", b"")], {}, {})
+    # The failure of case_0 surfaces when case_1 is submitted
+    with pytest.raises(RuntimeError, match="case_0 failed"):
+        writer.submit(tmp_path / "case_1", [("pre", "ssz", b"\x01")], {}, {})
+    writer.close()
@@ -2,12 +2,24 @@
 BLS12-381 utilities backed by py_arkworks_bls12381.
 """
 
+import operator
+import secrets
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, reduce
+
 from py_arkworks_bls12381 import G1Point as G1, G2Point as G2, GT, Scalar
 
+from eth_consensus_specs.utils.threads import map_on_threads
+
 ################################################################################
 # Constants
 ################################################################################
 
+# Bounds of the caches of validated pubkey points and of hashed messages, see `cache_info`
+PUBKEY_CACHE_SIZE = 2**16
+MESSAGE_CACHE_SIZE = 2**12
+
 STUB_SIGNATURE = b"\x11" * 96
 STUB_PUBKEY = b"\x22" * 48
 G2_POINT_AT_INFINITY = b"\xc0" + b"\x00" * 95
@@ -16,6 +28,10 @@ G2_POINT_AT_INFINITY = b"\xc0" + b"\x00" * 95
 # Decorators
 ################################################################################
 
+# Threads to validate and add pubkey points on in `AggregatePKs` (and the aggregate
+# verifications), 1 to do it on the calling thread. Each thread takes a contiguous chunk.
+aggregate_pubkeys_threads = 1
+
 # Flag to make BLS active or not. Used for testing, do not ignore BLS in
 # production unless you know what you are doing.
 bls_active = True
@@ -44,11 +60,17 @@ def only_with_bls(alt_return=None):
 ################################################################################
 
 
+@lru_cache(maxsize=MESSAGE_CACHE_SIZE)
+def _hash_bytes_to_G2(message):
+    return G2.hash_to_curve(message, b"BLS_SIG_BLS12381G2_XMD:SHA-256_SSWU_RO_POP_")
+
+
 def _hash_to_G2(message):
     """
-    Hash `message` to a point in G2 using the BLS signature ciphersuite.
+    Hash `message` to a point in G2 using the BLS signature ciphersuite. The attesters of a
+    committee all sign the same message, so the points of recent messages are cached.
     """
-    return G2.hash_to_curve(message, b"BLS_SIG_BLS12381G2_XMD:SHA-256_SSWU_RO_POP_")
+    return _hash_bytes_to_G2(bytes(message))
 
 
 def _pubkey_to_point(pubkey):
@@ -80,16 +102,22 @@ def _sk_to_scalar(SK):
     return Scalar(SK)
 
 
-def _valid_pubkey_point(pubkey):
-    """
-    Return the G1 point for `pubkey` if it passes KeyValidate, else `None`.
-    """
+@lru_cache(maxsize=PUBKEY_CACHE_SIZE)
+def _valid_pubkey_bytes_point(pubkey):
     point = _pubkey_to_point(pubkey)
     if point is None or point == G1.identity() or not point.is_in_subgroup():
         return None
     return point
 
 
+def _valid_pubkey_point(pubkey):
+    """
+    Return the G1 point for `pubkey` if it passes KeyValidate, else `None`. The same pubkeys
+    are verified against over and over, so the points (and failures) are cached.
+    """
+    return _valid_pubkey_bytes_point(bytes(pubkey))
+
+
 def _valid_signature_point(signature):
     """
     Return the G2 point for `signature` if it is a valid subgroup member, else `None`.
@@ -100,17 +128,149 @@ def _valid_signature_point(signature):
     return point
 
 
+def _sum_valid_pubkey_points(pubkeys):
+    """
+    Return the sum of the G1 points of `pubkeys`, or `None` if empty or any is invalid.
+    """
+    points = [_valid_pubkey_point(pubkey) for pubkey in pubkeys]
+    if len(points) == 0 or any(point is None for point in points):
+        return None
+    return reduce(operator.add, points)
+
+
 def _aggregate_pubkey_points(pubkeys):
     """
     Aggregate `pubkeys` into a single G1 point, or `None` if empty or any is invalid.
+    Decompression and subgroup checks go through the pubkey point cache, so only new
+    pubkeys cost more than an addition.
     """
-    aggregate = None
-    for pubkey in pubkeys:
-        point = _valid_pubkey_point(pubkey)
-        if point is None:
-            return None
-        aggregate = point if aggregate is None else aggregate + point
-    return aggregate
+    pubkeys = list(pubkeys)
+    threads = min(aggregate_pubkeys_threads, len(pubkeys))
+    if threads <= 1:
+        return _sum_valid_pubkey_points(pubkeys)
+    size = -(-len(pubkeys) // threads)
+    chunks = [pubkeys[i : i + size] for i in range(0, len(pubkeys), size)]
+    partial_sums = list(map_on_threads(_sum_valid_pubkey_points, chunks, threads))
+    if any(partial_sum is None for partial_sum in partial_sums):
+        return None
+    return reduce(operator.add, partial_sums)
+
+
+def cache_info():
+    """
+    Return the ``functools`` cache statistics of the pubkey point and message point caches.
+    """
+    return {
+        "pubkey_points": _valid_pubkey_bytes_point.cache_info(),
+        "message_points": _hash_bytes_to_G2.cache_info(),
+    }
+
+
+def clear_caches():
+    _valid_pubkey_bytes_point.cache_clear()
+    _hash_bytes_to_G2.cache_clear()
+
+
+################################################################################
+# Batch verification
+################################################################################
+
+# The signature sets deferred by ``batch_verification``, ``None`` when checking each
+# signature right away. Context variables, so each thread (and task) has its own batch.
+_batch = ContextVar("_batch", default=None)
+# Whether the verifications running are asserted, see ``deferred``
+_asserted = ContextVar("_asserted", default=False)
+
+
+def _deferred_batch():
+    """
+    Return the batch to add the current verification to, ``None`` to check it right away.
+    """
+    if not _asserted.get():
+        return None
+    return _batch.get()
+
+
+def _defer(batch, pubkey_points, messages, signature_point):
+    """
+    Add the checked points of a verification to the batch. It passes until the batch is checked.
+    """
+    batch.append((pubkey_points, messages, signature_point))
+    return True
+
+
+def _verify_signature_set(pubkey_points, messages, signature_point):
+    g1_points = [-G1(), *pubkey_points]
+    g2_points = [signature_point, *(_hash_to_G2(message) for message in messages)]
+    return GT.pairing_check(g1_points, g2_points)
+
+
+def _verify_signature_sets(signature_sets):
+    """
+    Check all ``signature_sets`` with one multi-pairing. Each set is weighted by a random
+    64-bit scalar ``r_i``, so that invalid sets can not cancel out:
+    prod_i prod_j e(r_i * PK_ij, H(m_ij)) * e(-G1, sum_i r_i * signature_i) == 1
+    """
+    g1_points = [-G1()]
+    g2_points = []
+    signature_points = []
+    scalars = []
+    for pubkey_points, messages, signature_point in signature_sets:
+        r = Scalar(secrets.randbits(64) | 1)
+        for pubkey_point, message in zip(pubkey_points, messages, strict=True):
+            g1_points.append(pubkey_point * r)
+            g2_points.append(_hash_to_G2(message))
+        signature_points.append(signature_point)
+        scalars.append(r)
+    signature = G2.multiexp_unchecked(signature_points, scalars)
+    return GT.pairing_check(g1_points, [signature, *g2_points])
+
+
+@contextmanager
+def batch_verification():
+    """
+    Defer the pairing checks of the ``deferred`` verifications to the end of the context,
+    where they are checked together with a single randomized multi-pairing, as clients do
+    for the signatures of a block. The encodings, subgroup and pubkey checks still happen
+    right away, and the other verifications are checked as usual.
+
+    If the batch fails, the signatures are checked one at a time to report the first invalid
+    one with an ``AssertionError``. Nested contexts join the outermost batch. For example::
+
+        with bls.batch_verification():
+            spec.state_transition(state, signed_block)
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    signature_sets = []
+    token = _batch.set(signature_sets)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    if len(signature_sets) > 0 and not _verify_signature_sets(signature_sets):
+        for i, signature_set in enumerate(signature_sets):
+            if not _verify_signature_set(*signature_set):
+                raise AssertionError(f"invalid signature {i} of {len(signature_sets)} in batch")
+        raise AssertionError("invalid signature batch")
+
+
+def deferred(fn):
+    """
+    Wrap a verification whose result is asserted, so that its signatures are added to the
+    open ``batch_verification``, if any. A deferred verification returns ``True``, only the
+    batch fails if the signature is invalid.
+    """
+
+    def wrapper(*args, **kw):
+        token = _asserted.set(True)
+        try:
+            return fn(*args, **kw)
+        finally:
+            _asserted.reset(token)
+
+    return wrapper
 
 
 ################################################################################
@@ -126,6 +286,9 @@ def Verify(PK, message, signature):
     signature_point = _valid_signature_point(signature)
     if signature_point is None:
         return False
+    batch = _deferred_batch()
+    if batch is not None:
+        return _defer(batch, [pubkey_point], [message], signature_point)
     message_point = _hash_to_G2(message)
     # e(PK, H(m)) == e(G1, signature)  <=>  e(-G1, signature) * e(PK, H(m)) == 1
     return GT.pairing_check([-G1(), pubkey_point], [signature_point, message_point])
@@ -141,13 +304,15 @@ def AggregateVerify(pubkeys, messages, signature):
     if signature_point is None:
         return False
     g1_points = []
-    g2_points = []
-    for pubkey, message in zip(pubkeys, messages, strict=True):
+    for pubkey in pubkeys:
         pubkey_point = _valid_pubkey_point(pubkey)
         if pubkey_point is None:
             return False
         g1_points.append(pubkey_point)
-        g2_points.append(_hash_to_G2(message))
+    batch = _deferred_batch()
+    if batch is not None:
+        return _defer(batch, g1_points, messages, signature_point)
+    g2_points = [_hash_to_G2(message) for message in messages]
     g1_points.append(-G1())
     g2_points.append(signature_point)
     # prod_i e(PK_i, H(m_i)) == e(G1, signature) <=> (prod_i e(PK_i, H(m_i))) * e(-G1, signature) = 1
@@ -162,6 +327,9 @@ def FastAggregateVerify(pubkeys, message, signature):
     signature_point = _valid_signature_point(signature)
     if signature_point is None:
         return False
+    batch = _deferred_batch()
+    if batch is not None:
+        return _defer(batch, [aggregate], [message], signature_point)
     message_point = _hash_to_G2(message)
     # e(G1, signature) = e(aggregate, H(m)) <=> e(-G1, signature) * e(aggregate, H(m)) = 1
     return GT.pairing_check([-G1(), aggregate], [signature_point, message_point])
@@ -0,0 +1,78 @@
+"""
+Persistent, checksummed cache files for data that is slow to compute but never changes.
+"""
+
+import mmap
+import os
+import tempfile
+from collections.abc import Callable
+from hashlib import sha256
+from pathlib import Path
+
+MAGIC = b"ECSCACHE"
+HEADER_SIZE = len(MAGIC) + 32
+
+
+def cache_dir() -> Path:
+    """
+    Return the directory that holds the cache files: ``$ETH_CONSENSUS_SPECS_CACHE_DIR``,
+    or ``eth-consensus-specs`` under ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+    """
+    if "ETH_CONSENSUS_SPECS_CACHE_DIR" in os.environ:
+        return Path(os.environ["ETH_CONSENSUS_SPECS_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "eth-consensus-specs"
+
+
+def _read(path: Path) -> memoryview | None:
+    """
+    Map the cache file at ``path`` and return its payload, or ``None`` if it is missing or
+    does not match its checksum.
+    """
+    try:
+        with path.open("rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    view = memoryview(data)
+    if (
+        view[: len(MAGIC)] != MAGIC
+        or sha256(view[HEADER_SIZE:]).digest() != view[len(MAGIC) : HEADER_SIZE]
+    ):
+        return None
+    return view[HEADER_SIZE:]
+
+
+def _write(path: Path, payload: bytes) -> None:
+    """
+    Write ``payload`` to the cache file at ``path``. The file is replaced atomically,
+    so concurrent writers (e.g. pytest-xdist workers) never expose a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + sha256(payload).digest() + payload)
+        Path(tmp_name).replace(path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_cached(name: str, build: Callable[[], bytes]) -> memoryview:
+    """
+    Return the payload of the cache file ``name``, memory-mapped read-only. The file is
+    (re)built with ``build`` if it is missing or fails its checksum. If the cache directory
+    is not writable, the freshly built payload is returned from memory.
+    """
+    path = cache_dir() / name
+    payload = _read(path)
+    if payload is not None:
+        return payload
+    data = build()
+    try:
+        _write(path, data)
+    except OSError:
+        return memoryview(data)
+    payload = _read(path)
+    return payload if payload is not None else memoryview(data)
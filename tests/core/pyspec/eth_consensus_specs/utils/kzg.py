@@ -4,11 +4,20 @@ KZG utilities backed by the c-kzg-4844 library.
 
 import json
 import tempfile
+from hashlib import sha256
 from pathlib import Path
 
 import ckzg
 
+from eth_consensus_specs.utils.file_cache import cache_dir
+from eth_consensus_specs.utils.threads import map_on_threads
+
 trusted_setup = None
+trusted_setup_precompute = None
+
+# The number of threads `compute_matrix` and `recover_matrix` compute rows on. ckzg
+# releases the GIL while it extends or recovers a blob, so rows are computed in parallel.
+matrix_threads = 1
 
 
 def _find_trusted_setup_path() -> Path:
@@ -22,46 +31,84 @@ def _find_trusted_setup_path() -> Path:
     raise FileNotFoundError("could not locate trusted setup")
 
 
+def _convert_trusted_setup(data: dict) -> str:
+    """
+    Convert the trusted setup JSON (with g1_monomial, g1_lagrange, g2_monomial hex
+    arrays) to the text format that ckzg.load_trusted_setup expects.
+    """
+    lines = [str(len(data["g1_lagrange"])), str(len(data["g2_monomial"]))]
+    for key in ("g1_lagrange", "g2_monomial", "g1_monomial"):
+        lines.extend(point[2:] for point in data[key])
+    return "\n".join(lines) + "\n"
+
+
+def _converted_trusted_setup_path() -> Path:
+    """
+    Return the path of the trusted setup in ckzg's text format, converting it once. The
+    converted file is named after the content hash of the JSON and stored next to it, or
+    in the user cache directory if the presets are not writable.
+    """
+    json_path = _find_trusted_setup_path()
+    raw = json_path.read_bytes()
+    name = f"{json_path.stem}.{sha256(raw).hexdigest()[:16]}.txt"
+    for directory in (json_path.parent, cache_dir()):
+        path = directory / name
+        if path.exists():
+            return path
+    text = _convert_trusted_setup(json.loads(raw))
+    for directory in (json_path.parent, cache_dir()):
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            # Written atomically, so concurrent writers never expose a partial file
+            with tempfile.NamedTemporaryFile(
+                mode="w", dir=directory, prefix=f".{name}.", delete=False
+            ) as tf:
+                tf.write(text)
+            Path(tf.name).replace(directory / name)
+            return directory / name
+        except OSError:
+            continue
+    raise OSError("could not write the converted trusted setup")
+
+
 def load_trusted_setup(precompute: int = 0):
     """
-    Load and cache the trusted setup. The JSON file (with g1_monomial,
-    g1_lagrange, g2_monomial hex arrays) is converted to the text format that
-    ckzg.load_trusted_setup expects.
+    Load and cache the trusted setup. ``precompute`` trades memory for faster cell
+    proof computation (0 to 15, see ckzg.load_trusted_setup). The setup is reloaded
+    if it was loaded with a different value.
     """
-    global trusted_setup
-    if trusted_setup is not None:
+    global trusted_setup, trusted_setup_precompute
+    if trusted_setup is not None and trusted_setup_precompute == precompute:
         return trusted_setup
 
-    with _find_trusted_setup_path().open() as f:
-        data = json.load(f)
+    trusted_setup = ckzg.load_trusted_setup(str(_converted_trusted_setup_path()), precompute)
+    trusted_setup_precompute = precompute
+    return trusted_setup
+
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt") as tf:
-        tf.write(f"{len(data['g1_lagrange'])}\n")
-        tf.write(f"{len(data['g2_monomial'])}\n")
-        for point in data["g1_lagrange"]:
-            tf.write(point[2:] + "\n")
-        for point in data["g2_monomial"]:
-            tf.write(point[2:] + "\n")
-        for point in data["g1_monomial"]:
-            tf.write(point[2:] + "\n")
-        txt_path = tf.name
-        tf.flush()
+# ckzg takes any ``bytes``, so the SSZ byte vector views (``Blob``, ``Cell``, ``KZGProof``...),
+# which subclass ``bytes``, are passed as they are. Only other buffers are copied.
 
-        trusted_setup = ckzg.load_trusted_setup(txt_path, precompute)
 
-    return trusted_setup
+def _bytes(value):
+    return value if isinstance(value, bytes) else bytes(value)
+
+
+def _packed(items):
+    # One copy of each item into the buffer, none if the items are one buffer already
+    return items if isinstance(items, bytes) else b"".join(items)
 
 
 def blob_to_kzg_commitment(blob):
     try:
-        return ckzg.blob_to_kzg_commitment(bytes(blob), trusted_setup)
+        return ckzg.blob_to_kzg_commitment(_bytes(blob), trusted_setup)
     except Exception as e:
         raise AssertionError(str(e)) from e
 
 
 def compute_blob_kzg_proof(blob, commitment_bytes):
     try:
-        return ckzg.compute_blob_kzg_proof(bytes(blob), bytes(commitment_bytes), trusted_setup)
+        return ckzg.compute_blob_kzg_proof(_bytes(blob), _bytes(commitment_bytes), trusted_setup)
     except Exception as e:
         raise AssertionError(str(e)) from e
 
@@ -69,9 +116,9 @@ def compute_blob_kzg_proof(blob, commitment_bytes):
 def verify_blob_kzg_proof(blob, commitment_bytes, proof_bytes):
     try:
         return ckzg.verify_blob_kzg_proof(
-            bytes(blob),
-            bytes(commitment_bytes),
-            bytes(proof_bytes),
+            _bytes(blob),
+            _bytes(commitment_bytes),
+            _bytes(proof_bytes),
             trusted_setup,
         )
     except Exception as e:
@@ -81,9 +128,9 @@ def verify_blob_kzg_proof(blob, commitment_bytes, proof_bytes):
 def verify_blob_kzg_proof_batch(blobs, commitments_bytes, proofs_bytes):
     try:
         return ckzg.verify_blob_kzg_proof_batch(
-            b"".join(bytes(blob) for blob in blobs),
-            b"".join(bytes(commitment) for commitment in commitments_bytes),
-            b"".join(bytes(proof) for proof in proofs_bytes),
+            _packed(blobs),
+            _packed(commitments_bytes),
+            _packed(proofs_bytes),
             trusted_setup,
         )
     except Exception as e:
@@ -92,37 +139,156 @@ def verify_blob_kzg_proof_batch(blobs, commitments_bytes, proofs_bytes):
 
 def compute_cells(blob):
     try:
-        return ckzg.compute_cells(bytes(blob), trusted_setup)
+        return ckzg.compute_cells(_bytes(blob), trusted_setup)
     except Exception as e:
         raise AssertionError(str(e)) from e
 
 
 def compute_cells_and_kzg_proofs(blob):
     try:
-        return ckzg.compute_cells_and_kzg_proofs(bytes(blob), trusted_setup)
+        return ckzg.compute_cells_and_kzg_proofs(_bytes(blob), trusted_setup)
     except Exception as e:
         raise AssertionError(str(e)) from e
 
 
+class Matrix:
+    """
+    The cells and proofs of extended blobs, as two row-major buffers: row ``i`` holds the
+    ``cells_per_row`` cells, and proofs, of the ``i``-th blob. The sizes are those of the
+    specification, e.g. ``CELLS_PER_EXT_BLOB``.
+    """
+
+    __slots__ = (
+        "bytes_per_cell",
+        "bytes_per_proof",
+        "cells",
+        "cells_per_row",
+        "proofs",
+        "row_count",
+    )
+
+    def __init__(
+        self,
+        cells: bytes,
+        proofs: bytes,
+        cells_per_row: int,
+        bytes_per_cell: int,
+        bytes_per_proof: int,
+    ):
+        self.row_count = len(cells) // (cells_per_row * bytes_per_cell)
+        assert len(cells) == self.row_count * cells_per_row * bytes_per_cell
+        assert len(proofs) == self.row_count * cells_per_row * bytes_per_proof
+        self.cells = cells
+        self.proofs = proofs
+        self.cells_per_row = cells_per_row
+        self.bytes_per_cell = bytes_per_cell
+        self.bytes_per_proof = bytes_per_proof
+
+    def cell(self, row: int, column: int) -> bytes:
+        start = (row * self.cells_per_row + column) * self.bytes_per_cell
+        return self.cells[start : start + self.bytes_per_cell]
+
+    def proof(self, row: int, column: int) -> bytes:
+        start = (row * self.cells_per_row + column) * self.bytes_per_proof
+        return self.proofs[start : start + self.bytes_per_proof]
+
+    def row(self, row: int) -> tuple[list[bytes], list[bytes]]:
+        """
+        Return the cells and proofs of the ``row``-th blob, as ``compute_cells_and_kzg_proofs``.
+        """
+        return (
+            [self.cell(row, column) for column in range(self.cells_per_row)],
+            [self.proof(row, column) for column in range(self.cells_per_row)],
+        )
+
+    def rows(self) -> list[tuple[list[bytes], list[bytes]]]:
+        """
+        Return the cells and proofs of every blob, e.g. the ``cells_and_kzg_proofs`` of
+        ``get_data_column_sidecars``.
+        """
+        return [self.row(row) for row in range(self.row_count)]
+
+    def column(self, column: int) -> tuple[list[bytes], list[bytes]]:
+        """
+        Return the cells and proofs of the ``column``-th column, one of each per blob.
+        """
+        return (
+            [self.cell(row, column) for row in range(self.row_count)],
+            [self.proof(row, column) for row in range(self.row_count)],
+        )
+
+
+def _map_rows(fn, rows):
+    """
+    Return an iterator over ``fn`` of each of ``rows``, in order, computed on
+    ``matrix_threads`` threads. All rows are submitted at once, and each result is
+    yielded as soon as it and the ones before it are done.
+    """
+    return map_on_threads(fn, rows, matrix_threads)
+
+
+def compute_matrix(blobs, cells_per_ext_blob, bytes_per_cell, bytes_per_proof):
+    """
+    Return the ``Matrix`` of ``blobs``, extending them on ``matrix_threads`` threads.
+    """
+    rows = list(_map_rows(compute_cells_and_kzg_proofs, blobs))
+    return Matrix(
+        b"".join(b"".join(cells) for cells, _ in rows),
+        b"".join(b"".join(proofs) for _, proofs in rows),
+        cells_per_ext_blob,
+        bytes_per_cell,
+        bytes_per_proof,
+    )
+
+
 def verify_cell_kzg_proof_batch(commitments_bytes, cell_indices, cells, proofs_bytes):
     try:
         return ckzg.verify_cell_kzg_proof_batch(
-            [bytes(commitment) for commitment in commitments_bytes],
+            [_bytes(commitment) for commitment in commitments_bytes],
             [int(cell_index) for cell_index in cell_indices],
-            [bytes(cell) for cell in cells],
-            [bytes(proof) for proof in proofs_bytes],
+            [_bytes(cell) for cell in cells],
+            [_bytes(proof) for proof in proofs_bytes],
             trusted_setup,
         )
     except Exception as e:
         raise AssertionError(str(e)) from e
 
 
+def verify_cell_kzg_proof_columns(columns):
+    """
+    Verify the cells of several columns, e.g. of data column sidecars, against their
+    commitments and proofs, all in one ``verify_cell_kzg_proof_batch`` call. ``columns`` are
+    tuples of the commitments, the column (cell) index, the cells and the proofs of a column,
+    one of each per blob. The random linear combination of the batch covers every cell, so the
+    result is ``True`` if and only if each column would verify on its own.
+    """
+    commitments_bytes, cell_indices, cells, proofs_bytes = [], [], [], []
+    for column_commitments, column_index, column_cells, column_proofs in columns:
+        # Checked per column, so that cells can not be matched with another column's blobs
+        if not len(column_commitments) == len(column_cells) == len(column_proofs):
+            raise AssertionError("column lengths do not match")
+        commitments_bytes.extend(column_commitments)
+        cell_indices.extend([column_index] * len(column_cells))
+        cells.extend(column_cells)
+        proofs_bytes.extend(column_proofs)
+    return verify_cell_kzg_proof_batch(commitments_bytes, cell_indices, cells, proofs_bytes)
+
+
 def recover_cells_and_kzg_proofs(cell_indices, cells):
     try:
         return ckzg.recover_cells_and_kzg_proofs(
             [int(cell_index) for cell_index in cell_indices],
-            [bytes(cell) for cell in cells],
+            [_bytes(cell) for cell in cells],
             trusted_setup,
         )
     except Exception as e:
         raise AssertionError(str(e)) from e
+
+
+def recover_matrix(partial_rows):
+    """
+    Return an iterator over the recovered cells and proofs of each of ``partial_rows``, pairs
+    of the cell indices and cells available for a blob. The rows are recovered on
+    ``matrix_threads`` threads, and each is yielded as soon as it is recovered, in order.
+    """
+    return _map_rows(lambda row: recover_cells_and_kzg_proofs(*row), partial_rows)
@@ -0,0 +1,75 @@
+"""
+Array-based implementation of the swap-or-not shuffle.
+"""
+
+from collections.abc import Sequence
+from hashlib import sha256
+
+import numpy as np
+from remerkleable.basic import uint64
+
+
+class ShuffledIndices(Sequence[uint64]):
+    """
+    Read-only ``Sequence[uint64]`` over a permutation array. Elements are boxed
+    on access, so a cached mainnet-size permutation stays a flat array.
+    """
+
+    def __init__(self, indices: np.ndarray) -> None:
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __sizeof__(self) -> int:
+        return super().__sizeof__() + self._indices.nbytes
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [uint64(i) for i in self._indices[index].tolist()]
+        return uint64(int(self._indices[index]))
+
+
+def _round_bits(seed: bytes, round_bytes: bytes, index_count: int) -> np.ndarray:
+    """
+    Return the source bits of one round as a boolean array indexed by position.
+    """
+    base = sha256(seed + round_bytes)
+    sources = []
+    for position_bucket in range((index_count + 255) // 256):
+        h = base.copy()
+        h.update(position_bucket.to_bytes(4, "little"))
+        sources.append(h.digest())
+    bits = np.unpackbits(np.frombuffer(b"".join(sources), dtype=np.uint8), bitorder="little")
+    return bits.view(np.bool_)
+
+
+def compute_shuffled_permutation(index_count: int, seed: bytes, round_count: int) -> np.ndarray:
+    """
+    Return the full shuffled permutation corresponding to ``seed`` (and ``index_count``).
+
+    Equivalent to the spec ``compute_shuffled_permutation``. Each round of the
+    swap-or-not network is an involution, so instead of moving every index through
+    the rounds one at a time, the rounds are applied in reverse order to the whole
+    list. Within a round, position ``i`` is paired with ``(pivot - i) % index_count``,
+    which makes both the mirrored list and the swap decisions a couple of reversed
+    slices, and each position bucket is hashed once per round.
+    """
+    indices = np.arange(index_count, dtype=np.uint64)
+    swap = np.empty(index_count, dtype=np.bool_)
+    for current_round in reversed(range(round_count)):
+        round_bytes = current_round.to_bytes(1, "little")
+        pivot = int.from_bytes(sha256(seed + round_bytes).digest()[0:8], "little") % index_count
+        bits = _round_bits(seed, round_bytes, index_count)
+        # The pair (i, flip) is decided by the bit at max(i, flip)
+        low_mirrored = (pivot + 1) // 2
+        high_mirrored = (pivot + index_count + 1) // 2
+        swap[:low_mirrored] = bits[pivot : pivot - low_mirrored : -1]
+        swap[low_mirrored : pivot + 1] = bits[low_mirrored : pivot + 1]
+        swap[pivot + 1 : high_mirrored] = bits[
+            index_count - 1 : pivot + index_count - high_mirrored : -1
+        ]
+        swap[high_mirrored:] = bits[high_mirrored:index_count]
+        flipped = np.concatenate((indices[pivot::-1], indices[:pivot:-1]))
+        indices = np.where(swap, flipped, indices)
+    return indices
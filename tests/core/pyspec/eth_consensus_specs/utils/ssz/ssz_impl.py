@@ -1,8 +1,16 @@
+import sys
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from hashlib import sha256
 from typing import TypeVar
 
-from remerkleable.basic import uint as Uint
+import numpy as np
+from remerkleable.basic import boolean, uint as Uint, uint256
 from remerkleable.byte_arrays import Bytes32
+from remerkleable.complex import Container, List, Vector
 from remerkleable.core import Type, View
+from remerkleable.progressive import ProgressiveList
+from remerkleable.tree import Node, PairNode, Root, RootNode, to_gindex, zero_node
 
 
 def ssz_serialize(obj: View) -> bytes:
@@ -22,7 +30,68 @@ def deserialize(typ: Type[View], data: bytes) -> View:
 
 
 def hash_tree_root(obj: View) -> Bytes32:
-    return Bytes32(obj.get_backing().merkle_root())
+    return Bytes32(_merkleize(obj.get_backing()))
+
+
+def hash_pairs(pairs: list[bytes]) -> list[bytes]:
+    """
+    Return the SHA-256 digest of each 64-byte pair of child roots, for one tree level.
+    """
+    return [sha256(pair).digest() for pair in pairs]
+
+
+def merkleize_levels(node: Node) -> Root:
+    """
+    Return the root of ``node``, hashing the pair nodes without a cached root one tree level
+    at a time, deepest first, with one ``hash_pairs`` call per level. The roots are cached on
+    the nodes, as ``merkle_root`` does.
+    """
+    levels = []
+    level = [node] if type(node) is PairNode and node._root is None else []
+    while level:
+        levels.append(level)
+        # Subtrees shared within a level are hashed once
+        level = list(
+            dict.fromkeys(
+                [
+                    child
+                    for parent in level
+                    for child in (parent.left, parent.right)
+                    if type(child) is PairNode and child._root is None
+                ]
+            )
+        )
+    # Children are one level deeper than their parents, so they are hashed first
+    for level in reversed(levels):
+        roots = hash_pairs([pair.left.merkle_root() + pair.right.merkle_root() for pair in level])
+        for pair, root in zip(level, roots, strict=True):
+            pair._root = root
+    return node.merkle_root()
+
+
+# The merkleization of ``hash_tree_root``, by name, see ``set_merkleization_backend``
+MERKLEIZATION_BACKENDS: dict[str, Callable[[Node], Root]] = {
+    "recursive": lambda node: node.merkle_root(),
+    "levels": merkleize_levels,
+}
+
+_merkleize = MERKLEIZATION_BACKENDS["recursive"]
+
+
+def set_merkleization_backend(name: str) -> None:
+    """
+    Select the merkleization of ``hash_tree_root``: ``recursive``, remerkleable's
+    ``merkle_root``, which hashes one pair at a time (the default), or ``levels``, see
+    ``merkleize_levels``. ``hash_pairs`` is the function to replace with a native batched
+    SHA-256. Both give the same roots. ``View.hash_tree_root`` always uses ``merkle_root``.
+    """
+    global _merkleize
+    if name not in MERKLEIZATION_BACKENDS:
+        raise ValueError(
+            f"unknown merkleization backend {name!r}, expected one of"
+            f" {sorted(MERKLEIZATION_BACKENDS)}"
+        )
+    _merkleize = MERKLEIZATION_BACKENDS[name]
 
 
 def uint_to_bytes(n: Uint) -> bytes:
@@ -35,3 +104,286 @@ V = TypeVar("V", bound=View)
 # Helper method for typing copies, and avoiding a example_input.copy() method call, instead of copy(example_input)
 def copy(obj: V) -> V:
     return obj.copy()
+
+
+def fingerprint(obj: View) -> Node:
+    """
+    Return a cache key for the current contents of ``obj``, without merkleizing it.
+
+    The backing tree is immutable and hashes by identity, so an unchanged (or copied) view
+    keeps its key, while any write gives it a new one. Holding the key keeps the tree alive,
+    so a key can not be reused for other contents. Equal contents built separately get
+    different keys, which only costs a cache miss.
+    """
+    return obj.get_backing()
+
+
+# Packed lists can be read and rebuilt as numpy arrays, one pass over the tree instead of
+# one tree navigation (and, for writes, one path of new nodes) per element.
+
+Sequential = List | ProgressiveList | Vector
+
+
+def _basic_dtype(typ: Type[View]) -> np.dtype:
+    if issubclass(typ, boolean):
+        return np.dtype(np.bool_)
+    if issubclass(typ, Uint) and typ.type_byte_length() in (1, 2, 4, 8):
+        return np.dtype(f"<u{typ.type_byte_length()}")
+    raise TypeError(f"{typ.__name__} has no numpy dtype")
+
+
+def _subtrees(typ: Type[Sequential], backing: Node, count: int) -> list[tuple[Node, int, int]]:
+    """
+    Return the subtrees of ``backing`` that hold the first ``count`` chunks of a ``typ``,
+    as ``(node, depth, chunks)``. Progressive lists hold them in subtrees of growing depth.
+    """
+    if issubclass(typ, Vector):
+        return [(backing, typ.tree_depth(), count)]
+    if issubclass(typ, List):
+        return [(backing.get_left(), typ.contents_depth(), count)]
+    subtrees = []
+    node, depth = backing.get_left(), 0
+    while count > 0:
+        width = min(count, 1 << depth)
+        if node.is_leaf():
+            subtrees.append((zero_node(depth), depth, width))
+        else:
+            subtrees.append((node.get_left(), depth, width))
+            node = node.get_right()
+        count -= width
+        depth += 2
+    return subtrees
+
+
+def _bottom(node: Node, depth: int, count: int) -> list[Node]:
+    """
+    Return the first ``count`` bottom nodes of the subtree ``node`` of ``depth``. Zero
+    subtrees are leaves of ``zero_node(level)``, which expand to two ``zero_node(level - 1)``.
+    """
+    nodes = [node]
+    for level in range(depth - 1, -1, -1):
+        width = -(-count // (1 << level))
+        children: list[Node] = []
+        for parent in nodes[: -(-width // 2)]:
+            if parent.is_leaf():
+                children += [zero_node(level), zero_node(level)]
+            else:
+                children += [parent.get_left(), parent.get_right()]
+        nodes = children[:width]
+    return nodes
+
+
+def _bottom_nodes(obj: Sequential, count: int) -> list[Node]:
+    return [
+        node
+        for subtree, depth, width in _subtrees(type(obj), obj.get_backing(), count)
+        for node in _bottom(subtree, depth, width)
+    ]
+
+
+def _patch(
+    node: Node, depth: int, indices: list[int], start: int, make: Callable[[Node, int], Node]
+) -> Node:
+    """
+    Return the subtree ``node`` of ``depth``, whose first bottom node is at ``start``, with the
+    bottom nodes at the sorted ``indices`` replaced by ``make(old_node, index)``. Only the
+    paths to the replaced nodes are rebuilt.
+    """
+    if not indices:
+        return node
+    if depth == 0:
+        return make(node, start)
+    if node.is_leaf():
+        left, right = zero_node(depth - 1), zero_node(depth - 1)
+    else:
+        left, right = node.get_left(), node.get_right()
+    pivot = start + (1 << (depth - 1))
+    split = bisect_left(indices, pivot)
+    return PairNode(
+        _patch(left, depth - 1, indices[:split], start, make),
+        _patch(right, depth - 1, indices[split:], pivot, make),
+    )
+
+
+def _rebuild(
+    base: Sequential,
+    count: int,
+    bottom_count: int,
+    indices: list[int],
+    make: Callable[[Node, int], Node],
+) -> View:
+    """
+    Return a view of the type of ``base`` with ``count`` elements in ``bottom_count`` bottom
+    nodes, and the bottom nodes at the sorted ``indices`` replaced by ``make(old_node, index)``.
+    Everything else is shared with ``base``.
+    """
+    typ = type(base)
+    backing = base.get_backing()
+    subtrees = []
+    start = 0
+    for node, depth, _ in _subtrees(typ, backing, bottom_count):
+        end = start + (1 << depth)
+        subtree_indices = indices[bisect_left(indices, start) : bisect_left(indices, end)]
+        subtrees.append(_patch(node, depth, subtree_indices, start, make))
+        start = end
+
+    if issubclass(typ, Vector):
+        return typ.view_from_backing(subtrees[0])
+    if issubclass(typ, List):
+        contents = subtrees[0]
+    else:
+        # The chain of (subtree, rest) pairs, reused from ``base`` where it is unchanged
+        chain = []
+        node = backing.get_left()
+        while len(chain) < len(subtrees) and not node.is_leaf():
+            chain.append(node)
+            node = node.get_right()
+        contents = node if len(chain) == len(subtrees) and node.is_leaf() else zero_node(0)
+        for i in reversed(range(len(subtrees))):
+            if (
+                i < len(chain)
+                and chain[i].get_left() is subtrees[i]
+                and chain[i].get_right() is contents
+            ):
+                contents = chain[i]
+            else:
+                contents = PairNode(subtrees[i], contents)
+    length = backing.get_right() if len(base) == count else uint256(count).get_backing()
+    if contents is backing.get_left() and length is backing.get_right():
+        return base.copy()
+    return typ.view_from_backing(PairNode(contents, length))
+
+
+def _field_gindex(element_cls: Type[Container], name: str) -> int:
+    return to_gindex(list(element_cls.fields()).index(name), element_cls.tree_depth())
+
+
+def _path(gindex: int) -> list[bool]:
+    # The directions from the root to ``gindex``, ``True`` for right
+    return [bit == "1" for bit in bin(gindex)[3:]]
+
+
+def to_array(obj: Sequential) -> np.ndarray:
+    """
+    Return the elements of the list or vector of basic values ``obj`` as a read-only array.
+    """
+    dtype = _basic_dtype(obj.element_cls())
+    count = len(obj)
+    chunks = _bottom_nodes(obj, -(-count * dtype.itemsize // 32))
+    return np.frombuffer(b"".join(chunk.root for chunk in chunks), dtype, count)
+
+
+def field_array(obj: Sequential, name: str) -> np.ndarray:
+    """
+    Return the basic field ``name`` of every container in ``obj`` as a read-only array.
+    """
+    element_cls = obj.element_cls()
+    dtype = _basic_dtype(element_cls.fields()[name])
+    # Walking the path is cheaper than a generic ``Node.getter`` per element
+    path = _path(_field_gindex(element_cls, name))
+    leaves = []
+    for node in _bottom_nodes(obj, len(obj)):
+        for right in path:
+            node = node.get_right() if right else node.get_left()
+        leaves.append(node.root[: dtype.itemsize])
+    return np.frombuffer(b"".join(leaves), dtype)
+
+
+def from_array(typ: Type[Sequential], array: np.ndarray, base: Sequential | None = None) -> View:
+    """
+    Return a ``typ`` view of the basic values in ``array``. Only the chunks that differ from
+    ``base`` (e.g. the view the values were read from) get new nodes, the rest of the tree
+    is shared with it, with its cached roots.
+    """
+    count = len(array)
+    if issubclass(typ, List) and count > typ.limit():
+        raise ValueError(f"{count} elements exceed the limit of {typ.type_repr()}")
+    if issubclass(typ, Vector) and count != typ.vector_length():
+        raise ValueError(f"{typ.type_repr()} needs {typ.vector_length()} elements, not {count}")
+    if base is None:
+        base = typ.view_from_backing(typ.default_node())
+    dtype = _basic_dtype(typ.element_cls())
+    chunk_count = -(-count * dtype.itemsize // 32)
+    # Chunks past the new length are compared too, a shorter list zeroes them
+    total = max(chunk_count, -(-len(base) * dtype.itemsize // 32))
+    data = np.zeros(total * 32, np.uint8)
+    data[: count * dtype.itemsize] = np.frombuffer(
+        np.ascontiguousarray(array, dtype=dtype).tobytes(), np.uint8
+    )
+    chunks = data.reshape(-1, 32)
+    old = b"".join(node.root for node in _bottom_nodes(base, total))
+    changed = (np.frombuffer(old, np.uint8).reshape(-1, 32) != chunks).any(axis=1)
+    # New chunks are written even if zero: the paths to them must be navigable for later writes
+    changed[-(-len(base) * dtype.itemsize // 32) : chunk_count] = True
+    return _rebuild(
+        base,
+        count,
+        chunk_count,
+        np.flatnonzero(changed).tolist(),
+        lambda node, i: RootNode(Root(chunks[i].tobytes())),
+    )
+
+
+def from_field_array(obj: Sequential, name: str, array: np.ndarray) -> View:
+    """
+    Return a copy of ``obj`` with the basic field ``name`` of every container set to the
+    values in ``array``. Only the paths to the changed fields get new nodes.
+    """
+    if len(array) != len(obj):
+        raise ValueError(f"{len(obj)} values needed, not {len(array)}")
+    element_cls = obj.element_cls()
+    dtype = _basic_dtype(element_cls.fields()[name])
+    path = _path(_field_gindex(element_cls, name))
+    values = np.ascontiguousarray(array, dtype=dtype)
+    padding = bytes(32 - dtype.itemsize)
+
+    def set_field(element: Node, i: int) -> Node:
+        parents = []
+        node = element
+        for right in path:
+            parents.append(node)
+            node = node.get_right() if right else node.get_left()
+        node = RootNode(Root(values[i].tobytes() + padding))
+        for parent, right in zip(reversed(parents), reversed(path), strict=True):
+            node = (
+                PairNode(parent.get_left(), node) if right else PairNode(node, parent.get_right())
+            )
+        return node
+
+    changed = np.flatnonzero(field_array(obj, name) != values)
+    return _rebuild(obj, len(obj), len(obj), changed.tolist(), set_field)
+
+
+# Views are backed by immutable merkle trees: a copy wraps the same backing, and a write
+# replaces only the nodes on the path to the changed leaf. The helpers below measure that.
+
+
+def new_nodes(base: View, obj: View) -> Iterator[Node]:
+    """
+    Yield the nodes of the backing tree of ``obj`` that are not shared with ``base``
+    at the same position, e.g. the nodes allocated when ``obj`` was derived from a copy of ``base``.
+    """
+    stack: list[tuple[Node | None, Node]] = [(base.get_backing(), obj.get_backing())]
+    while stack:
+        old, new = stack.pop()
+        if old is new:
+            continue
+        yield new
+        if not new.is_leaf():
+            if old is None or old.is_leaf():
+                stack.append((None, new.get_left()))
+                stack.append((None, new.get_right()))
+            else:
+                stack.append((old.get_left(), new.get_left()))
+                stack.append((old.get_right(), new.get_right()))
+
+
+def new_node_bytes(base: View, obj: View) -> int:
+    """
+    Return the memory, in bytes, of the nodes yielded by ``new_nodes(base, obj)``.
+    Leaf roots are counted with their node, branch roots are cached lazily and are not.
+    """
+    return sum(
+        sys.getsizeof(node) + (sys.getsizeof(node.merkle_root()) if node.is_leaf() else 0)
+        for node in new_nodes(base, obj)
+    )
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eth_consensus_specs.utils import bls
+
+PRIVKEYS = [3, 5, 7]
+PUBKEYS = [bls.SkToPk(privkey) for privkey in PRIVKEYS]
+MESSAGES = [b"\x01" * 32, b"\x02" * 32, b"\x03" * 32]
+
+
+def test_batch_verification_passes_valid_signatures():
+    aggregate = bls.Aggregate([bls.Sign(privkey, MESSAGES[0]) for privkey in PRIVKEYS])
+    with bls.batch_verification():
+        assert bls.deferred(bls.Verify)(PUBKEYS[0], MESSAGES[0], bls.Sign(PRIVKEYS[0], MESSAGES[0]))
+        assert bls.deferred(bls.FastAggregateVerify)(PUBKEYS, MESSAGES[0], aggregate)
+        signatures = [
+            bls.Sign(privkey, message) for privkey, message in zip(PRIVKEYS, MESSAGES, strict=True)
+        ]
+        assert bls.deferred(bls.AggregateVerify)(PUBKEYS, MESSAGES, bls.Aggregate(signatures))
+        assert len(bls._batch.get()) == 3
+    assert bls._batch.get() is None
+
+
+def test_batch_verification_reports_invalid_signature():
+    # Signed over the wrong message: deferred, so it passes until the batch is checked
+    signatures = [bls.Sign(PRIVKEYS[i], MESSAGES[0 if i == 1 else i]) for i in range(3)]
+    batch = bls.batch_verification()
+    batch.__enter__()
+    for pubkey, message, signature in zip(PUBKEYS, MESSAGES, signatures, strict=True):
+        assert bls.deferred(bls.Verify)(pubkey, message, signature)
+    with pytest.raises(AssertionError, match="invalid signature 1 of 3 in batch"):
+        batch.__exit__(None, None, None)
+    assert bls._batch.get() is None
+
+
+def test_batch_verification_checks_encodings_right_away():
+    with bls.batch_verification():
+        verify = bls.deferred(bls.Verify)
+        assert not verify(PUBKEYS[0], MESSAGES[0], bls.G2_POINT_AT_INFINITY[:-1])
+        fast_aggregate_verify = bls.deferred(bls.FastAggregateVerify)
+        assert not fast_aggregate_verify([], MESSAGES[0], bls.Sign(PRIVKEYS[0], MESSAGES[0]))
+        assert bls._batch.get() == []
+
+
+def test_eager_and_nested_verification():
+    signature = bls.Sign(PRIVKEYS[0], MESSAGES[1])
+    with bls.batch_verification():
+        # Only the deferred verifications join the batch
+        assert not bls.Verify(PUBKEYS[0], MESSAGES[0], signature)
+        assert bls.Verify(PUBKEYS[0], MESSAGES[1], signature)
+        # An inner batch joins the outer one
+        with bls.batch_verification():
+            assert bls.deferred(bls.Verify)(PUBKEYS[0], MESSAGES[1], signature)
+        assert len(bls._batch.get()) == 1
+    # Without a batch, deferred verifications are checked right away
+    assert not bls.deferred(bls.Verify)(PUBKEYS[0], MESSAGES[0], signature)
+
+
+def test_batch_verification_per_thread():
+    signature = bls.Sign(PRIVKEYS[0], MESSAGES[1])
+    with bls.batch_verification(), ThreadPoolExecutor(1) as executor:
+        verify = bls.deferred(bls.Verify)
+        assert not executor.submit(verify, PUBKEYS[0], MESSAGES[0], signature).result()
+        assert bls._batch.get() == []
+
+
+def test_pubkey_and_message_caches():
+    bls.clear_caches()
+    signature = bls.Sign(PRIVKEYS[0], MESSAGES[0])
+    assert bls.Verify(PUBKEYS[0], MESSAGES[0], signature)
+    assert bls.Verify(bytearray(PUBKEYS[0]), MESSAGES[0], signature)
+    assert not bls.Verify(PUBKEYS[1], MESSAGES[0], signature)
+    info = bls.cache_info()
+    assert (info["pubkey_points"].hits, info["pubkey_points"].misses) == (1, 2)
+    # Signing hashed the message too
+    assert (info["message_points"].hits, info["message_points"].misses) == (3, 1)
+
+    # Invalid pubkeys are cached as such
+    assert not bls.KeyValidate(bls.STUB_PUBKEY)
+    assert not bls.KeyValidate(bls.STUB_PUBKEY)
+    assert bls.cache_info()["pubkey_points"].currsize == 3
+
+    bls.clear_caches()
+    assert bls.cache_info()["pubkey_points"].currsize == 0
+    assert bls.cache_info()["message_points"].currsize == 0
+
+
+def test_aggregate_pubkeys_on_threads():
+    pubkeys = [bls.SkToPk(privkey) for privkey in range(1, 12)]
+    expected = bls.AggregatePKs(pubkeys)
+    try:
+        for threads in [2, 4, 32]:
+            bls.aggregate_pubkeys_threads = threads
+            assert bls.AggregatePKs(pubkeys) == expected
+        # An invalid pubkey in any chunk fails the aggregate
+        with pytest.raises(AssertionError, match="empty or invalid pubkeys"):
+            bls.AggregatePKs(pubkeys[:-1] + [bls.STUB_PUBKEY])
+    finally:
+        bls.aggregate_pubkeys_threads = 1
+    assert bls._aggregate_pubkey_points([]) is None
@@ -0,0 +1,32 @@
+from eth_consensus_specs.utils.file_cache import HEADER_SIZE, load_cached
+
+
+def test_load_cached_builds_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETH_CONSENSUS_SPECS_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def build():
+        calls.append(None)
+        return b"\x01" * 96
+
+    assert bytes(load_cached("example.bin", build)) == b"\x01" * 96
+    assert bytes(load_cached("example.bin", build)) == b"\x01" * 96
+    assert len(calls) == 1
+
+
+def test_load_cached_rebuilds_corrupt_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETH_CONSENSUS_SPECS_CACHE_DIR", str(tmp_path))
+    load_cached("example.bin", lambda: b"\x01" * 96)
+
+    path = tmp_path / "example.bin"
+    data = bytearray(path.read_bytes())
+    data[HEADER_SIZE] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert bytes(load_cached("example.bin", lambda: b"\x02" * 96)) == b"\x02" * 96
+
+
+def test_load_cached_unwritable_dir(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    monkeypatch.setenv("ETH_CONSENSUS_SPECS_CACHE_DIR", str(blocker / "cache"))
+    assert bytes(load_cached("example.bin", lambda: b"\x03" * 48)) == b"\x03" * 48
@@ -0,0 +1,86 @@
+import json
+import random
+
+import pytest
+
+from eth_consensus_specs.utils import kzg
+
+# The mainnet sizes of the trusted setup: FIELD_ELEMENTS_PER_BLOB, and the cells per extended
+# blob, bytes per cell and bytes per proof of a matrix
+FIELD_ELEMENTS_PER_BLOB = 4096
+MATRIX_SIZES = (128, 2048, 48)
+
+
+def test_converted_trusted_setup_is_reused():
+    path = kzg._converted_trusted_setup_path()
+    assert path.name.startswith("trusted_setup_4096.")
+    mtime = path.stat().st_mtime_ns
+    assert kzg._converted_trusted_setup_path() == path
+    assert path.stat().st_mtime_ns == mtime
+
+    with kzg._find_trusted_setup_path().open() as f:
+        data = json.load(f)
+    lines = path.read_text().splitlines()
+    assert lines[:2] == ["4096", "65"]
+    assert lines[2] == data["g1_lagrange"][0][2:]
+    assert lines[-1] == data["g1_monomial"][-1][2:]
+    assert len(lines) == 2 + 4096 + 65 + 4096
+
+
+def random_blobs(count):
+    rng = random.Random(5566)
+    # Field elements below the modulus: the first of their 32 bytes is zero
+    return [
+        b"".join(b"\x00" + rng.randbytes(31) for _ in range(FIELD_ELEMENTS_PER_BLOB))
+        for _ in range(count)
+    ]
+
+
+def test_compute_matrix():
+    kzg.load_trusted_setup()
+    blobs = random_blobs(3)
+    rows = [kzg.compute_cells_and_kzg_proofs(blob) for blob in blobs]
+    try:
+        for threads in [1, 2, 8]:
+            kzg.matrix_threads = threads
+            matrix = kzg.compute_matrix(blobs, *MATRIX_SIZES)
+            assert matrix.row_count == 3
+            assert matrix.rows() == [(list(cells), list(proofs)) for cells, proofs in rows]
+    finally:
+        kzg.matrix_threads = 1
+    assert matrix.column(5) == ([cells[5] for cells, _ in rows], [proofs[5] for _, proofs in rows])
+    assert kzg.compute_matrix([], *MATRIX_SIZES).rows() == []
+
+
+def test_verify_cell_kzg_proof_columns():
+    kzg.load_trusted_setup()
+    blobs = random_blobs(2)
+    commitments = [kzg.blob_to_kzg_commitment(blob) for blob in blobs]
+    matrix = kzg.compute_matrix(blobs, *MATRIX_SIZES)
+    columns = [(commitments, index, *matrix.column(index)) for index in [0, 5, 127]]
+    assert kzg.verify_cell_kzg_proof_columns(columns)
+    assert kzg.verify_cell_kzg_proof_columns([])
+
+    # The cells of a column verified at the index of another
+    assert not kzg.verify_cell_kzg_proof_columns([columns[0], (commitments, 6, *columns[1][2:])])
+    # A commitment too many in one column and one too few in the next
+    shifted = [(commitments * 2, 0, *columns[0][2:]), (commitments[:1], 5, *columns[1][2:])]
+    with pytest.raises(AssertionError, match="column lengths do not match"):
+        kzg.verify_cell_kzg_proof_columns(shifted)
+
+
+def test_verify_blob_kzg_proof_batch_packed():
+    kzg.load_trusted_setup()
+    blobs = random_blobs(2)
+    commitments = [kzg.blob_to_kzg_commitment(blob) for blob in blobs]
+    proofs = [
+        kzg.compute_blob_kzg_proof(blob, commitment)
+        for blob, commitment in zip(blobs, commitments, strict=True)
+    ]
+    packed = [b"".join(blobs), b"".join(commitments), b"".join(proofs)]
+    assert kzg.verify_blob_kzg_proof_batch(*packed)
+    assert kzg.verify_blob_kzg_proof_batch(blobs, commitments, proofs)
+    assert not kzg.verify_blob_kzg_proof_batch(packed[0], commitments, proofs[::-1])
+    # Byte strings are passed to ckzg without a copy
+    assert kzg._bytes(packed[0]) is packed[0]
+    assert kzg._bytes(bytearray(blobs[0])) == blobs[0]
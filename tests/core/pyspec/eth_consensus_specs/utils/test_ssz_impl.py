@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from remerkleable.basic import boolean, uint8, uint64
+from remerkleable.complex import Container, List, Vector
+from remerkleable.progressive import ProgressiveList
+
+from eth_consensus_specs.utils.ssz.ssz_impl import (
+    copy,
+    field_array,
+    from_array,
+    from_field_array,
+    hash_tree_root,
+    merkleize_levels,
+    new_node_bytes,
+    new_nodes,
+    set_merkleization_backend,
+    to_array,
+)
+
+
+class Example(Container):
+    a: uint64
+    b: uint64
+    values: List[uint64, 1024]
+
+
+def test_copy_shares_backing():
+    obj = Example(a=1, b=2, values=list(range(100)))
+    assert copy(obj).get_backing() is obj.get_backing()
+    assert list(new_nodes(obj, copy(obj))) == []
+    assert new_node_bytes(obj, copy(obj)) == 0
+
+
+def test_new_nodes_after_write():
+    obj = Example(a=1, b=2, values=list(range(100)))
+    modified = copy(obj)
+    modified.a = 3
+    # The leaf of ``a``, its parent and the container root
+    assert len(list(new_nodes(obj, modified))) == 3
+
+    modified.values[50] = 7
+    # Only the path to the chunk that holds ``values[50]`` is replaced: one node per level
+    # (including the length mix-in) and the chunk itself
+    changed_list_nodes = list(new_nodes(obj.values, modified.values))
+    assert len(changed_list_nodes) == List[uint64, 1024].tree_depth() + 1
+    assert obj.values[50] == 50
+    assert new_node_bytes(obj, modified) > 0
+
+
+class Record(Container):
+    amount: uint64
+    flag: boolean
+    small: uint8
+
+
+@pytest.mark.parametrize("typ", [List[uint64, 1024], ProgressiveList[uint64]])
+@pytest.mark.parametrize("count", [0, 1, 5, 21, 300])
+def test_array_round_trip(typ, count):
+    obj = typ(*range(count))
+    array = to_array(obj)
+    assert array.dtype == np.uint64
+    assert list(array) == list(range(count))
+
+    # Unchanged values give the same tree back
+    assert from_array(typ, array, base=obj).hash_tree_root() == obj.hash_tree_root()
+
+    for values in [array * 3, np.arange(count + 7, dtype=np.uint64)]:
+        for base in [None, obj]:
+            expected = typ(*[int(value) for value in values])
+            rebuilt = from_array(typ, values, base=base)
+            assert rebuilt.hash_tree_root() == expected.hash_tree_root()
+            # The rebuilt tree can be written to as usual
+            rebuilt.append(uint64(1))
+            expected.append(uint64(1))
+            assert rebuilt.hash_tree_root() == expected.hash_tree_root()
+
+
+def test_from_array_shares_unchanged_subtrees():
+    obj = List[uint64, 1024](*range(512))
+    values = to_array(obj).copy()
+    values[100] += 1
+    rebuilt = from_array(type(obj), values, base=obj)
+    # Only the path to the chunk that holds ``values[100]`` is new, as for a single write
+    assert len(list(new_nodes(obj, rebuilt))) == List[uint64, 1024].tree_depth() + 1
+
+
+def test_from_array_checks_length():
+    with pytest.raises(ValueError, match="exceed the limit"):
+        from_array(List[uint64, 4], np.arange(5, dtype=np.uint64))
+    with pytest.raises(ValueError, match="needs 4 elements"):
+        from_array(Vector[uint64, 4], np.arange(5, dtype=np.uint64))
+    vector = from_array(Vector[uint64, 4], np.arange(4, dtype=np.uint64))
+    assert vector.hash_tree_root() == Vector[uint64, 4](0, 1, 2, 3).hash_tree_root()
+
+
+@pytest.mark.parametrize("typ", [List[Record, 1024], ProgressiveList[Record]])
+def test_field_array(typ):
+    obj = typ(*[Record(amount=i * 10**9, flag=i % 3 == 0, small=i % 7) for i in range(100)])
+    assert list(field_array(obj, "amount")) == [i * 10**9 for i in range(100)]
+    assert list(field_array(obj, "flag")) == [i % 3 == 0 for i in range(100)]
+    assert list(field_array(obj, "small")) == [i % 7 for i in range(100)]
+    assert len(field_array(typ(), "amount")) == 0
+
+
+@pytest.mark.parametrize("typ", [List[Record, 1024], ProgressiveList[Record]])
+def test_from_field_array(typ):
+    obj = typ(*[Record(amount=i, flag=i % 3 == 0, small=i % 7) for i in range(100)])
+    amounts = field_array(obj, "amount").copy()
+    amounts[::10] += 5
+
+    updated = from_field_array(obj, "amount", amounts)
+    expected = obj.copy()
+    for i in range(0, 100, 10):
+        expected[i].amount += 5
+    assert updated.hash_tree_root() == expected.hash_tree_root()
+    assert list(field_array(updated, "flag")) == list(field_array(obj, "flag"))
+    # Containers with an unchanged field keep their subtree
+    assert len(list(new_nodes(obj, updated))) < len(list(new_nodes(obj, expected))) + 10
+    assert from_field_array(obj, "amount", field_array(obj, "amount")).get_backing() is (
+        obj.get_backing()
+    )
+
+    with pytest.raises(ValueError, match="100 values needed"):
+        from_field_array(obj, "amount", amounts[:5])
+
+
+@pytest.mark.parametrize("typ", [List[Record, 1024], ProgressiveList[Record]])
+def test_merkleize_levels_matches_merkle_root(typ):
+    obj = typ(*[Record(amount=i, flag=i % 3 == 0, small=i % 7) for i in range(100)])
+    data = obj.encode_bytes()
+    decoded = typ.decode_bytes(data)
+    assert merkleize_levels(decoded.get_backing()) == obj.hash_tree_root()
+
+    # With the roots cached, only the path to the write is hashed again
+    decoded[50].amount = 10**9
+    expected = typ.decode_bytes(decoded.encode_bytes()).hash_tree_root()
+    assert merkleize_levels(decoded.get_backing()) == expected
+    assert merkleize_levels(decoded.get_backing()) != obj.hash_tree_root()
+
+
+def test_set_merkleization_backend():
+    obj = Example(a=1, b=2, values=list(range(300)))
+    expected = hash_tree_root(obj)
+    set_merkleization_backend("levels")
+    try:
+        assert hash_tree_root(Example.decode_bytes(obj.encode_bytes())) == expected
+    finally:
+        set_merkleization_backend("recursive")
+    with pytest.raises(ValueError, match="unknown merkleization backend"):
+        set_merkleization_backend("native")
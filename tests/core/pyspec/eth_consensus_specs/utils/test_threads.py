@@ -0,0 +1,23 @@
+from eth_consensus_specs.utils import threads
+
+
+def test_map_on_threads():
+    items = list(range(20))
+    for thread_count in [1, 2, 8, 32]:
+        assert list(threads.map_on_threads(lambda x: x * x, items, thread_count)) == [
+            x * x for x in items
+        ]
+    assert list(threads.map_on_threads(abs, [], 4)) == []
+
+
+def test_thread_pools_are_shared_and_shut_down():
+    pool = threads.get_thread_pool(2)
+    assert threads.get_thread_pool(2) is pool
+    assert threads.get_thread_pool(3) is not pool
+
+    threads.shutdown_thread_pools()
+    assert threads._thread_pools == {}
+    assert pool._shutdown
+    # A new pool is created on the next use
+    assert threads.get_thread_pool(2) is not pool
+    assert list(threads.map_on_threads(abs, [-1, -2], 2)) == [1, 2]
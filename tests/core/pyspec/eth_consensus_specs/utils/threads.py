@@ -0,0 +1,47 @@
+"""
+Thread pools shared by the utilities that compute on several threads, e.g. `bls` and `kzg`.
+"""
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# The pools of `get_thread_pool`, by number of threads
+_thread_pools = {}
+_lock = threading.Lock()
+
+
+def get_thread_pool(threads):
+    """
+    Return the shared pool of ``threads`` threads, created on first use and shut down at exit.
+    """
+    with _lock:
+        if threads not in _thread_pools:
+            _thread_pools[threads] = ThreadPoolExecutor(max_workers=threads)
+        return _thread_pools[threads]
+
+
+def map_on_threads(fn, items, threads):
+    """
+    Return an iterator over ``fn`` of each of ``items``, in order, computed on up to
+    ``threads`` threads of a shared pool, or on the calling thread if 1 is enough.
+    """
+    items = list(items)
+    threads = min(threads, len(items))
+    if threads <= 1:
+        return map(fn, items)
+    return get_thread_pool(threads).map(fn, items)
+
+
+def shutdown_thread_pools():
+    """
+    Shut the shared pools down, once their submitted work is done. Later calls create new ones.
+    """
+    with _lock:
+        pools = list(_thread_pools.values())
+        _thread_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_thread_pools)